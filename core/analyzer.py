@@ -1,15 +1,450 @@
 import ast
+import hashlib
+import io
+import os
 import re
 import math
-from collections import Counter
+import tokenize
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core import import_rules, io_rules, perf_rules  # noqa: F401  (register the rule packs)
+from core.complexity_class import BoundBuilder, Loop, format_bound, is_halving, worst_class
+from core.import_costs import default_table
+from core.perf_rules import split_loop
+from core.rules import DEFAULT_REGISTRY, SEVERITY_WEIGHTS, Finding
+from core.secret_scanner import DEFAULT_SCANNER, SecretHit
+from core.shingles import module_shingles, shingles, subtree_shingles
+from core.version import ANALYZER_VERSION, RULESET_VERSION
+
+_UNPARSED = object()
+
+# Visitor context of nodes outside every complexity bound: class bodies,
+# lambdas and definition headers (see ``_MetricsVisitor``).
+_UNBOUNDED = (None, ())
+
+AnalysisSummary = namedtuple("AnalysisSummary", [
+    "complexity", "docstring_coverage", "halstead_volume", "halstead_effort",
+    "bad_practices", "function_count",
+])
+AnalysisSummary.__doc__ = """Small immutable metrics record returned by ``CodeAnalyzer.summarize()``."""
+
+# Token-level patterns for the comment rules. Each is applied to a single
+# COMMENT token rather than to the whole source.
+_PLACEHOLDER_COMMENT = re.compile(r'#.*(TODO|FIXME|logic here|insert here)', re.I)
+_GHOST_COMMENT = re.compile(r'#\s*')
+
+
+class FunctionMetrics:
+    """
+    Compact per-function metric record.
+
+    Uses ``__slots__`` so that millions of records stay small; ``as_row``
+    and ``from_row`` convert to the flat list stored in analysis records.
+    Halstead primitives include nested functions and classes;
+    ``static_complexity_class`` is the inferred upper bound on the
+    function's own running time (see ``core.complexity_class``).
+    """
+
+    __slots__ = ("name", "lineno", "end_lineno", "complexity",
+                 "n1", "n2", "N1", "N2", "has_docstring", "static_complexity_class")
+
+    def __init__(self, name, lineno, end_lineno, complexity=1,
+                 n1=0, n2=0, N1=0, N2=0, has_docstring=False, static_complexity_class=None):
+        self.name = name
+        self.lineno = lineno
+        self.end_lineno = end_lineno
+        self.complexity = complexity
+        self.n1 = n1
+        self.n2 = n2
+        self.N1 = N1
+        self.N2 = N2
+        self.has_docstring = has_docstring
+        self.static_complexity_class = static_complexity_class
+
+    def as_row(self):
+        """Returns the record as a list ordered like ``__slots__``."""
+        return [getattr(self, slot) for slot in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row):
+        """Rebuilds a record from a list produced by ``as_row``."""
+        return cls(*row)
+
+    def __repr__(self):
+        return (f"FunctionMetrics({self.name!r}, lines {self.lineno}-{self.end_lineno}, "
+                f"complexity={self.complexity})")
+
+
+class _Scope:
+    """A function, class or module frame on the visitor's McCabe scope stack."""
+
+    __slots__ = ("kind", "name", "is_block", "complexity", "methods",
+                 "operators", "operands", "enclosing", "bound")
+
+    def __init__(self, kind, name=None, is_block=False, bound=None):
+        self.kind = kind
+        self.name = name
+        self.is_block = is_block
+        self.complexity = 1
+        self.methods = 0
+        self.operators = Counter() if kind == "function" else None
+        self.operands = Counter() if kind == "function" else None
+        self.enclosing = None  # function scope enclosing this one, while open
+        self.bound = bound  # BoundBuilder of a function or the module
+
+
+class _MetricsVisitor:
+    """
+    Single-pass visitor collecting every AST-derived metric used by CodeAnalyzer.
+
+    One traversal gathers Halstead operator/operand counts, docstring coverage,
+    per-block McCabe complexity and per-function records (``FunctionMetrics``,
+    in definition order), and hands each node to the registered
+    rules interested in its type. Complexity follows radon's ``cc_visit``
+    rules so that scores remain comparable with reports produced before the
+    fused engine.
+
+    The same pass fills a ``core.complexity_class.BoundBuilder`` per
+    function and one for the module's top level. Every node is visited in
+    a context, (builder, loops), naming the builder it belongs to and the
+    ``Loop``s enclosing it within that scope; a node inherits its parent's
+    context unless a handler registered another one for it in
+    ``_contexts`` (loop bodies, definition headers and bodies).
+
+    The traversal keeps an explicit stack instead of recursing, so deeply
+    nested expressions (a long chain of ``+``, say) that compile fine do
+    not hit the interpreter's recursion limit. A ``visit_<Node>`` handler
+    returns the items to traverse for its node: child nodes, and callables
+    that run once everything scheduled before them has been visited.
+    """
+
+    def __init__(self, operator_nodes, registry, rules, dispatch):
+        self.operator_nodes = operator_nodes
+        self.registry = registry
+        self.rules = rules
+        self.dispatch = dispatch
+        self.operator_counts = Counter()
+        self.operand_counts = Counter()
+        self.definitions = 0
+        self.documented = 0
+        self.blocks = []
+        self.functions = []
+        self.exported = set()  # names listed in __all__
+        self.imported = []  # import_rules.imported_names of every import
+        self.module_bound = BoundBuilder()
+        self._scopes = [_Scope("module", bound=self.module_bound)]
+        self._function = None  # innermost enclosing function scope
+        self._suppress = 0
+        self._context = (self.module_bound, ())
+        self._contexts = {}
+        self._whiles = []  # open while loops, halved by any assignment inside
+
+    def visit(self, node):
+        """Visits ``node`` and its whole subtree in source order."""
+        stack = [(node, self._context)]
+        while stack:
+            item, context = stack.pop()
+            if not isinstance(item, ast.AST):
+                item()
+                continue
+            self._context = context = self._contexts.pop(item, context)
+            handler = getattr(self, "visit_" + item.__class__.__name__, None)
+            self._count(item)
+            items = ast.iter_child_nodes(item) if handler is None else handler(item)
+            stack.extend((child, context) for child in reversed(list(items)))
+
+    def _count(self, node):
+        """Counts Halstead tokens and runs the rules for one node."""
+        if isinstance(node, self.operator_nodes):
+            key = type(node).__name__
+            self.operator_counts[key] += 1
+            if self._function is not None:
+                self._function.operators[key] += 1
+        elif isinstance(node, (ast.Name, ast.Constant)):
+            key = node.id if isinstance(node, ast.Name) else repr(node.value)
+            self.operand_counts[key] += 1
+            if self._function is not None:
+                self._function.operands[key] += 1
+
+        bound, loops = self._context
+        if bound is not None:
+            bound.add(node, loops)
+
+        indices = self.dispatch.get(node.__class__)
+        if indices:
+            for index in indices:
+                self.registry.run(self.rules[index], node)
+
+    # --- Complexity bound helpers ---
+
+    def _loop(self, node):
+        """Places the per-iteration parts of a loop inside it; returns its ``Loop``."""
+        bound, loops = self._context
+        if bound is None:
+            return None
+        loop = Loop(node)
+        inner = (bound, loops + (loop,))
+        for child in split_loop(node)[1]:
+            self._contexts[child] = inner
+        return loop
+
+    def _innermost_bound(self):
+        """The BoundBuilder of the innermost open function, or the module's."""
+        return (self._function or self._scopes[0]).bound
+
+    # --- McCabe helpers ---
+
+    def _add_complexity(self, amount):
+        if not self._suppress:
+            self._scopes[-1].complexity += amount
+
+    def _begin_suppress(self):
+        self._suppress += 1
+
+    def _end_suppress(self):
+        self._suppress -= 1
+
+    def _suppressed(self, nodes):
+        """Items visiting ``nodes`` for Halstead counts without adding decision points."""
+        return [self._begin_suppress, *nodes, self._end_suppress]
+
+    def _definition(self, node, scope, finish):
+        """
+        Items visiting a def/class header outside ``scope`` and its body inside it.
+
+        ``finish`` runs once the body has been visited and ``scope`` closed.
+        """
+        header = []
+        for field, value in ast.iter_fields(node):
+            if field == "body":
+                continue
+            if isinstance(value, list):
+                header.extend(item for item in value if isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST):
+                header.append(value)
+        for item in header:
+            self._contexts[item] = _UNBOUNDED
+        body = _UNBOUNDED if scope.bound is None else (scope.bound, ())
+        for statement in node.body:
+            self._contexts[statement] = body
+
+        def enter():
+            self._scopes.append(scope)
+            scope.enclosing = self._function
+            if scope.kind == "function":
+                self._function = scope
+
+        def leave():
+            enclosing = scope.enclosing
+            self._function = enclosing
+            self._scopes.pop()
+            # Fold a nested function's counts into its enclosing function so
+            # every record covers its whole subtree.
+            if scope.kind == "function" and enclosing is not None:
+                enclosing.operators.update(scope.operators)
+                enclosing.operands.update(scope.operands)
+            if scope.bound is not None:
+                self._innermost_bound().inherit(scope.bound)
+            finish()
+
+        return [*self._suppressed(header), enter, *node.body, leave]
+
+    def _qualified_name(self, name):
+        parents = [scope.name for scope in self._scopes if scope.name]
+        return ".".join(parents + [name])
+
+    # --- Definitions ---
+
+    def visit_FunctionDef(self, node):
+        self.definitions += 1
+        has_docstring = bool(ast.get_docstring(node))
+        if has_docstring:
+            self.documented += 1
+
+        record = FunctionMetrics(
+            self._qualified_name(node.name), node.lineno,
+            getattr(node, "end_lineno", node.lineno), has_docstring=has_docstring,
+        )
+        self.functions.append(record)
+
+        parent = self._scopes[-1]
+        is_block = parent.kind == "module" or (parent.kind == "class" and parent.is_block)
+        scope = _Scope("function", node.name, is_block, BoundBuilder(node))
+
+        def finish():
+            record.static_complexity_class = format_bound(scope.bound.bound())
+            record.complexity = scope.complexity
+            record.n1 = len(scope.operators)
+            record.n2 = len(scope.operands)
+            record.N1 = sum(scope.operators.values())
+            record.N2 = sum(scope.operands.values())
+
+            if parent.kind == "class":
+                parent.complexity += scope.complexity
+                parent.methods += 1
+            if is_block:
+                self.blocks.append(scope.complexity)
+
+        return self._definition(node, scope, finish)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.definitions += 1
+        if ast.get_docstring(node):
+            self.documented += 1
+
+        scope = _Scope("class", node.name, self._scopes[-1].kind == "module")
+
+        def finish():
+            if scope.is_block:
+                real, methods = scope.complexity, scope.methods
+                self.blocks.append(real if not methods else int(real / methods) + (methods > 1))
+
+        return self._definition(node, scope, finish)
+
+    def visit_Lambda(self, node):
+        for child in ast.iter_child_nodes(node):
+            self._contexts[child] = _UNBOUNDED
+        return ast.iter_child_nodes(node)
+
+    # --- Loops and assignments, for the complexity bounds ---
+
+    def visit_ListComp(self, node):
+        self._loop(node)
+        return ast.iter_child_nodes(node)
+
+    visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_Import(self, node):
+        self.imported.extend(import_rules.imported_names(node))
+        return ast.iter_child_nodes(node)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_Assign(self, node):
+        self._innermost_bound().bind(node)
+        self.exported.update(import_rules.exported_names(node))
+        return self.visit_AugAssign(node)
+
+    def visit_AugAssign(self, node):
+        if self._whiles and is_halving(node):
+            for loop in self._whiles:
+                loop.halve()
+        return ast.iter_child_nodes(node)
+
+    # --- Decision points ---
+
+    def visit_If(self, node):
+        self._add_complexity(1)
+        return ast.iter_child_nodes(node)
+
+    visit_IfExp = visit_If
+
+    def visit_For(self, node):
+        self._add_complexity(1 + bool(node.orelse))
+        self._loop(node)
+        return ast.iter_child_nodes(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        self._add_complexity(1 + bool(node.orelse))
+        loop = self._loop(node)
+        if loop is None:
+            return ast.iter_child_nodes(node)
+        self._whiles.append(loop)
+        return [*ast.iter_child_nodes(node), self._whiles.pop]
+
+    def visit_Try(self, node):
+        self._add_complexity(len(node.handlers) + bool(node.orelse))
+        return ast.iter_child_nodes(node)
+
+    def visit_BoolOp(self, node):
+        self._add_complexity(len(node.values) - 1)
+        return ast.iter_child_nodes(node)
+
+    def visit_comprehension(self, node):
+        self._add_complexity(len(node.ifs) + 1)
+        return ast.iter_child_nodes(node)
+
+    def visit_Match(self, node):
+        has_wildcard = any(
+            getattr(case.pattern, "pattern", False) is None for case in node.cases
+        )
+        self._add_complexity(max(0, len(node.cases) - has_wildcard))
+        return ast.iter_child_nodes(node)
+
+    def visit_Assert(self, node):
+        # radon counts the assert itself but never descends into its test
+        self._add_complexity(1)
+        return self._suppressed(ast.iter_child_nodes(node))
+
+
+def _analyze_path(path, cache=None, rules=None, code=None):
+    """
+    Reads and analyzes one file, returning a record tagged with its path.
+
+    Read and analysis failures are reported in an 'error' field so that
+    one bad file does not abort a bulk run. A file whose ``code`` is given
+    is not read.
+    """
+    if code is None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return {"file": path, "error": str(e)}
+
+    record = {"file": path}
+    try:
+        record.update(CodeAnalyzer(code, cache=cache, rules=rules).analyze())
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+    return record
+
+
+def _analyze_chunk(paths, cache=None, rules=None, sources=None):
+    """
+    Worker entry point: analyzes a batch of paths inside one pool task.
+
+    Returns the records together with the rule statistics gathered for this
+    chunk, so the parent process can merge them into its own registry.
+    """
+    rules = DEFAULT_REGISTRY if rules is None else rules
+    rules.reset_stats()
+    sources = sources or {}
+    records = [_analyze_path(path, cache, rules, sources.get(path)) for path in paths]
+    if cache is not None:
+        cache.flush()  # the worker's copy of the cache is dropped with the task
+    return records, rules.timings()
+
+
+def _run_chunks(pool, paths, chunk_size, cache, rules, sources):
+    """Submits ``paths`` to ``pool`` in chunks and yields records as chunks finish."""
+    futures = []
+    for i in range(0, len(paths), chunk_size):
+        chunk = paths[i:i + chunk_size]
+        texts = {path: sources[path] for path in chunk if path in sources}
+        futures.append(pool.submit(_analyze_chunk, chunk, cache, rules, texts))
+    for future in as_completed(futures):
+        records, timings = future.result()
+        rules.merge_stats(timings)
+        yield from records
 
 
 class CodeAnalyzer:
     """
     A static analysis tool that parses Python code into an Abstract Syntax Tree (AST)
     to calculate complexity metrics and detect non-standard coding patterns.
+
+    Instances use ``__slots__`` and parse lazily; ``summarize()`` returns a
+    compact record and releases the source and AST for batch workloads.
     """
 
+    __slots__ = ("code", "cache", "rules", "_result", "_tree")
+
     # All relevant Python operator node types for Halstead analysis
     OPERATOR_NODES = (
         # Arithmetic
@@ -25,46 +460,219 @@ class CodeAnalyzer:
         ast.Is, ast.IsNot, ast.In, ast.NotIn
     )
 
-    def __init__(self, code):
+    def __init__(self, code, cache=None, rules=None):
         """
-        Initializes the analyzer by parsing source code into an AST.
+        Initializes the analyzer for a piece of source code.
+
+        Parsing is deferred until the AST is first needed, so a cache hit
+        never parses the source at all.
 
         Args:
             code (str): The Python source code to be analyzed.
+            cache (AnalysisCache): Optional persistent result cache
+                                   (see ``core.cache``).
+            rules (RuleRegistry): AST rules to apply. Defaults to
+                                  ``core.rules.DEFAULT_REGISTRY``.
         """
         self.code = code
-        try:
-            self.tree = ast.parse(code)
-        except SyntaxError:
-            self.tree = None
+        self.cache = cache
+        self.rules = DEFAULT_REGISTRY if rules is None else rules
+        self._result = None
+        self._tree = _UNPARSED
 
-    def calculate_halstead_metrics(self):
+    @property
+    def tree(self):
         """
-        Calculates Halstead Volume and Vocabulary metrics per Halstead (1977).
+        The parsed ``ast.Module``, built on first access.
 
-        Tracks both total occurrences (N1, N2) and unique counts (n1, n2)
-        separately, as required by the Halstead model.
+        None if the source has a syntax error, is nested too deeply for the
+        parser, or was released by ``summarize()``.
+        """
+        if self._tree is _UNPARSED:
+            try:
+                self._tree = ast.parse(self.code)
+            except (SyntaxError, RecursionError):
+                self._tree = None
+        return self._tree
+
+    @staticmethod
+    def analyze_many(paths, workers=None, chunk_size=None, cache=None, rules=None, sources=None):
+        """
+        Analyzes many files in parallel across a process pool.
+
+        Paths are grouped into chunks so each pool task amortises its IPC
+        overhead over several files. Records are yielded as soon as their
+        chunk finishes, i.e. in completion order rather than input order.
+
+        Args:
+            paths (iterable): Paths of the Python files to analyze.
+            workers (int): Number of worker processes. Defaults to
+                           ``os.cpu_count()``; 1 analyzes in-process.
+            chunk_size (int): Files per pool task. Defaults to a size that
+                              gives each worker about four chunks.
+            cache (AnalysisCache): Optional persistent result cache shared
+                                   by all workers.
+            rules (RuleRegistry): AST rules to apply. Worker rule statistics
+                                  are merged back into this registry.
+            sources (dict): path -> source text of files the caller has
+                            already read; they are not read again.
+
+        Yields:
+            dict: The ``analyze()`` record of each file plus its 'file' path,
+                  or a 'file'/'error' pair if the file could not be read or
+                  analyzed.
+        """
+        paths = list(paths)
+        workers = workers or os.cpu_count() or 1
+        rules = DEFAULT_REGISTRY if rules is None else rules
+        sources = sources or {}
+
+        if workers == 1 or len(paths) <= 1:
+            for path in paths:
+                yield _analyze_path(path, cache, rules, sources.get(path))
+            return
+
+        if chunk_size is None:
+            chunk_size = max(1, min(64, len(paths) // (workers * 4)))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from _run_chunks(pool, paths, chunk_size, cache, rules, sources)
+
+    def analyze(self):
+        """
+        Computes every static metric from a single traversal of the parsed AST.
+
+        The result is memoised, so the per-metric accessors below share one
+        walk of the tree instead of re-walking it for each metric. When a
+        cache is attached it is consulted before the source is parsed.
 
         Returns:
-            dict: A dictionary containing 'n1', 'n2', 'N1', 'N2',
-                  'vocabulary', and 'volume', or a string error message
-                  on syntax failure.
+            dict: A record with 'halstead_metrics', 'complexity',
+                  'docstring_coverage', 'bad_practices', 'functions'
+                  (one ``FunctionMetrics.as_row()`` list per function) and
+                  'secrets' (one [rule_id, line, column] list per hit) and
+                  'issues' (one ``Finding`` row per AST rule finding, with
+                  its category, severity, line and complexity impact) and
+                  'static_complexity_class' (the file's worst inferred bound)
+                  and 'module_imports' (one [module, line, used] row per absolute
+                  import executed when the module loads) and 'imported_names'
+                  (every import's ``import_rules.imported_names``, in source
+                  order) and 'clone_shingles' (the sorted ``core.shingles``
+                  of the file, None if it does not parse).
         """
+        if self.cached() is not None:
+            return self._result
+
+        self._result = self._compute()
+        if self.cache is not None:
+            self.cache.put(self._cache_key(), self._result)
+        return self._result
+
+    def cached(self):
+        """
+        Returns the analysis record if it is already known, without parsing.
+
+        Returns:
+            dict: The record computed earlier by this instance or stored in
+                  the cache, or None on a miss (always None without a cache).
+        """
+        if self._result is None and self.cache is not None:
+            self._result = self.cache.get(self._cache_key())
+        return self._result
+
+    def _cache_key(self):
+        return self.cache.make_key(
+            self.code, ANALYZER_VERSION, f"{RULESET_VERSION}+{self.rules.version}"
+        )
+
+    def _compute(self):
+        """Parses the source and runs the fused visitor plus text checks."""
+        findings, secrets = self._detect_text_practices()
+        secret_rows = [list(hit) for hit in secrets]
+
         if not self.tree:
-            return "Syntax Error"
+            return self._unparsed_result(findings, secret_rows)
 
-        operator_counts = Counter()
-        operand_counts = Counter()
+        rules, dispatch = self.rules.instantiate()
+        visitor = _MetricsVisitor(self.OPERATOR_NODES, self.rules, rules, dispatch)
+        try:
+            visitor.visit(self.tree)
+        except RecursionError:
+            # A rule recursing over a pathologically deep tree; the file is
+            # reported like one that does not parse rather than aborting.
+            self.rules.collect(rules)
+            return self._unparsed_result(findings, secret_rows)
+
+        issues = self.rules.collect(rules)
+        findings.extend(issue.message for issue in issues)
+
+        return {
+            "halstead_metrics": self._halstead(visitor.operator_counts, visitor.operand_counts),
+            "complexity": self._average_complexity(visitor.blocks),
+            "docstring_coverage": self._coverage(visitor.definitions, visitor.documented),
+            "bad_practices": findings,
+            "functions": [record.as_row() for record in visitor.functions],
+            "secrets": secret_rows,
+            "issues": [list(issue) for issue in issues],
+            "static_complexity_class": self._complexity_class(
+                visitor.module_bound, visitor.functions
+            ),
+            "module_imports": self._import_rows(
+                self.tree, visitor.operand_counts, visitor.exported
+            ),
+            "imported_names": visitor.imported,
+            "clone_shingles": sorted(shingles(self.tree)),
+        }
+
+    @staticmethod
+    def _unparsed_result(findings, secret_rows):
+        """The analysis record of a file without a usable AST."""
+        return {
+            "halstead_metrics": "Syntax Error",
+            "complexity": None,
+            "docstring_coverage": 0.0,
+            "bad_practices": findings,
+            "functions": [],
+            "secrets": secret_rows,
+            "issues": [],
+            "static_complexity_class": None,
+            "module_imports": [],
+            "imported_names": [],
+            "clone_shingles": None,
+        }
+
+    @staticmethod
+    def _complexity_class(module_bound, functions):
+        """The worst inferred complexity class over the module's top level and functions."""
+        return worst_class(
+            [format_bound(module_bound.bound())]
+            + [record.static_complexity_class for record in functions]
+        )
+
+    @staticmethod
+    def _import_rows(module, operand_counts, exported):
+        """
+        [module, line, used] rows for the imports executed at load time.
 
-        for node in ast.walk(self.tree):
-            if isinstance(node, self.OPERATOR_NODES):
-                operator_counts[type(node).__name__] += 1
-            elif isinstance(node, ast.Name):
-                operand_counts[node.id] += 1
-            elif isinstance(node, ast.Constant):
-                operand_counts[repr(node.value)] += 1
+        Whether an import is used is decided as ``UnusedImportRule`` does
+        (``import_rules.is_used``); the names in ``operand_counts`` stand
+        for the identifiers referenced in the file.
+        """
+        return [
+            [name, line, not names or any(
+                import_rules.is_used(n, operand_counts, exported) for n in names
+            )]
+            for name, line, names in import_rules.module_imports(module)
+        ]
+
+    @staticmethod
+    def _halstead(operator_counts, operand_counts):
+        """
+        Derives the Halstead primitives and the full metric suite from raw counts.
 
-        # Halstead primitives
+        For whole corpora, ``core.halstead.halstead_suite`` evaluates the same
+        formulas over arrays of primitives.
+        """
         n1 = len(operator_counts)          # unique operators
         n2 = len(operand_counts)           # unique operands
         N1 = sum(operator_counts.values()) # total operator occurrences
@@ -73,6 +681,8 @@ class CodeAnalyzer:
         vocabulary = n1 + n2
         length = N1 + N2
         volume = length * math.log2(vocabulary) if vocabulary > 0 else 0
+        difficulty = (n1 / 2) * (N2 / n2) if n2 > 0 else 0
+        effort = difficulty * volume
 
         return {
             "n1": n1,
@@ -80,57 +690,245 @@ class CodeAnalyzer:
             "N1": N1,
             "N2": N2,
             "vocabulary": vocabulary,
-            "volume": round(volume, 2)
+            "volume": round(volume, 2),
+            "difficulty": round(difficulty, 2),
+            "effort": round(effort, 2),
+            "time": round(effort / 18, 2),       # seconds (Stroud number)
+            "bugs": round(volume / 3000, 4)      # estimated delivered bugs
         }
 
-    def detect_bad_practices(self):
+    @staticmethod
+    def _average_complexity(blocks):
+        """Averages per-block McCabe scores the way radon-based reports did."""
+        return round(sum(blocks) / len(blocks), 2) if blocks else 0
+
+    @staticmethod
+    def _coverage(definitions, documented):
+        """Returns docstring coverage as a percentage, or None with no definitions."""
+        if not definitions:
+            return None
+        return round((documented / definitions) * 100, 2)
+
+    def _detect_text_practices(self):
+        """
+        Runs the comment and literal checks from one ``tokenize`` pass.
+
+        Comment patterns only see COMMENT tokens, so text inside string
+        literals and docstrings cannot trigger them. Every STRING token goes
+        through the secret scanner (provider prefixes and entropy), and a
+        credential-like name or dict key followed by ``=`` or ``:`` and a
+        literal is reported as a keyword secret.
+
+        Returns:
+            tuple: (findings, secrets) where ``findings`` lists messages for
+                   credentials, placeholders and ghost comments and
+                   ``secrets`` lists one ``SecretHit`` per detected secret.
+        """
+        placeholder = ghost = False
+        secrets = []
+        scanner = DEFAULT_SCANNER
+        string_tokens = (tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING))
+        previous = (None, None)  # last two significant tokens
+
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(self.code).readline):
+                if tok.type == tokenize.COMMENT:
+                    # 2. Placeholder Comments (TODO/FIXME/"logic here"...)
+                    if not placeholder and _PLACEHOLDER_COMMENT.match(tok.string):
+                        placeholder = True
+                    # 3. Ghost Comments: a line holding nothing but '#'
+                    if (not ghost and _GHOST_COMMENT.fullmatch(tok.string)
+                            and not tok.line[:tok.start[1]].strip()):
+                        ghost = True
+                elif tok.type in (tokenize.NL, tokenize.NEWLINE):
+                    continue
+                else:
+                    # 1. Hardcoded Secrets
+                    name, op = previous
+                    if tok.type in string_tokens:
+                        secrets.extend(scanner.scan_literal(tok.string, *tok.start))
+                        if (op is not None and op.string in ("=", ":")
+                                and name.type in (tokenize.NAME, tokenize.STRING)
+                                and scanner.is_sensitive_name(name.string)
+                                and scanner.is_keyword_secret(tok.string)):
+                            secrets.append(SecretHit("keyword-assignment", *tok.start))
+                    previous = (op, tok)
+        except (tokenize.TokenError, SyntaxError):
+            pass  # keep whatever was found before the tokenizer gave up
+
+        findings = []
+        if secrets:
+            findings.append("Potential hardcoded credential detected.")
+        if placeholder:
+            findings.append("Unfinished placeholder/TODO found.")
+        if ghost:
+            findings.append("Ghost comment (empty # symbol) detected.")
+        return findings, secrets
+
+    def calculate_halstead_metrics(self):
+        """
+        Calculates the Halstead metric suite per Halstead (1977).
+
+        Tracks both total occurrences (N1, N2) and unique counts (n1, n2)
+        separately, as required by the Halstead model.
+
+        Returns:
+            dict: A dictionary containing 'n1', 'n2', 'N1', 'N2',
+                  'vocabulary', 'volume', 'difficulty', 'effort', 'time'
+                  (seconds) and 'bugs', or a string error message on
+                  syntax failure.
+        """
+        return self.analyze()["halstead_metrics"]
+
+    def get_complexity(self):
+        """
+        Calculates the average McCabe cyclomatic complexity of all code blocks.
+
+        Blocks are module-level functions, classes and their methods, scored
+        with the same rules as radon's ``cc_visit``.
+
+        Returns:
+            float: The average block complexity rounded to two decimal places,
+                   0 if there are no blocks, or None on syntax failure.
+        """
+        return self.analyze()["complexity"]
+
+    def detect_bad_practices(self, ast_rules=True):
         """
         Identifies patterns common in LLM outputs, such as hardcoded secrets,
-        placeholder comments, ghost comments, and duplicate imports.
+        placeholder comments, ghost comments, duplicate imports, and mutable
+        default arguments.
+
+        Args:
+            ast_rules (bool): If False, run only the token-based credential,
+                              placeholder and ghost comment checks, which
+                              never parse the source.
 
         Returns:
             list: A list of strings describing detected issues.
+
+        Raises:
+            ValueError: If ``ast_rules`` is False after ``summarize()`` has
+                        released the source.
         """
-        findings = []
+        if ast_rules:
+            return list(self.analyze()["bad_practices"])
+        if self.code is None:
+            raise ValueError("Source was released by summarize(); use ast_rules=True.")
+        return self._detect_text_practices()[0]
 
-        # 1. Check for Hardcoded Secrets
-        if re.search(
-            r'(api_key|password|secret|token)\s*=\s*["\'][\w]{8,}["\']',
-            self.code
-        ):
-            findings.append("Potential hardcoded credential detected.")
+    def detect_secrets(self):
+        """
+        Lists every hardcoded secret with its rule id and location.
 
-        # 2. Check for Placeholder Comments
-        if re.search(r'#.*(TODO|FIXME|logic here|insert here)', self.code, re.I):
-            findings.append("Unfinished placeholder/TODO found.")
+        Rule ids name the provider pattern (e.g. 'aws-access-key',
+        'github-token'), 'high-entropy-string' for random-looking literals
+        or 'keyword-assignment' for values bound to credential-like names.
 
-        # 3. Check for Ghost Comments (empty # symbols)
-        if re.search(r'^\s*#\s*$', self.code, re.MULTILINE):
-            findings.append("Ghost comment (empty # symbol) detected.")
+        Returns:
+            list: ``SecretHit(rule_id, line, column)`` records.
+        """
+        return [SecretHit(*row) for row in self.analyze()["secrets"]]
+
+    def get_issues(self, category=None):
+        """
+        Lists the AST rule findings with their severity and impact.
+
+        Args:
+            category (str): Only return findings of this rule category
+                            (e.g. 'performance'); None returns all.
+
+        Returns:
+            list: ``core.rules.Finding`` records in rule registration order.
+        """
+        return [
+            issue for issue in map(Finding._make, self.analyze()["issues"])
+            if category is None or issue.category == category
+        ]
+
+    def performance_penalty(self):
+        """
+        Sums the severity weights of every performance finding.
+
+        Returns:
+            int: 0 for code without performance findings; higher is slower.
+        """
+        return self.issue_penalty("performance")
+
+    def issue_penalty(self, *categories):
+        """
+        Sums the severity weights of the findings in the given categories.
+
+        Args:
+            *categories (str): Rule categories, e.g. 'io' and 'memory'.
 
-        # 4. Import Efficiency — checks both `import x` and `from x import y`
-        if self.tree:
-            imports = []
-            for node in ast.walk(self.tree):
-                if isinstance(node, ast.Import):
-                    imports.extend(alias.name for alias in node.names)
-                elif isinstance(node, ast.ImportFrom):
-                    imports.extend(alias.name for alias in node.names)
-            if len(set(imports)) != len(imports):
-                findings.append("Duplicate imports detected.")
-        # 5. Check for mutable default arguments (e.g. def func(x=[]) or def func(x={}))
-        if self.tree:
-            for node in ast.walk(self.tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    for default in node.args.defaults:
-                        if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                            findings.append(
-                        f"Mutable default argument in function "
-                        f"'{node.name}': use None as default instead."
-                    )
-                    break # one finding per function is enough
-    
-        return findings
+        Returns:
+            int: 0 for code without such findings.
+        """
+        return sum(
+            SEVERITY_WEIGHTS[issue.severity] for issue in self.get_issues()
+            if issue.category in categories
+        )
+
+    def import_cost(self, table=None):
+        """
+        Estimates the time the sample's imports add to a cold start.
+
+        Args:
+            table (ImportCostTable): Per-module import times; defaults to
+                                     the table shipped in ``core``.
+
+        Returns:
+            ImportCost: Total milliseconds, the milliseconds only unused
+                        imports add, and modules the table does not cover;
+                        None if no table matches this Python version.
+        """
+        table = table or default_table()
+        if table is None:
+            return None
+        return table.estimate(self.analyze()["module_imports"])
+
+    def summarize(self):
+        """
+        Returns a small immutable metrics record and releases the AST.
+
+        The source text and parsed tree are dropped afterwards, so only the
+        analysis record stays alive; the accessors above keep working from
+        that record.
+
+        Returns:
+            AnalysisSummary: Complexity, docstring coverage, Halstead volume
+                             and effort (None on syntax failure), the tuple of
+                             bad practices and the number of functions.
+        """
+        result = self.analyze()
+        halstead = result["halstead_metrics"]
+        parsed = isinstance(halstead, dict)
+        summary = AnalysisSummary(
+            complexity=result["complexity"],
+            docstring_coverage=result["docstring_coverage"],
+            halstead_volume=halstead["volume"] if parsed else None,
+            halstead_effort=halstead["effort"] if parsed else None,
+            bad_practices=tuple(result["bad_practices"]),
+            function_count=len(result["functions"]),
+        )
+        self.code = None
+        self._tree = None
+        return summary
+
+    def get_function_metrics(self):
+        """
+        Returns per-function metrics: name, line span, McCabe complexity,
+        Halstead primitives and whether a docstring is present.
+
+        Nested functions and methods get their own records with qualified
+        names such as ``Graph.add_edge``.
+
+        Returns:
+            list: ``FunctionMetrics`` records in definition order; empty on
+                  syntax failure.
+        """
+        return [FunctionMetrics.from_row(row) for row in self.analyze()["functions"]]
 
     def get_docstring_coverage(self):
         """
@@ -141,16 +939,179 @@ class CodeAnalyzer:
             float: Coverage percentage (0.0 to 100.0), or None if no
                    functions or classes are present in the code.
         """
-        if not self.tree:
-            return 0.0
+        return self.analyze()["docstring_coverage"]
 
-        functions = [
-            n for n in ast.walk(self.tree)
-            if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
-        ]
 
-        if not functions:
-            return None
+class _RuleRecorder:
+    """Stands in for a RuleRegistry and records dispatched (rule_id, node) pairs."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, rule, node):
+        self.calls.append((rule.rule_id, node))
+
+
+class _UnitMetrics:
+    """Metric contribution of one top-level statement of a module."""
 
-        documented = sum(1 for n in functions if ast.get_docstring(n))
-        return round((documented / len(functions)) * 100, 2)
+    __slots__ = ("node", "operator_counts", "operand_counts", "definitions",
+                 "documented", "blocks", "functions", "module_bound", "rule_calls",
+                 "exported", "imported", "shingles")
+
+    def __init__(self, node, visitor, recorder):
+        self.node = node
+        self.operator_counts = visitor.operator_counts
+        self.operand_counts = visitor.operand_counts
+        self.definitions = visitor.definitions
+        self.documented = visitor.documented
+        self.blocks = visitor.blocks
+        self.functions = visitor.functions
+        self.module_bound = visitor.module_bound
+        self.exported = visitor.exported
+        self.imported = visitor.imported
+        self.rule_calls = recorder.calls
+        self.shingles = subtree_shingles(node)
+
+
+class IncrementalAnalyzer:
+    """
+    Re-analyzes successive revisions of one file, reusing unchanged definitions.
+
+    Every top-level function and class is hashed by its source text
+    (decorators included) and its metric contribution is kept between calls.
+    On the next revision only definitions whose text changed are visited
+    again; module totals are re-aggregated by merging the per-definition
+    Halstead ``Counter``s, docstring counts and McCabe blocks. Rule nodes
+    recorded for reused definitions are replayed on fresh rule instances,
+    so findings match a full ``CodeAnalyzer.analyze()`` of the new text.
+    """
+
+    def __init__(self, rules=None):
+        """
+        Args:
+            rules (RuleRegistry): AST rules to apply. Defaults to
+                                  ``core.rules.DEFAULT_REGISTRY``.
+        """
+        self.rules = DEFAULT_REGISTRY if rules is None else rules
+        self.reused = 0
+        self.recomputed = 0
+        self._units = {}
+        self._rules_version = None
+
+    def analyze(self, code):
+        """
+        Analyzes a new revision of the file.
+
+        Args:
+            code (str): The full source text of the revision.
+
+        Returns:
+            dict: The same record ``CodeAnalyzer(code).analyze()`` produces.
+        """
+        analyzer = CodeAnalyzer(code, rules=self.rules)
+        tree = analyzer.tree
+        if not tree:
+            return analyzer.analyze()
+
+        if self._rules_version != self.rules.version:
+            self._units = {}
+            self._rules_version = self.rules.version
+
+        lines = code.splitlines(True)
+        units = {}
+        ordered = []
+        self.reused = self.recomputed = 0
+
+        module_recorder = _RuleRecorder()
+        rules, dispatch = self.rules.instantiate()
+        for index in dispatch.get(ast.Module, ()):
+            module_recorder.run(rules[index], tree)
+
+        for node in tree.body:
+            key = None
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                text = "".join(lines[start - 1:node.end_lineno])
+                key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+
+            # A definition repeated verbatim in this revision is visited afresh
+            # so the two copies never share (and re-shift) one stored node.
+            reusable = key is not None and key not in units
+            unit = self._units.get(key) if reusable else None
+            if unit is not None:
+                # Keep line numbers of replayed rule nodes and function
+                # records in step with the edit.
+                delta = node.lineno - unit.node.lineno
+                ast.increment_lineno(unit.node, delta)
+                for record in unit.functions:
+                    record.lineno += delta
+                    record.end_lineno += delta
+                self.reused += 1
+            else:
+                unit = self._visit_unit(node, rules, dispatch)
+                if key is not None:
+                    self.recomputed += 1
+            if key is not None:
+                units[key] = unit
+            ordered.append(unit)
+
+        self._units = units
+        return self._aggregate(analyzer, module_recorder.calls, ordered)
+
+    def _visit_unit(self, node, rules, dispatch):
+        """Runs the fused visitor over one top-level statement."""
+        recorder = _RuleRecorder()
+        visitor = _MetricsVisitor(CodeAnalyzer.OPERATOR_NODES, recorder, rules, dispatch)
+        visitor.visit(node)
+        return _UnitMetrics(node, visitor, recorder)
+
+    def _aggregate(self, analyzer, module_calls, units):
+        """Merges per-unit metrics into a module-level analysis record."""
+        operator_counts = Counter()
+        operand_counts = Counter()
+        definitions = documented = 0
+        blocks = []
+        functions = []
+        records = []
+        module_bound = BoundBuilder()
+        exported = set()
+
+        rules, _ = self.rules.instantiate()
+        by_id = {rule.rule_id: rule for rule in rules}
+        for rule_id, node in module_calls:
+            self.rules.run(by_id[rule_id], node)
+
+        for unit in units:
+            operator_counts.update(unit.operator_counts)
+            operand_counts.update(unit.operand_counts)
+            definitions += unit.definitions
+            documented += unit.documented
+            blocks.extend(unit.blocks)
+            functions.extend(record.as_row() for record in unit.functions)
+            records.extend(unit.functions)
+            module_bound.merge(unit.module_bound)
+            exported.update(unit.exported)
+            for rule_id, node in unit.rule_calls:
+                self.rules.run(by_id[rule_id], node)
+
+        findings, secrets = analyzer._detect_text_practices()
+        issues = self.rules.collect(rules)
+        findings.extend(issue.message for issue in issues)
+        module = ast.Module(body=[unit.node for unit in units], type_ignores=[])
+
+        return {
+            "halstead_metrics": CodeAnalyzer._halstead(operator_counts, operand_counts),
+            "complexity": CodeAnalyzer._average_complexity(blocks),
+            "docstring_coverage": CodeAnalyzer._coverage(definitions, documented),
+            "bad_practices": findings,
+            "functions": functions,
+            "secrets": [list(hit) for hit in secrets],
+            "issues": [list(issue) for issue in issues],
+            "static_complexity_class": CodeAnalyzer._complexity_class(module_bound, records),
+            "module_imports": CodeAnalyzer._import_rows(module, operand_counts, exported),
+            "imported_names": [name for unit in units for name in unit.imported],
+            "clone_shingles": sorted(module_shingles([unit.shingles for unit in units])),
+        }
@@ -0,0 +1,186 @@
+"""
+cache.py
+
+Persistent, content-addressed cache for static analysis records.
+
+Records are keyed by the SHA-256 of the source text together with the
+analyzer and rule-set versions, so any change to the code or to the
+analysis logic produces a miss. Entries live in a single SQLite file and
+the least recently used ones are evicted once the stored payload exceeds
+a size budget.
+
+A hit does not write: its access time is kept in memory and written with
+the others in one transaction every ``FLUSH_EVERY`` hits, before an
+eviction and on ``flush()`` or ``close()``. Reads from several processes
+therefore do not queue up on the database's write lock.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = ".vibebench_cache.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+FLUSH_EVERY = 256
+
+
+class AnalysisCache:
+    """
+    SQLite-backed store mapping content keys to analysis records.
+
+    The connection is opened lazily and is not pickled, so a cache instance
+    can be handed to process-pool workers, each of which reconnects to the
+    same file. Within a process it may be used from any thread, one thread
+    at a time. Access times not yet flushed are not pickled; call
+    ``flush()`` or ``close()`` when done with an instance.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initializes the cache without touching the filesystem.
+
+        Args:
+            path (str): Location of the SQLite database file.
+            max_bytes (int): Payload size above which LRU entries are evicted.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._total_bytes = None
+        self._touched = {}  # key -> access time of a hit not yet written
+
+    def __getstate__(self):
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["max_bytes"])
+
+    @staticmethod
+    def make_key(source, analyzer_version, ruleset_version):
+        """
+        Builds the content address for a piece of source code.
+
+        Args:
+            source (str): The analyzed source text.
+            analyzer_version (str): Version of the metric engine.
+            ruleset_version (str): Version of the bad-practice rule set.
+
+        Returns:
+            str: A hex digest identifying the (source, versions) triple.
+        """
+        digest = hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+        return f"{digest}:{analyzer_version}:{ruleset_version}"
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS records_lru ON records (last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """
+        Looks up a record and marks it as recently used.
+
+        Args:
+            key (str): A key produced by ``make_key``.
+
+        Returns:
+            dict: The cached record, or None on a miss.
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT payload FROM records WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        if len(self._touched) >= FLUSH_EVERY:
+            self.flush()
+        return json.loads(row[0])
+
+    def flush(self):
+        """Writes the access times of the hits since the last flush."""
+        if not self._touched or self._conn is None:
+            return
+        with self._conn as conn:
+            conn.executemany(
+                "UPDATE records SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+        self._touched = {}
+
+    def put(self, key, record):
+        """
+        Stores a record, evicting least recently used entries if over budget.
+
+        Args:
+            key (str): A key produced by ``make_key``.
+            record (dict): A JSON-serialisable analysis record.
+        """
+        conn = self._connect()
+        payload = json.dumps(record)
+        self._touched.pop(key, None)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO records (key, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+        if self._total_bytes is None:
+            self._total_bytes = self.size_bytes()
+        else:
+            self._total_bytes += len(payload)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drops the oldest entries until the payload fits in ``max_bytes``."""
+        conn = self._connect()
+        self.flush()
+        # Recount first: other processes may share the same database file.
+        total = self.size_bytes()
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM records ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        with conn:
+            conn.executemany("DELETE FROM records WHERE key = ?", stale)
+        self._total_bytes = total
+
+    def size_bytes(self):
+        """Returns the total payload size currently stored, in bytes."""
+        row = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM records").fetchone()
+        return row[0]
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def clear(self):
+        """Removes every cached record."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM records")
+        self._total_bytes = 0
+        self._touched = {}
+
+    def close(self):
+        """Flushes pending access times and closes the SQLite connection, if open."""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,189 @@
+"""
+clones.py
+
+Near-duplicate and clone detection across generated samples.
+
+Each sample is reduced to a set of shingles: hashes of depth-limited AST
+subtrees in which variable names and literal values are abstracted away,
+so renaming variables or changing constants does not hide a clone (see
+``core.shingles``; analysis records carry them as 'clone_shingles'). The
+shingle sets are compressed into MinHash signatures and indexed with
+locality-sensitive hashing (banding), so looking up the near-duplicates
+of a sample only inspects the samples sharing at least one band bucket
+instead of comparing every pair.
+"""
+
+import ast
+
+import numpy as np
+
+from core.shingles import shingles
+
+# Prime just above 2**32: with 32-bit shingles and coefficients below 2**32,
+# a * x + b stays below 2**64 and the permutation is exact in uint64.
+_PRIME = np.uint64(4294967311)
+
+
+class CloneIndex:
+    """
+    MinHash/LSH index answering "which samples are near-duplicates of X".
+
+    Similarity is the MinHash estimate of the Jaccard index between shingle
+    sets. Samples are candidates only if their signatures agree on every
+    row of at least one band, which with the defaults (128 permutations in
+    16 bands of 8 rows) makes pairs above roughly 0.7 similarity very
+    likely to collide and pairs below 0.5 rarely so.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, seed=1):
+        """
+        Args:
+            threshold (float): Minimum estimated similarity reported as a clone.
+            num_perm (int): Number of MinHash permutations per signature.
+            bands (int): Number of LSH bands; must divide ``num_perm``.
+            seed (int): Seed for the permutation coefficients.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._signatures = {}
+        self._positions = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    def signature(self, source):
+        """
+        Computes the MinHash signature of a sample.
+
+        Args:
+            source (str, ast.AST or iterable): Source text, an already
+                parsed tree, or its shingles (an analysis record's
+                'clone_shingles').
+
+        Returns:
+            numpy.ndarray: A uint64 array of length ``num_perm``, or None if
+                           the source does not parse.
+        """
+        if source is None:
+            return None
+        if isinstance(source, str):
+            try:
+                source = ast.parse(source)
+            except (SyntaxError, RecursionError):
+                return None
+        if isinstance(source, ast.AST):
+            source = shingles(source)
+
+        values = np.fromiter(source, dtype=np.uint64)
+        if not len(values):
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        hashed = (np.outer(self._a, values) + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key, source):
+        """
+        Indexes a sample under ``key``, replacing any sample indexed under it.
+
+        Args:
+            key (hashable): Identifier of the sample, e.g. its path.
+            source (str, ast.AST or iterable): As for ``signature``.
+
+        Returns:
+            bool: False if the sample could not be parsed and was skipped.
+        """
+        signature = self.signature(source)
+        if signature is None:
+            return False
+        previous = self._signatures.get(key)
+        if previous is not None:
+            for band, bucket in self._band_keys(previous):
+                keys = self._buckets[band][bucket]
+                keys.remove(key)
+                if not keys:
+                    del self._buckets[band][bucket]
+        self._signatures[key] = signature
+        self._positions.setdefault(key, len(self._positions))
+        for band, bucket in self._band_keys(signature):
+            self._buckets[band].setdefault(bucket, []).append(key)
+        return True
+
+    def _matches(self, signature, exclude=None):
+        candidates = set()
+        for band, bucket in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(bucket, ()))
+        candidates.discard(exclude)
+
+        matches = []
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold:
+                matches.append((key, round(similarity, 4)))
+        # Ties are broken by insertion order so results are deterministic.
+        matches.sort(key=lambda item: (-item[1], self._positions[item[0]]))
+        return matches
+
+    def near_duplicates(self, key):
+        """
+        Lists indexed samples similar to an indexed sample.
+
+        Returns:
+            list: (key, estimated similarity) pairs, most similar first,
+                  ties in insertion order.
+        """
+        return self._matches(self._signatures[key], exclude=key)
+
+    def query(self, source):
+        """
+        Lists indexed samples similar to an arbitrary, unindexed sample.
+
+        Returns:
+            list: (key, estimated similarity) pairs, most similar first.
+        """
+        signature = self.signature(source)
+        return [] if signature is None else self._matches(signature)
+
+    def clusters(self):
+        """
+        Groups indexed samples into clone clusters (connected components of
+        the near-duplicate relation).
+
+        Returns:
+            dict: key -> integer cluster id. Ids are numbered in insertion
+                  order of each cluster's first member; a sample without
+                  near-duplicates forms its own cluster.
+        """
+        parent = {key: key for key in self._signatures}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key in self._signatures:
+            for other, _ in self.near_duplicates(key):
+                root_a, root_b = find(key), find(other)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+        ids = {}
+        result = {}
+        for key in self._signatures:
+            root = find(key)
+            result[key] = ids.setdefault(root, len(ids))
+        return result
@@ -0,0 +1,340 @@
+"""
+complexity_class.py
+
+Execution-free upper bounds on the time complexity of functions.
+
+A bound is inferred from the shape of the code alone. Each statement's own
+cost (O(1), or O(n) / O(n log n) for known costly builtins such as
+``sorted``, ``list.index`` or ``in`` on a list) is multiplied by the loops
+enclosing it: O(n) per loop over a non-constant iterable, O(log n) for a
+``while`` loop that halves its state, O(1) for a loop over a literal. The
+function's bound is the largest product, adjusted for recursion on
+shrinking arguments. Calls to other user functions count as O(1), so the
+result is a cheap signal of intent, not a proof.
+"""
+
+import ast
+import re
+from collections import namedtuple
+
+from core.perf_rules import (
+    LOOP_NODES, SCOPE_NODES, binding_kind, call_name, decreases_by_constant,
+    is_memoized, is_self_call, split_loop,
+)
+
+Bound = namedtuple("Bound", ["exponential", "poly", "log"])
+Bound.__doc__ = """O(2^n) if ``exponential``, else O(n^poly * log^log n); ordered by growth."""
+
+CONSTANT = Bound(False, 0, 0)
+LOGARITHMIC = Bound(False, 0, 1)
+LINEAR = Bound(False, 1, 0)
+LINEARITHMIC = Bound(False, 1, 1)
+EXPONENTIAL = Bound(True, 0, 0)
+
+# Builtins and methods whose cost grows with the size of their argument
+_LINEAR_CALLS = {"sum", "min", "max", "any", "all", "list", "tuple", "set", "dict",
+                 "frozenset", "deepcopy", "join", "index", "count", "remove", "copy"}
+_SORT_CALLS = {"sorted", "sort", "nlargest", "nsmallest"}
+
+_LABEL = re.compile(r"O\((?:(2\^n)|1|(n(?:\^(\d+))?)?\s*(log(?:\^(\d+))? n)?)\)")
+
+
+def multiply(a, b):
+    """Returns the bound of doing ``b`` work ``a`` times."""
+    if a.exponential or b.exponential:
+        return EXPONENTIAL
+    return Bound(False, a.poly + b.poly, a.log + b.log)
+
+
+def format_bound(bound):
+    """Renders a bound as 'O(1)', 'O(log n)', 'O(n log n)', 'O(n^2)', 'O(2^n)'..."""
+    if bound.exponential:
+        return "O(2^n)"
+    terms = []
+    if bound.poly:
+        terms.append("n" if bound.poly == 1 else f"n^{bound.poly}")
+    if bound.log:
+        terms.append("log n" if bound.log == 1 else f"log^{bound.log} n")
+    return f"O({' '.join(terms) or '1'})"
+
+
+def parse_complexity_class(label):
+    """
+    Parses a label produced by ``format_bound`` back into a ``Bound``.
+
+    Raises:
+        ValueError: If ``label`` is not a recognised complexity class.
+    """
+    match = _LABEL.fullmatch(label or "")
+    if match is None:
+        raise ValueError(f"Not a complexity class: {label!r}")
+    exponential, linear, power, logarithm, log_power = match.groups()
+    if exponential:
+        return EXPONENTIAL
+    poly = int(power or 1) if linear else 0
+    log = int(log_power or 1) if logarithm else 0
+    return Bound(False, poly, log)
+
+
+def worst_class(labels):
+    """Returns the fastest-growing of several labels, or None if there are none."""
+    labels = [label for label in labels if label]
+    return max(labels, key=parse_complexity_class) if labels else None
+
+
+def _is_constant_collection(node):
+    """True for iterables whose length does not depend on the input."""
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(isinstance(elt, ast.Constant) for elt in node.elts)
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "range":
+        return all(isinstance(arg, ast.Constant) for arg in node.args)
+    return False
+
+
+def _halves(node):
+    """True for ``x // 2``, ``x >> 1`` and similar shrinking-by-a-factor forms."""
+    return isinstance(node, ast.BinOp) and isinstance(node.op, (ast.FloorDiv, ast.RShift))
+
+
+def is_halving(node):
+    """True for ``n //= 2``, ``mid = (lo + hi) // 2`` and similar assignments."""
+    if isinstance(node, ast.AugAssign):
+        return isinstance(node.op, (ast.FloorDiv, ast.RShift))
+    return isinstance(node, ast.Assign) and _halves(node.value)
+
+
+def _halving_loop(loop):
+    """True if a while loop divides its state (``n //= 2``, binary search midpoints)."""
+    return any(is_halving(node) for node in ast.walk(loop))
+
+
+def _loop_factor(loop):
+    """Bound on the number of iterations of a ``for`` loop or a comprehension."""
+    if isinstance(loop, (ast.For, ast.AsyncFor)):
+        return CONSTANT if _is_constant_collection(loop.iter) else LINEAR
+    factor = CONSTANT
+    for generator in loop.generators:
+        if not _is_constant_collection(generator.iter):
+            factor = multiply(factor, LINEAR)
+    return factor
+
+
+class Loop:
+    """
+    A loop enclosing the code being inferred, with its bound on iterations.
+
+    A ``while`` loop starts out linear; whoever walks its body calls
+    ``halve()`` on meeting a halving assignment (see ``is_halving``).
+    """
+
+    __slots__ = ("factor",)
+
+    def __init__(self, node):
+        self.factor = LINEAR if isinstance(node, ast.While) else _loop_factor(node)
+
+    def halve(self):
+        self.factor = LOGARITHMIC
+
+
+def _call_cost(node):
+    """Cost of a call itself, excluding the evaluation of its arguments."""
+    name = call_name(node)
+    if not node.args and not isinstance(node.func, ast.Attribute):
+        return CONSTANT
+    if name in _SORT_CALLS:
+        return LINEARITHMIC
+    if name in ("min", "max") and len(node.args) > 1:
+        return CONSTANT  # max(a, b) compares its arguments only
+    if name in _LINEAR_CALLS:
+        return LINEAR
+    if name in ("pop", "insert") and node.args and isinstance(node.args[0], ast.Constant) \
+            and node.args[0].value == 0:
+        return LINEAR
+    return CONSTANT
+
+
+def _repeat(loops):
+    """Bound on how often code inside ``loops`` runs."""
+    factor = CONSTANT
+    for loop in loops:
+        factor = multiply(factor, loop.factor)
+    return factor
+
+
+def _shrinks(arg, halved):
+    """
+    Classifies a recursive call argument as 'constant', 'half' or None.
+
+    ``halved`` holds names assigned from a halving expression, so that
+    ``search(items, mid + 1, high)`` counts as halving, not as a step.
+    """
+    if any(isinstance(node, ast.Name) and node.id in halved for node in ast.walk(arg)):
+        return "half"
+    if decreases_by_constant(arg):
+        return "constant"
+    if _halves(arg):
+        return "half"
+    if isinstance(arg, ast.Subscript) and isinstance(arg.slice, ast.Slice):
+        bounds = (arg.slice.lower, arg.slice.upper)
+        if all(bound is None or isinstance(bound, ast.Constant) for bound in bounds):
+            return "constant"  # items[1:] drops one element per call
+        return "half"
+    return None
+
+
+class BoundBuilder:
+    """
+    Gathers what the bound of a function or a module's top level depends on.
+
+    A walker hands the scope's own nodes (nested function, class and lambda
+    bodies excluded) to ``add`` together with the ``Loop``s enclosing them
+    inside the scope, and every assignment under the scope, nested
+    definitions included, to ``bind``. Nothing is evaluated before
+    ``bound()``, so a ``while`` loop may still turn out to halve and a name
+    tested with ``in`` may be bound to a list further down. This lets
+    ``core.analyzer`` fill one builder per function during its single pass
+    over the file.
+    """
+
+    __slots__ = ("node", "sites", "tests", "kinds", "self_calls", "returned", "halved")
+
+    def __init__(self, node=None):
+        """
+        Args:
+            node (ast.AST): The FunctionDef or AsyncFunctionDef, or None for
+                            a module's top level.
+        """
+        self.node = node
+        self.sites = {}        # loops -> largest own cost of a node inside them
+        self.tests = []        # (loops, name) for ``x in name``: linear if name is a list
+        self.kinds = {}        # name -> kinds of the values bound to it
+        self.self_calls = []
+        self.returned = set()  # calls that are a whole return value: one runs per branch
+        self.halved = set()
+
+    def add(self, node, loops):
+        """Records one of the scope's own nodes, evaluated inside ``loops``."""
+        cost = CONSTANT
+        if isinstance(node, ast.Call):
+            cost = _call_cost(node)
+            if self.node is not None and is_self_call(node, self.node.name):
+                self.self_calls.append(node)
+        elif isinstance(node, ast.Compare):
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if isinstance(comparator, ast.ListComp):
+                        cost = LINEAR
+                    elif isinstance(comparator, ast.Name):
+                        self.tests.append((loops, comparator.id))
+        elif isinstance(node, ast.Subscript):
+            if isinstance(node.slice, ast.Slice):
+                cost = LINEAR  # slicing copies
+        elif isinstance(node, ast.Return):
+            if isinstance(node.value, ast.Call):
+                self.returned.add(node.value)
+        elif isinstance(node, ast.Assign) and _halves(node.value):
+            self.halved.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        worst = self.sites.get(loops)
+        if worst is None or cost > worst:
+            self.sites[loops] = cost
+
+    def bind(self, node):
+        """Records an ``ast.Assign`` found anywhere under the scope."""
+        kind = binding_kind(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.kinds.setdefault(target.id, set()).add(kind)
+
+    def inherit(self, inner):
+        """Adds the bindings recorded by the builder of a scope nested in this one."""
+        for name, kinds in inner.kinds.items():
+            self.kinds.setdefault(name, set()).update(kinds)
+
+    def merge(self, other):
+        """Adds the top-level facts gathered over a later part of the same module."""
+        for loops, cost in other.sites.items():
+            worst = self.sites.get(loops)
+            if worst is None or cost > worst:
+                self.sites[loops] = cost
+        self.tests.extend(other.tests)
+        self.inherit(other)
+
+    def bound(self):
+        """
+        Evaluates the recorded facts.
+
+        Returns:
+            Bound: The inferred upper bound.
+        """
+        lists = {name for name, found in self.kinds.items() if found == {"list"}}
+        worst = CONSTANT
+        for loops, cost in self.sites.items():
+            worst = max(worst, multiply(_repeat(loops), cost))
+        for loops, name in self.tests:
+            if name in lists:
+                worst = max(worst, multiply(_repeat(loops), LINEAR))
+
+        if not self.self_calls:
+            return worst
+        shapes = {_shrinks(arg, self.halved) for call in self.self_calls for arg in call.args}
+        branching = len([call for call in self.self_calls if call not in self.returned])
+        if "half" in shapes:
+            # Master theorem: T(n) = a T(n/2) + f(n)
+            if branching >= 2:
+                return multiply(worst, LOGARITHMIC) if worst >= LINEAR else LINEAR
+            return worst if worst >= LINEAR else multiply(worst, LOGARITHMIC)
+        if "constant" in shapes:
+            if branching >= 2 and not is_memoized(self.node):
+                return EXPONENTIAL
+            return multiply(LINEAR, worst)
+        return multiply(LINEAR, worst)
+
+
+def infer_bound(node):
+    """
+    Infers an upper-bound ``Bound`` for a function or a module's top level.
+
+    Walks ``node`` on its own; ``core.analyzer`` gets the same result from
+    a ``BoundBuilder`` it fills during its metrics pass.
+
+    Args:
+        node (ast.AST): A FunctionDef, AsyncFunctionDef or Module. Nested
+                        function and class bodies are not included.
+
+    Returns:
+        Bound: The inferred upper bound.
+    """
+    builder = BoundBuilder(None if isinstance(node, ast.Module) else node)
+    for statement in node.body:
+        for child in ast.walk(statement):
+            if isinstance(child, ast.Assign):
+                builder.bind(child)
+
+    pending = [(statement, ()) for statement in node.body]
+    while pending:
+        current, loops = pending.pop()
+        if isinstance(current, SCOPE_NODES):
+            continue
+        builder.add(current, loops)
+        if isinstance(current, LOOP_NODES):
+            loop = Loop(current)
+            if isinstance(current, ast.While) and _halving_loop(current):
+                loop.halve()
+            once, repeated = split_loop(current)
+            pending.extend((child, loops) for child in once)
+            pending.extend((child, loops + (loop,)) for child in repeated)
+        else:
+            pending.extend((child, loops) for child in ast.iter_child_nodes(current))
+    return builder.bound()
+
+
+def infer_complexity_class(node):
+    """
+    Infers the complexity class label of a function or a module's top level.
+
+    Returns:
+        str: A label such as 'O(1)', 'O(n log n)' or 'O(n^2)'.
+    """
+    return format_bound(infer_bound(node))
@@ -0,0 +1,351 @@
+"""
+daemon.py
+
+Long-lived analysis server for low-latency ``vibebench analyze`` calls.
+
+Editor integrations and pre-commit hooks analyze one small file at a time,
+so most of a CLI call is spent starting the interpreter and importing the
+analyzer. ``AnalysisServer`` keeps those imports, the compiled rule set and
+the open SQLite caches warm in one process listening on a Unix socket;
+``forward_cli`` lets the CLI hand single-file requests to it before paying
+for the heavy imports, and falls back to in-process analysis when no server
+answers.
+
+Protocol: the client connects, sends one JSON object terminated by a
+newline and reads one JSON line back. Requests carry ``op`` ('ping',
+'analyze' or 'shutdown') and ``protocol``; 'analyze' also takes ``code``,
+``disabled_rules`` (list of rule ids) and ``cache`` (absolute path of the
+SQLite cache, or null). Responses carry ``status`` ('ok' or 'error') and
+either the payload or an ``error`` message; 'ping' and 'analyze' answers
+include the server's ``analyzer_version``, and the CLI does not use a
+server whose version differs from its own (one started before an upgrade).
+
+This module only imports the standard library and ``core.version`` at load
+time, so the client side stays cheap; the server imports the analyzer when
+it is created.
+"""
+
+import json
+import os
+import socket
+import sys
+
+from core.version import ANALYZER_VERSION
+
+DEFAULT_SOCKET_PATH = ".vibebench.sock"
+PROTOCOL_VERSION = 1
+
+# Connecting fails at once when no server listens; the read timeout only
+# guards against a server that accepted the request and then hung.
+CONNECT_TIMEOUT = 0.5
+RESPONSE_TIMEOUT = 60.0
+
+
+class DaemonError(RuntimeError):
+    """Raised when a server cannot be started on the requested socket."""
+
+
+class AnalysisServer:
+    """
+    Serves analysis requests over a Unix socket, one connection at a time.
+
+    Requests are handled sequentially: a single-file analysis takes a few
+    milliseconds, and a serial loop lets every request share the warm
+    SQLite connections without cross-thread locking.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, registry=None):
+        """
+        Args:
+            socket_path (str): Filesystem path of the Unix socket.
+            registry (RuleRegistry): Rules applied to every request, minus the
+                                     ones a request disables. Defaults to
+                                     ``core.rules.DEFAULT_REGISTRY``.
+        """
+        # Imported here rather than at module level so that the client side
+        # stays light; the server pays for it once, before any request.
+        from core import analyzer
+        from core.rules import DEFAULT_REGISTRY
+
+        self._analyzer = analyzer
+        self.socket_path = socket_path
+        self.registry = DEFAULT_REGISTRY if registry is None else registry
+        self.requests_served = 0
+        self._registries = {}
+        self._caches = {}
+        self._sock = None
+        self._running = False
+
+    def bind(self):
+        """
+        Creates the listening socket, replacing a stale socket file.
+
+        Raises:
+            DaemonError: If another server already answers on the socket.
+        """
+        if os.path.exists(self.socket_path):
+            if request({"op": "ping"}, self.socket_path) is not None:
+                raise DaemonError(f"A server is already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.socket_path)
+        self._sock.listen(16)
+
+    def serve_forever(self):
+        """Accepts requests until a 'shutdown' request arrives or on Ctrl+C."""
+        if self._sock is None:
+            self.bind()
+        self._running = True
+        try:
+            while self._running:
+                conn, _ = self._sock.accept()
+                with conn:
+                    self._handle_connection(conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Closes the socket, removes its file and closes every cache."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        for cache in self._caches.values():
+            cache.close()
+        self._caches.clear()
+
+    def _handle_connection(self, conn):
+        conn.settimeout(RESPONSE_TIMEOUT)
+        try:
+            message = json.loads(_read_line(conn))
+        except (OSError, ValueError) as e:
+            response = {"status": "error", "error": f"Bad request: {e}"}
+        else:
+            try:
+                response = self.handle(message)
+            except Exception as e:
+                # One bad request must not take the server down with it.
+                response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        try:
+            conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+        except OSError:
+            pass  # client went away; nothing to report to
+        self.requests_served += 1
+
+    def handle(self, message):
+        """
+        Answers one decoded request.
+
+        Args:
+            message (dict): The request object.
+
+        Returns:
+            dict: The response object.
+
+        Raises:
+            Exception: Whatever analyzing a malformed request raises;
+                       ``serve_forever`` answers it as an error response.
+        """
+        if message.get("protocol") != PROTOCOL_VERSION:
+            return {"status": "error", "error": "Unsupported protocol version"}
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "analyzer_version": self._analyzer.ANALYZER_VERSION,
+                "requests_served": self.requests_served,
+            }
+        if op == "shutdown":
+            self._running = False
+            return {"status": "ok"}
+        if op == "analyze":
+            try:
+                record = self._analyze(message)
+            except KeyError as e:
+                return {"status": "error", "error": f"Bad analyze request: {e.args[0]}"}
+            return {
+                "status": "ok",
+                "analyzer_version": self._analyzer.ANALYZER_VERSION,
+                "record": record,
+            }
+        return {"status": "error", "error": f"Unknown op {op!r}"}
+
+    def _analyze(self, message):
+        """Runs ``CodeAnalyzer.analyze`` for an 'analyze' request."""
+        if not isinstance(message["code"], str):
+            raise TypeError("'code' must be a string")
+        analyzer = self._analyzer.CodeAnalyzer(
+            message["code"],
+            cache=self._cache(message.get("cache")),
+            rules=self._registry(message.get("disabled_rules", ())),
+        )
+        record = dict(analyzer.analyze())
+        record["functions"] = [
+            dict(zip(self._analyzer.FunctionMetrics.__slots__, row)) for row in record["functions"]
+        ]
+        return record
+
+    def _registry(self, disabled):
+        """Returns a registry with ``disabled`` switched off, built once per set."""
+        key = frozenset(disabled)
+        registry = self._registries.get(key)
+        if registry is None:
+            registry = self.registry.copy()
+            for rule_id in key:
+                registry.disable(rule_id)
+            self._registries[key] = registry
+        return registry
+
+    def _cache(self, path):
+        """Returns the warm cache for ``path``, or None when caching is off."""
+        if path is None:
+            return None
+        cache = self._caches.get(path)
+        if cache is None:
+            from core.cache import AnalysisCache
+            cache = self._caches[path] = AnalysisCache(path)
+        return cache
+
+
+def _read_line(conn):
+    """Reads bytes from ``conn`` up to the first newline and decodes them."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        newline = chunk.find(b"\n")
+        if newline >= 0:
+            chunks.append(chunk[:newline])
+            break
+        chunks.append(chunk)
+    return b"".join(chunks).decode("utf-8")
+
+
+def request(message, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Sends one request to a running server.
+
+    Args:
+        message (dict): The request; ``protocol`` is filled in.
+        socket_path (str): Path of the server's Unix socket.
+
+    Returns:
+        dict: The decoded response, or None if no server answered.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    payload = json.dumps({"protocol": PROTOCOL_VERSION, **message}).encode("utf-8")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(payload + b"\n")
+            line = _read_line(sock)
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def analyze_results(path, record, schema_version):
+    """
+    Builds the JSON document ``vibebench analyze`` prints for one file.
+
+    Shared by the in-process and the forwarded single-file code paths and
+    by the per-file lines of directory and glob runs, so all of them print
+    the same fields: the whole analysis record except its
+    'clone_shingles', plus 'estimated_import_ms' and 'unused_import_ms'
+    as in benchmark records (None without a table for this Python).
+    Error records ('file' and 'error' only) are passed through.
+
+    Args:
+        path (str): The analyzed file, as given on the command line.
+        record (dict): An analysis record whose 'functions' are labelled dicts.
+        schema_version (str): Value of the ``schema_version`` field.
+
+    Returns:
+        dict: The output document.
+    """
+    results = {"schema_version": schema_version, "file": path}
+    results.update(
+        (key, value) for key, value in record.items() if key not in ("file", "clone_shingles")
+    )
+    if "module_imports" in record:
+        from core.import_costs import default_table
+
+        table = default_table()
+        cost = None if table is None else table.estimate(record["module_imports"])
+        results["estimated_import_ms"] = None if cost is None else cost.total_ms
+        results["unused_import_ms"] = None if cost is None else cost.unused_ms
+    return results
+
+
+def forward_cli(argv, schema_version):
+    """
+    Answers ``vibebench analyze --input FILE`` through a running server.
+
+    Called before the CLI imports the analyzer. Only single-file requests
+    are forwarded; directories, globs, ``--rule-stats`` and ``--no-daemon``
+    are left to the in-process code path. Returns normally whenever the
+    request was not answered, or was answered by a server running another
+    analyzer version (which is reported on stderr), so the caller simply
+    carries on.
+
+    Args:
+        argv (list): The arguments following ``analyze``.
+        schema_version (str): Value of the output's ``schema_version`` field.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--input")
+    parser.add_argument("--output")
+    parser.add_argument("--disable-rule", action="append", default=[])
+    parser.add_argument("--cache", default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--no-daemon", action="store_true")
+    parser.add_argument("--rule-stats", action="store_true")
+    args, unknown = parser.parse_known_args(argv)
+    if (unknown or args.no_daemon or args.rule_stats
+            or not args.input or not os.path.isfile(args.input)):
+        return
+
+    if args.no_cache:
+        cache_path = None
+    else:
+        from core.cache import DEFAULT_CACHE_PATH
+        cache_path = os.path.abspath(args.cache or DEFAULT_CACHE_PATH)
+
+    with open(args.input, "r") as f:
+        code = f.read()
+    response = request({
+        "op": "analyze",
+        "code": code,
+        "disabled_rules": args.disable_rule,
+        "cache": cache_path,
+    }, args.socket)
+    if response is None or response.get("status") != "ok":
+        return
+    if response.get("analyzer_version") != ANALYZER_VERSION:
+        print(f"vibebench: ignoring the daemon on {args.socket}: it runs analyzer "
+              f"{response.get('analyzer_version')}, this is {ANALYZER_VERSION}; restart it "
+              f"with 'vibebench serve --stop' and 'vibebench serve'", file=sys.stderr)
+        return
+
+    results = analyze_results(args.input, response["record"], schema_version)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+    sys.exit(0)
@@ -0,0 +1,277 @@
+"""
+forkserver.py
+
+Warm interpreters that fork one child per sample (Unix only).
+
+A cold ``python sample.py`` spends most of a short sample's wall time
+starting the interpreter and importing ``site`` and common stdlib modules.
+A fork server pays that once: it imports ``WARM_MODULES``, then for every
+request forks a child that applies the resource limits and runs the file
+with ``core.harness``. The child times the phases of its own module
+execution, so the reported run time excludes interpreter start-up; the
+fork itself is reported separately as the start-up phase.
+
+Protocol: the server reads one JSON request per line on stdin and writes
+one JSON response per line on stdout, one request at a time. Requests
+carry ``path``, ``timeout`` (seconds), ``memory_limit`` (bytes), ``cpu``
+(CPU to pin the child to, or null), ``env`` (variables to set in the
+child) and optionally ``pyc`` (the sample's precompiled code) and
+``trace_memory``. Responses carry ``returncode``, ``timed_out``,
+``phases`` ('startup_ns', 'compile_ns', 'import_ns' and 'run_ns'; null if
+the child did not report them), ``memory`` (``harness.memory_report`` when
+tracing, else null), ``rusage`` (see ``rusage_metrics``), ``stdout`` (the first
+``STDOUT_LIMIT`` bytes) and ``stderr``.
+
+This file runs as a script, so it imports only the standard library and
+the harness next to it.
+"""
+
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    from core.harness import execute
+except ImportError:  # run as a script, with core/ on sys.path
+    from harness import execute
+
+SERVER_SCRIPT = os.path.abspath(__file__)
+
+# Imported once by the server so that samples find them already loaded.
+WARM_MODULES = ("atexit", "bisect", "collections", "copy", "dataclasses", "functools",
+                "heapq", "itertools", "json", "math", "operator", "random", "re",
+                "string", "traceback", "typing")
+
+STDOUT_LIMIT = 4096
+STDERR_LIMIT = 1 << 20
+
+
+class ForkServer:
+    """
+    Client handle of one fork-server process.
+
+    The server is started on the first ``run`` and restarted if it dies.
+    It runs one sample at a time, so calls on one handle are serialized;
+    concurrent callers use one handle each.
+    """
+
+    def __init__(self, python=sys.executable):
+        """
+        Args:
+            python (str): Interpreter the server runs in.
+        """
+        self.python = python
+        self._process = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts the server process if it is not running."""
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                [self.python, SERVER_SCRIPT],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            )
+
+    def run(self, path, timeout, memory_limit, cpu=None, env=None, pyc=None,
+            trace_memory=False):
+        """
+        Runs one file in a forked child.
+
+        Args:
+            path (str): The script to execute.
+            timeout (float): Wall-clock limit, also used as the CPU rlimit.
+            memory_limit (int): Address-space rlimit in bytes.
+            cpu (int): CPU to pin the child to, if any.
+            env (dict): Environment variables to set in the child.
+            pyc (str): Precompiled code from ``harness.compile_sample``.
+            trace_memory (bool): Run the file under ``tracemalloc``.
+
+        Returns:
+            dict: The server's response; see the module docstring.
+
+        Raises:
+            RuntimeError: If the server exits without answering.
+        """
+        request = {"path": os.path.abspath(path), "timeout": timeout,
+                   "memory_limit": memory_limit, "cpu": cpu, "env": env or {}, "pyc": pyc,
+                   "trace_memory": trace_memory}
+        with self._lock:
+            self.start()
+            try:
+                self._process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+                self._process.stdin.flush()
+                line = self._process.stdout.readline()
+            except BrokenPipeError:
+                line = b""
+            if not line:
+                self.close()
+                raise RuntimeError("fork server exited unexpectedly")
+        return json.loads(line)
+
+    def close(self):
+        """Stops the server; it exits when its stdin is closed."""
+        if self._process is not None:
+            for stream in (self._process.stdin, self._process.stdout):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+
+def _child(request, status_fd, stdout_fd, stderr_fd):
+    """Runs the requested file in the forked child; never returns."""
+    code = 1
+    try:
+        ready = time.perf_counter_ns()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        sys.stdin = open(os.devnull)  # drop anything buffered from the request pipe
+        if resource:
+            timeout = max(1, int(request["timeout"] + 0.999))
+            resource.setrlimit(resource.RLIMIT_CPU, (timeout, timeout))
+            resource.setrlimit(resource.RLIMIT_AS, (request["memory_limit"],) * 2)
+        if request["cpu"] is not None:
+            os.sched_setaffinity(0, {request["cpu"]})
+        os.environ.update(request["env"])
+
+        path = request["path"]
+        sys.path.insert(0, os.path.dirname(path))
+        code, phases, memory = execute(path, request.get("pyc"), request.get("trace_memory"))
+        os.write(status_fd, json.dumps({"entry": ready, **phases, "memory": memory}).encode("utf-8"))
+
+        import atexit
+        atexit._run_exitfuncs()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os._exit(code)
+
+
+def wait_for_exit(fd, deadline):
+    """
+    Reads a child's end of a pipe until it closes or ``deadline`` passes.
+
+    A child holding the write end of a pipe closes it when it exits, so
+    EOF marks the exit without polling or a SIGCHLD handler.
+
+    Args:
+        fd (int): Read end of the pipe.
+        deadline (float): ``time.perf_counter()`` value to give up at.
+
+    Returns:
+        tuple: (bytes read, True if the deadline passed first).
+    """
+    data = b""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            return data, True
+        chunk = os.read(fd, 256)
+        if not chunk:
+            return data, False
+        data += chunk
+
+
+def rusage_metrics(usage):
+    """
+    Converts the ``resource.struct_rusage`` of a reaped child to a dict.
+
+    Returns:
+        dict: 'user_time' and 'system_time' (CPU seconds), 'max_rss_kb',
+              'major_faults', 'minor_faults', 'voluntary_switches' and
+              'involuntary_switches'.
+    """
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS.
+    max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {
+        "user_time": round(usage.ru_utime, 4),
+        "system_time": round(usage.ru_stime, 4),
+        "max_rss_kb": max_rss,
+        "major_faults": usage.ru_majflt,
+        "minor_faults": usage.ru_minflt,
+        "voluntary_switches": usage.ru_nvcsw,
+        "involuntary_switches": usage.ru_nivcsw,
+    }
+
+
+def _read(f, limit):
+    f.seek(0)
+    return f.read(limit).decode("utf-8", "replace")
+
+
+def handle(request):
+    """
+    Forks a child for one request and waits for it.
+
+    Args:
+        request (dict): A request; see the module docstring.
+
+    Returns:
+        dict: The response.
+    """
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        status_r, status_w = os.pipe()
+        forked = time.perf_counter_ns()
+        pid = os.fork()
+        if pid == 0:
+            os.close(status_r)
+            _child(request, status_w, stdout.fileno(), stderr.fileno())
+        os.close(status_w)
+
+        status, timed_out = wait_for_exit(status_r, forked / 1e9 + request["timeout"])
+        if timed_out:
+            os.kill(pid, signal.SIGKILL)
+        os.close(status_r)
+        _, wait_status, usage = os.wait4(pid, 0)
+
+        phases = json.loads(status) if status else None
+        memory = None
+        if phases is not None:
+            phases["startup_ns"] = phases.pop("entry") - forked
+            memory = phases.pop("memory")
+        return {
+            "returncode": os.waitstatus_to_exitcode(wait_status),
+            "timed_out": timed_out,
+            "phases": phases,
+            "memory": memory,
+            "rusage": rusage_metrics(usage),
+            "stdout": _read(stdout, STDOUT_LIMIT),
+            "stderr": _read(stderr, STDERR_LIMIT),
+        }
+
+
+def serve():
+    """Serves requests from stdin until it is closed."""
+    sys.path.pop(0)  # this script's directory is not the samples'
+    for name in WARM_MODULES:
+        __import__(name)
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        out.write(json.dumps(handle(json.loads(line))).encode("utf-8") + b"\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,100 @@
+"""
+halstead.py
+
+Vectorised Halstead (1977) metrics for whole corpora.
+
+Per-file analysis only needs to produce the four primitives (n1, n2, N1,
+N2). This module stacks them into NumPy arrays so that the derived suite
+(vocabulary, length, volume, difficulty, effort, time and delivered bugs)
+and per-model aggregates are evaluated as array operations instead of a
+Python loop over every sample.
+"""
+
+import numpy as np
+
+PRIMITIVES = ("n1", "n2", "N1", "N2")
+DERIVED = ("vocabulary", "length", "volume", "difficulty", "effort", "time", "bugs")
+
+# Stroud number (elementary mental discriminations per second) and the
+# volume-per-delivered-bug constant used by Halstead.
+STROUD_NUMBER = 18
+BUG_VOLUME = 3000
+
+
+def halstead_suite(n1, n2, N1, N2):
+    """
+    Computes the derived Halstead metrics for arrays of primitives.
+
+    Args:
+        n1, n2 (array-like): Unique operator and operand counts.
+        N1, N2 (array-like): Total operator and operand occurrences.
+
+    Returns:
+        dict: Metric name -> float64 array, for every name in ``DERIVED``.
+              Rows whose primitives are NaN stay NaN.
+    """
+    n1, n2, N1, N2 = (np.asarray(a, dtype=np.float64) for a in (n1, n2, N1, N2))
+
+    vocabulary = n1 + n2
+    length = N1 + N2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume = np.where(vocabulary > 0, length * np.log2(vocabulary), 0.0)
+        difficulty = np.where(n2 > 0, (n1 / 2.0) * (N2 / n2), 0.0)
+    volume = np.where(np.isnan(vocabulary), np.nan, volume)
+    difficulty = np.where(np.isnan(n2), np.nan, difficulty)
+    effort = difficulty * volume
+
+    return {
+        "vocabulary": vocabulary,
+        "length": length,
+        "volume": volume,
+        "difficulty": difficulty,
+        "effort": effort,
+        "time": effort / STROUD_NUMBER,
+        "bugs": volume / BUG_VOLUME,
+    }
+
+
+def collect_primitives(records, key="halstead"):
+    """
+    Stacks the Halstead primitives of many records into one array.
+
+    Args:
+        records (list): Dicts holding a primitives mapping under ``key``.
+                        Missing or non-dict values (e.g. "Syntax Error")
+                        become a row of NaN.
+        key (str): The record field holding the primitives.
+
+    Returns:
+        numpy.ndarray: A float64 array of shape (len(records), 4) with
+                       columns ordered as ``PRIMITIVES``.
+    """
+    table = np.full((len(records), len(PRIMITIVES)), np.nan)
+    for row, record in enumerate(records):
+        values = record.get(key)
+        if isinstance(values, dict):
+            table[row] = [values[name] for name in PRIMITIVES]
+    return table
+
+
+def aggregate_by_label(labels, suite):
+    """
+    Averages each metric per label (e.g. per model), ignoring NaN rows.
+
+    Args:
+        labels (list): One label per row of the metric arrays.
+        suite (dict): Metric name -> array, as returned by ``halstead_suite``.
+
+    Returns:
+        dict: label -> {metric name -> mean, or None if the label has no
+              valid rows}.
+    """
+    unique, index = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    result = {label: {} for label in unique}
+    for name, values in suite.items():
+        valid = ~np.isnan(values)
+        sums = np.bincount(index[valid], weights=values[valid], minlength=len(unique))
+        counts = np.bincount(index[valid], minlength=len(unique))
+        for i, label in enumerate(unique):
+            result[label][name] = float(sums[i] / counts[i]) if counts[i] else None
+    return result
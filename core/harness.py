@@ -0,0 +1,234 @@
+"""
+harness.py
+
+Runs a sample as ``__main__`` and timestamps its execution phases.
+
+``CodeExecutor`` starts ``python harness.py STATUS_FD PYC FILE [trace]``
+instead of ``python FILE`` (and the fork server calls ``execute`` in its
+children).
+The harness loads the sample's code object from the ``.pyc`` written by
+``compile_sample`` in a batch stage, or compiles the source itself when
+there is none, then executes it with ``__import__`` wrapped so that time
+spent in the sample's import statements is accounted separately from the
+rest of its module execution. All times use ``time.perf_counter_ns``,
+whose clock is shared with the parent, so the parent can derive the
+interpreter start-up time from the harness's entry timestamp.
+
+On exit the harness writes one JSON object to STATUS_FD: 'entry'
+(perf_counter_ns at harness start) and 'compile_ns', 'import_ns' and
+'run_ns' (module execution excluding imports).
+
+With ``trace`` the module runs under ``tracemalloc`` and the object also
+carries 'memory' (see ``memory_report``). Tracing slows allocation-heavy
+code down severalfold, so its phase times are not comparable with
+untraced runs.
+
+This file runs as a script, so it imports only the standard library.
+"""
+
+import time
+
+_ENTRY_NS = time.perf_counter_ns()
+
+# Only modules the interpreter has loaded at start-up anyway, so that the
+# sample's own imports cost what they would under ``python FILE``.
+import builtins  # noqa: E402
+import marshal  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+from _frozen_importlib_external import MAGIC_NUMBER  # noqa: E402
+
+HARNESS_SCRIPT = os.path.abspath(__file__)
+
+# A .pyc is the magic number, flags, two 4-byte source fields, then the
+# marshalled code object (PEP 552).
+_PYC_HEADER_SIZE = 16
+
+# Allocation sites listed in a memory report
+TOP_SITES = 10
+
+
+def compile_sample(path, pyc_path):
+    """
+    Compiles a sample to a ``.pyc`` file for ``execute``.
+
+    Args:
+        path (str): The sample's source file.
+        pyc_path (str): Where to write the compiled code.
+
+    Returns:
+        int: Nanoseconds spent compiling (reading and writing excluded).
+
+    Raises:
+        SyntaxError: If the sample does not compile; it is then left to
+                     fail at run time as it would under ``python FILE``.
+    """
+    with open(path, "rb") as f:
+        source = f.read()
+    start = time.perf_counter_ns()
+    code = compile(source, path, "exec", dont_inherit=True)
+    elapsed = time.perf_counter_ns() - start
+    header = MAGIC_NUMBER + bytes(_PYC_HEADER_SIZE - len(MAGIC_NUMBER))
+    with open(pyc_path, "wb") as f:
+        f.write(header + marshal.dumps(code))
+    return elapsed
+
+
+def _load(path, pyc_path):
+    """Returns (code, compile_ns); compile_ns is 0 for a valid ``.pyc``."""
+    if pyc_path:
+        try:
+            with open(pyc_path, "rb") as f:
+                data = f.read()
+            if data[:len(MAGIC_NUMBER)] == MAGIC_NUMBER:
+                return marshal.loads(data[_PYC_HEADER_SIZE:]), 0
+        except (OSError, ValueError, EOFError):
+            pass
+    with open(path, "rb") as f:
+        source = f.read()
+    start = time.perf_counter_ns()
+    code = compile(source, path, "exec", dont_inherit=True)
+    return code, time.perf_counter_ns() - start
+
+
+class _ImportTimer:
+    """Wraps ``builtins.__import__`` and sums the time of outermost imports."""
+
+    def __init__(self):
+        self.total_ns = 0
+        self._depth = 0
+        self._import = builtins.__import__
+
+    def __call__(self, *args, **kwargs):
+        if self._depth:
+            return self._import(*args, **kwargs)
+        self._depth += 1
+        start = time.perf_counter_ns()
+        try:
+            return self._import(*args, **kwargs)
+        finally:
+            self.total_ns += time.perf_counter_ns() - start
+            self._depth -= 1
+
+
+def memory_report(tracemalloc):
+    """
+    Summarises the allocations traced while a sample ran.
+
+    Call it before ``tracemalloc.stop()``. ``tracemalloc`` keeps no running
+    count of allocations, so 'blocks' counts the memory blocks the sample
+    still held when its module finished (its globals are alive then).
+
+    Args:
+        tracemalloc (module): The started ``tracemalloc`` module.
+
+    Returns:
+        dict: 'peak_kb' (peak traced memory), 'current_kb', 'blocks' and
+              'top_sites', the ``TOP_SITES`` lines holding the most memory
+              as {'site': 'file:line', 'size_kb', 'count'}.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    stats = snapshot.statistics("lineno")
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "current_kb": round(current / 1024, 1),
+        "blocks": sum(stat.count for stat in stats),
+        "top_sites": [
+            {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in stats[:TOP_SITES]
+        ],
+    }
+
+
+def execute(path, pyc_path=None, trace_memory=False):
+    """
+    Runs a sample as ``__main__`` in this process.
+
+    Exceptions other than ``SystemExit`` are printed the way the
+    interpreter would print them for ``python FILE``, without the harness's
+    frames.
+
+    Args:
+        path (str): Absolute path of the sample.
+        pyc_path (str): Its precompiled code, if any.
+        trace_memory (bool): Run the module under ``tracemalloc``.
+
+    Returns:
+        tuple: (exit status, phases, memory) where phases holds
+               'compile_ns', 'import_ns' and 'run_ns', and memory is a
+               ``memory_report`` (None unless ``trace_memory``).
+    """
+    phases = {"compile_ns": 0, "import_ns": 0, "run_ns": 0}
+    sys.argv = [path]
+    try:
+        code, phases["compile_ns"] = _load(path, pyc_path)
+    except SyntaxError:
+        import traceback
+        traceback.print_exc(limit=0)
+        return 1, phases, None
+
+    module = type(sys)("__main__")
+    module.__file__ = path
+    module.__builtins__ = builtins
+    sys.modules["__main__"] = module
+
+    tracemalloc = None
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    timer = _ImportTimer()
+    builtins.__import__ = timer
+    error = None
+    start = time.perf_counter_ns()
+    try:
+        exec(code, module.__dict__)
+    except BaseException as exc:
+        error = exc
+    elapsed = time.perf_counter_ns() - start
+    builtins.__import__ = timer._import
+
+    memory = None
+    if tracemalloc is not None:
+        memory = memory_report(tracemalloc)
+        tracemalloc.stop()
+
+    status = 0
+    if isinstance(error, SystemExit):
+        if isinstance(error.code, int):
+            status = error.code & 0xFF
+        elif error.code is not None:
+            print(error.code, file=sys.stderr)
+            status = 1
+    elif error is not None:
+        import traceback
+        tb = error.__traceback__.tb_next  # drop this frame
+        traceback.print_exception(type(error), error, tb)
+        status = 1
+    phases["import_ns"] = timer.total_ns
+    phases["run_ns"] = elapsed - timer.total_ns
+    return status, phases, memory
+
+
+def main():
+    status_fd, pyc_path, path = int(sys.argv[1]), sys.argv[2], sys.argv[3]
+    trace_memory = sys.argv[4:5] == ["trace"]
+    sys.path[0] = os.path.dirname(path)
+    status, phases, memory = execute(path, pyc_path or None, trace_memory)
+    fields = {"entry": _ENTRY_NS, **phases}
+    if memory is None:
+        report = "{" + ", ".join(f'"{name}": {value}' for name, value in fields.items()) + "}"
+    else:
+        import json  # only now, so that the sample's imports are not affected
+        report = json.dumps({**fields, "memory": memory})
+    os.write(status_fd, report.encode("utf-8"))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
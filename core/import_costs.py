@@ -0,0 +1,263 @@
+"""
+import_costs.py
+
+Per-module import times for estimating a sample's cold-start cost.
+
+The shipped table (``import_costs.json``) is measured with
+``python -X importtime``: each top-level module is imported alone in a
+fresh interpreter, and the table records every module that import loads
+together with the time spent in its own body ("self" time, the fastest of
+several runs). A sample's estimate is the self time summed over the union
+of modules its imports load, so shared dependencies such as ``re`` are
+counted once. Modules the interpreter already loads at startup cost
+nothing.
+
+Modules are imported with ``-S`` and the ``sys.path`` a normal start
+would have, so import hooks that ``site`` installs from ``.pth`` files
+(setuptools redirecting ``distutils``, for one) do not end up in the
+table.
+
+Besides the standard library the table covers the heavy third-party
+packages samples commonly import (``THIRD_PARTY_MODULES``), in the
+versions installed when it was generated; those dominate a cold start.
+
+The table describes the Python minor version that generated it:
+``default_table`` returns None on any other one (3.10 against a 3.11
+table), since the standard library's modules and their imports change
+between minor versions. Patch releases are tolerated: they keep the
+module graph and move import times by run-to-run noise. Regenerate the
+table with ``vibebench import-costs`` after switching Python versions or
+upgrading the packages it measures.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from collections import namedtuple
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_costs.json")
+
+# Importable stdlib modules that are not worth measuring or that have side
+# effects when imported (opening a browser, printing, GUI toolkits).
+_SKIPPED_MODULES = {"antigravity", "this", "idlelib", "turtledemo", "test", "lib2to3",
+                    "ensurepip", "pydoc_data", "tkinter", "turtle"}
+
+# Heavy third-party imports worth measuring when installed; ``build_table``
+# leaves out the ones that fail to import.
+THIRD_PARTY_MODULES = ("numpy", "pandas", "matplotlib", "matplotlib.pyplot", "scipy",
+                       "sklearn", "requests", "PIL", "yaml")
+
+ImportCost = namedtuple("ImportCost", ["total_ms", "unused_ms", "unknown"])
+ImportCost.__doc__ = """Estimated import time, the part spent on unused imports, and unmeasured modules."""
+
+
+def _importtime(python, statement, flags=()):
+    """
+    Runs ``statement`` under ``-X importtime``.
+
+    Returns:
+        dict: module name -> self time in microseconds, or None on failure.
+    """
+    try:
+        result = subprocess.run(
+            [python, "-X", "importtime", *flags, "-c", statement],
+            capture_output=True, text=True, timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.partition("import time:")[2].split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():  # skips the header
+            times[fields[2].strip()] = int(fields[0])
+    return times
+
+
+def _sys_path(python):
+    """Returns ``sys.path`` of a normal ``python -c`` start without its script entry, or None."""
+    try:
+        result = subprocess.run(
+            [python, "-c", "import json, sys; print(json.dumps(sys.path[1:]))"],
+            capture_output=True, text=True, timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return json.loads(result.stdout) if result.returncode == 0 else None
+
+
+def measure_imports(module, python=sys.executable, startup=(), path=None):
+    """
+    Imports ``module`` in a fresh interpreter and times every module it loads.
+
+    Args:
+        module (str): Dotted name of the module to import.
+        python (str): Interpreter to measure.
+        startup (iterable): Modules loaded at interpreter startup, which
+                            ``-X importtime`` also lists; they are dropped.
+        path (list): If given, the child runs with ``-S`` and this
+                     ``sys.path``, so no ``site`` import hooks are active.
+
+    Returns:
+        dict: loaded module name -> self time in microseconds, or None if
+              the import failed.
+    """
+    if path is None:
+        times = _importtime(python, f"import {module}")
+    else:
+        times = _importtime(python, f"import sys; sys.path[1:] = {path!r}; import {module}", ["-S"])
+    if times is None:
+        return None
+    startup = set(startup)
+    return {name: us for name, us in times.items() if name not in startup}
+
+
+def default_modules():
+    """Public top-level stdlib modules worth measuring (3.10+), and ``THIRD_PARTY_MODULES``."""
+    return sorted(
+        name for name in sys.stdlib_module_names
+        if not name.startswith("_") and name not in _SKIPPED_MODULES
+    ) + list(THIRD_PARTY_MODULES)
+
+
+def build_table(modules=None, python=sys.executable, repeat=3):
+    """
+    Measures the import cost of ``modules`` for one interpreter.
+
+    Args:
+        modules (iterable): Top-level module names. Defaults to
+                            ``default_modules()``; modules that fail to
+                            import are left out.
+        python (str): Interpreter to measure.
+        repeat (int): Fresh-interpreter runs per module; the fastest self
+                      time of every loaded module is kept.
+
+    Returns:
+        dict: A JSON-serialisable table for ``ImportCostTable``.
+    """
+    startup = _importtime(python, "pass") or {}
+    path = _sys_path(python)
+    self_us = {}
+    loads = {}
+    for module in (default_modules() if modules is None else modules):
+        runs = [measure_imports(module, python, startup, path) for _ in range(repeat)]
+        runs = [run for run in runs if run is not None]
+        if not runs:
+            continue
+        loaded = set()
+        for run in runs:
+            loaded.update(run)
+            for name, us in run.items():
+                self_us[name] = min(us, self_us.get(name, us))
+        loads[module] = sorted(loaded)
+
+    version = subprocess.run(
+        [python, "-c", "import platform; print(platform.python_version())"],
+        capture_output=True, text=True,
+    ).stdout.strip()
+    return {
+        "python": version,
+        "platform": platform.platform(),
+        "startup": sorted(startup),
+        "self_ms": {name: round(us / 1000, 3) for name, us in sorted(self_us.items())},
+        "loads": loads,
+    }
+
+
+class ImportCostTable:
+    """Estimates import time from a table produced by ``build_table``."""
+
+    def __init__(self, table):
+        """
+        Args:
+            table (dict): The decoded table; see ``build_table``.
+        """
+        self.python = table.get("python")
+        self.startup = set(table.get("startup", ()))
+        self.self_ms = table["self_ms"]
+        self.loads = table["loads"]
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        """Reads a table from a JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def matches_interpreter(self):
+        """True if the table was measured on this Python's major.minor version."""
+        if not self.python:
+            return False
+        return self.python.split(".")[:2] == list(platform.python_version_tuple()[:2])
+
+    def _loaded(self, module):
+        """Modules loaded by importing ``module``, or None if it is unknown."""
+        top = module.partition(".")[0]
+        if module in self.startup:
+            return set()
+        if top not in self.loads:
+            return None
+        loaded = set(self.loads[top])
+        if module != top:
+            loaded.update(self.loads.get(module, ()))
+            if module in self.self_ms:
+                loaded.add(module)
+        return loaded
+
+    def cost(self, modules):
+        """
+        Estimates the time to import ``modules`` into a fresh interpreter.
+
+        Args:
+            modules (iterable): Dotted module names.
+
+        Returns:
+            tuple: (milliseconds, unknown) where ``unknown`` lists the
+                   modules the table has no figures for (local modules,
+                   unmeasured third-party packages); they count as 0.
+        """
+        loaded = set()
+        unknown = []
+        for module in modules:
+            found = self._loaded(module)
+            if found is None:
+                unknown.append(module)
+            else:
+                loaded |= found
+        return round(sum(self.self_ms.get(name, 0.0) for name in loaded), 3), unknown
+
+    def estimate(self, imports):
+        """
+        Estimates a sample's import cost from its analysis record rows.
+
+        Args:
+            imports (list): [module, line, used] rows, as stored under
+                            'module_imports' in analysis records.
+
+        Returns:
+            ImportCost: Total milliseconds, the milliseconds that only the
+                        unused imports add, and the sorted unknown modules.
+        """
+        total, unknown = self.cost(row[0] for row in imports)
+        used, _ = self.cost(row[0] for row in imports if row[2])
+        return ImportCost(total, round(total - used, 3), sorted(set(unknown)))
+
+
+_default_table = None
+
+
+def default_table():
+    """
+    Returns the shipped table, loaded once per process.
+
+    Returns:
+        ImportCostTable: The table, or None if it was measured on another
+                         Python version, whose figures would mislead.
+    """
+    global _default_table
+    if _default_table is None:
+        _default_table = ImportCostTable.load()
+    return _default_table if _default_table.matches_interpreter else None
@@ -0,0 +1,267 @@
+"""
+import_rules.py
+
+Import hygiene rules.
+
+The rules register in ``core.rules.DEFAULT_REGISTRY`` under the 'imports'
+category: imports whose names are never used, and imports that re-bind a
+module already imported in the same or an enclosing scope. Every import
+a sample executes costs start-up time (see ``core.import_costs``), so
+both are worth removing. ``module_imports`` lists the imports executed
+when a module loads, for the cost estimate in ``CodeAnalyzer.import_cost``,
+and ``is_used`` is what both the estimate and ``UnusedImportRule`` take a
+used import to be. ``imported_names`` feeds the import graph of
+``core.project``.
+"""
+
+import ast
+
+from core.rules import Rule, register
+
+_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError"}
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _binding(node, alias):
+    """
+    Returns (name, target) for the name one alias of an import statement binds.
+
+    ``target`` identifies what is bound: the dotted module for ``import``
+    and 'module:name' for ``from`` imports. Star imports, ``__future__``
+    imports and explicit re-exports (``import x as x``) bind nothing
+    worth checking: None.
+    """
+    if isinstance(node, ast.ImportFrom):
+        if node.module == "__future__" or alias.name == "*" or alias.asname == alias.name:
+            return None
+        module = "." * node.level + (node.module or "")
+        return alias.asname or alias.name, f"{module}:{alias.name}"
+    if alias.asname is None:
+        return alias.name.partition(".")[0], alias.name
+    if alias.asname != alias.name.rpartition(".")[2]:
+        return alias.asname, alias.name
+    return None
+
+
+def _bindings(node):
+    """Yields the ``_binding`` of every alias of an import statement that has one."""
+    for alias in node.names:
+        binding = _binding(node, alias)
+        if binding is not None:
+            yield binding
+
+
+def is_used(name, referenced, exported):
+    """
+    True if an imported ``name`` is used.
+
+    Args:
+        name (str): A name bound by an import.
+        referenced (container): Identifiers loaded or stored anywhere in
+                                the file (``ast.Name`` ids).
+        exported (container): Names listed in ``__all__`` (see
+                              ``exported_names``).
+    """
+    return name in referenced or name in exported
+
+
+def _guards_import(node):
+    """True for a ``try`` statement with an ``except ImportError`` handler."""
+    for handler in node.handlers:
+        caught = handler.type
+        names = caught.elts if isinstance(caught, ast.Tuple) else [caught]
+        if any(isinstance(name, ast.Name) and name.id in _IMPORT_ERRORS for name in names):
+            return True
+    return False
+
+
+def _end(node):
+    return (getattr(node, "end_lineno", node.lineno), getattr(node, "end_col_offset", 0))
+
+
+def exported_names(node):
+    """String constants of an ``__all__ = [...]`` assignment."""
+    if not any(isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets):
+        return ()
+    if not isinstance(node.value, (ast.List, ast.Tuple)):
+        return ()
+    return [elt.value for elt in node.value.elts
+            if isinstance(elt, ast.Constant) and isinstance(elt.value, str)]
+
+
+def imported_names(node):
+    """
+    Lists the modules an import statement names, as written.
+
+    Relative imports keep their leading dots. For ``from X import a, b``
+    both ``X.a`` and ``X.b`` are listed (they may be submodules) after
+    ``X`` itself; ``core.project.resolve_import`` drops the ones that are
+    not modules.
+
+    Args:
+        node (ast.Import | ast.ImportFrom): The statement.
+
+    Returns:
+        list: Dotted names in source order.
+    """
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    base = "." * node.level + (node.module or "")
+    names = [base]
+    for alias in node.names:
+        if alias.name != "*":
+            names.append(f"{base}.{alias.name}" if node.module else base + alias.name)
+    return names
+
+
+def module_imports(tree):
+    """
+    Lists the absolute imports executed when a module is loaded.
+
+    Statements at the top level and inside ``if``/``try``/``with``/loop
+    and class bodies count; function bodies run later (if at all) and are
+    skipped, as are relative and ``__future__`` imports.
+
+    Args:
+        tree (ast.Module): The parsed module.
+
+    Returns:
+        list: (module, line, names) tuples in source order, where ``names``
+              are the names the statement binds that ``is_used`` decides
+              on; it is empty when the statement binds nothing worth
+              checking (``from m import *``, ``import m as m``), which
+              counts as a use.
+    """
+    found = []
+    stack = [tree.body]
+    while stack:
+        for node in stack.pop():
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    binding = _binding(node, alias)
+                    found.append((alias.name, node.lineno, [binding[0]] if binding else []))
+            elif isinstance(node, ast.ImportFrom):
+                if node.level == 0 and node.module != "__future__":
+                    names = [name for name, _ in _bindings(node)]
+                    found.append((node.module, node.lineno, names))
+            else:
+                for field in ("body", "orelse", "finalbody"):
+                    stack.append(getattr(node, field, ()))
+                for handler in getattr(node, "handlers", ()):
+                    stack.append(handler.body)
+                for case in getattr(node, "cases", ()):
+                    stack.append(case.body)
+    found.sort(key=lambda row: row[1])
+    return found
+
+
+@register
+class UnusedImportRule(Rule):
+    """
+    Flags imported names that are never referenced.
+
+    A name counts as used if it appears anywhere in the file as a name
+    (``os`` in ``os.path.join``) or is listed in ``__all__`` (``is_used``,
+    which the import cost estimate shares). Imports in a
+    ``try`` block guarded by ``except ImportError`` are availability
+    checks and are left alone.
+    """
+
+    rule_id = "unused-import"
+    node_types = (ast.Import, ast.ImportFrom, ast.Name, ast.Assign, ast.Try)
+    category = "imports"
+    impact = "import time spent on an unused module"
+
+    def __init__(self):
+        super().__init__()
+        self._imports = []
+        self._used = set()
+        self._exported = set()
+        self._guarded_until = []  # end positions of import-guarding try bodies
+
+    def visit(self, node):
+        if isinstance(node, ast.Name):
+            self._used.add(node.id)
+        elif isinstance(node, ast.Assign):
+            self._exported.update(exported_names(node))
+        elif isinstance(node, ast.Try):
+            if _guards_import(node) and node.body:
+                self._guarded_until.append(_end(node.body[-1]))
+        else:
+            start = (node.lineno, node.col_offset)
+            while self._guarded_until and self._guarded_until[-1] < start:
+                self._guarded_until.pop()
+            if not self._guarded_until:
+                self._imports.extend((name, node) for name, _ in _bindings(node))
+
+    def finish(self):
+        for name, node in self._imports:
+            if not is_used(name, self._used, self._exported):
+                self.report(f"'{name}' is imported but never used.", node)
+
+
+@register
+class RedundantImportRule(Rule):
+    """
+    Flags imports of a module or name that is already imported, visible
+    in the current scope, and bound to the same name, such as a function
+    re-importing a module imported at the top of the file, or ``import a``
+    after ``import a.b`` (which binds ``a`` already).
+
+    Only imports made directly in a scope's body count as earlier bindings,
+    so alternatives in ``if``/``else`` or ``try``/``except`` branches are
+    not reported. Scopes are tracked by position, as in
+    ``io_rules.ReadWholeFileRule``.
+    """
+
+    rule_id = "redundant-import"
+    node_types = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef,
+                  ast.Import, ast.ImportFrom)
+    category = "imports"
+    impact = "repeated import statement (a sys.modules lookup per execution)"
+
+    def __init__(self):
+        super().__init__()
+        # [end position, is class, direct import lines, name -> target]
+        self._scopes = [[(float("inf"), 0), False, set(), {}]]
+
+    def visit(self, node):
+        if isinstance(node, ast.Module):
+            self._scopes[0][2] = _direct_imports(node)
+            return
+        start = (node.lineno, node.col_offset)
+        while self._scopes[-1][0] <= start:
+            self._scopes.pop()
+        if isinstance(node, _SCOPE_NODES):
+            self._scopes.append([_end(node), isinstance(node, ast.ClassDef),
+                                 _direct_imports(node), {}])
+            return
+
+        scope = self._scopes[-1]
+        direct = node.lineno in scope[2]
+        for name, target in _bindings(node):
+            earlier = self._visible(name)
+            if earlier is not None and (earlier == target or (
+                    "." not in target and ":" not in target and earlier.startswith(target + "."))):
+                self.report(f"'{name}' is already imported ({earlier}).", node)
+            elif direct:
+                scope[3][name] = target
+            else:
+                scope[3].pop(name, None)
+
+    def _visible(self, name):
+        """The innermost visible import target bound to ``name``, if any."""
+        # Class bodies are not visible from the functions nested in them.
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if depth and scope[1]:
+                continue
+            if name in scope[3]:
+                return scope[3][name]
+        return None
+
+
+def _direct_imports(node):
+    """Lines of the import statements directly in a scope's body."""
+    return {stmt.lineno for stmt in node.body if isinstance(stmt, (ast.Import, ast.ImportFrom))}
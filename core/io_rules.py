@@ -0,0 +1,340 @@
+"""
+io_rules.py
+
+Static I/O and memory anti-pattern rules.
+
+The rules register in ``core.rules.DEFAULT_REGISTRY`` under the 'io'
+category (file handles and network calls) and the 'memory' category (data
+materialized in full where streaming would do). Like the performance pack
+they report ``Finding`` records with a severity and an estimated impact;
+``CodeAnalyzer.issue_penalty`` weighs them.
+"""
+
+import ast
+
+from core.perf_rules import LoopRule, call_name, is_module_call, iteration_nodes
+from core.rules import Rule, register
+
+_OPEN_MODULES = {"io", "codecs", "gzip", "bz2", "lzma"}
+# Calls whose result is produced lazily and is cheap to iterate directly
+_LAZY_CALLS = {"range", "map", "filter", "zip", "enumerate", "reversed", "iter",
+               "open", "reader", "DictReader", "finditer", "iglob", "scandir", "walk"}
+_REQUESTS_VERBS = {"get", "post", "put", "patch", "delete", "head", "options", "request"}
+
+
+def is_open_call(node):
+    """True for ``open(...)``, ``io.open(...)``, ``gzip.open(...)`` and similar."""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id == "open"
+    return (isinstance(func, ast.Attribute) and func.attr == "open"
+            and isinstance(func.value, ast.Name) and func.value.id in _OPEN_MODULES)
+
+
+def _is_lazy(node):
+    """True for generator expressions and calls that return lazy iterators."""
+    if isinstance(node, ast.GeneratorExp):
+        return True
+    return isinstance(node, ast.Call) and call_name(node) in _LAZY_CALLS
+
+
+def _is_whole_read(node):
+    """True for an argument-less ``x.read()`` call."""
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "read" and not node.args and not node.keywords)
+
+
+def _splits_lines(node):
+    """True for ``x.splitlines()`` and ``x.split('\\n')`` calls."""
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+        return False
+    if node.func.attr == "splitlines":
+        return True
+    return (node.func.attr == "split" and len(node.args) == 1
+            and isinstance(node.args[0], ast.Constant) and node.args[0].value in ("\n", "\r\n"))
+
+
+@register
+class ReadWholeFileRule(Rule):
+    """
+    Flags ``readlines()`` and ``read()`` followed by a split into lines,
+    both of which hold the whole file in memory where iterating over the
+    file object would stream it.
+
+    ``data = f.read()`` and a later ``data.splitlines()`` are matched
+    within one function, class body or the module's top level. As in
+    ``UnmemoizedRecursionRule``, nodes arrive in source order, so a scope
+    is complete once a node starts after its end position.
+    """
+
+    rule_id = "read-whole-file"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Assign, ast.Call)
+    category = "memory"
+    severity = "medium"
+    impact = "O(file size) memory instead of O(line)"
+
+    def __init__(self):
+        super().__init__()
+        # [end position, name -> read() call, names split into lines]
+        self._scopes = [[(float("inf"), 0), {}, set()]]
+
+    def visit(self, node):
+        start = (node.lineno, node.col_offset)
+        while self._scopes[-1][0] <= start:
+            self._close(*self._scopes.pop())
+        scope = self._scopes[-1]
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            end = (getattr(node, "end_lineno", node.lineno), getattr(node, "end_col_offset", 0))
+            self._scopes.append([end, {}, set()])
+        elif isinstance(node, ast.Assign):
+            if _is_whole_read(node.value):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        scope[1][target.id] = node.value
+        elif isinstance(node.func, ast.Attribute):
+            if node.func.attr == "readlines" and not node.args:
+                self.report(
+                    "readlines() loads every line at once: iterate over the file object.",
+                    node,
+                )
+            elif _splits_lines(node):
+                if _is_whole_read(node.func.value):
+                    self._report(node.func.value)
+                elif isinstance(node.func.value, ast.Name):
+                    scope[2].add(node.func.value.id)
+
+    def finish(self):
+        while self._scopes:
+            self._close(*self._scopes.pop())
+        self.findings.sort(key=lambda finding: finding.line)
+
+    def _close(self, end, reads, split):
+        for name, read in reads.items():
+            if name in split:
+                self._report(read)
+
+    def _report(self, node):
+        self.report(
+            "read() of a whole file split into lines: iterate over the file object instead.",
+            node,
+        )
+
+
+@register
+class OpenInLoopRule(LoopRule):
+    """Flags a loop that re-opens the same file on every iteration."""
+
+    rule_id = "open-in-loop"
+    checked_types = (ast.Call,)
+    category = "io"
+    severity = "medium"
+    impact = "one open/close syscall pair per iteration"
+
+    def __init__(self):
+        super().__init__()
+        self._varying = {}
+
+    def check(self, node, loops):
+        if not is_open_call(node) or not node.args:
+            return
+        varying = self._varying_names(loops[0])
+        used = {n.id for arg in node.args for n in ast.walk(arg) if isinstance(n, ast.Name)}
+        if not used & varying:
+            self.report(
+                "The same file is opened on every loop iteration: open it once "
+                "outside the loop.",
+                node,
+            )
+
+    def _varying_names(self, loop):
+        """Names rebound per iteration anywhere inside the outermost ``loop``."""
+        names = self._varying.get(id(loop))
+        if names is None:
+            names = self._varying[id(loop)] = {
+                child.id for child, loops in iteration_nodes(loop)
+                if loops and isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+            }
+        return names
+
+
+def _has_argument(node, keyword, position=None):
+    """True if ``node`` passes ``keyword`` by name or as positional ``position``."""
+    if any(kw.arg == keyword or kw.arg is None for kw in node.keywords):
+        return True  # a ``**kwargs`` may carry it
+    if position is None:
+        return False
+    return len(node.args) > position or any(isinstance(a, ast.Starred) for a in node.args)
+
+
+@register
+class MissingTimeoutRule(Rule):
+    """
+    Flags network calls that can block forever: ``socket.create_connection``,
+    ``urllib.request.urlopen``, ``http.client`` connections and
+    ``requests`` calls without a timeout, and sockets that never get one.
+
+    ``socket.setdefaulttimeout()`` anywhere in the file covers every
+    socket-based call (but not ``requests``, which ignores it).
+    """
+
+    rule_id = "missing-timeout"
+    node_types = (ast.Call,)
+    category = "io"
+    severity = "high"
+    impact = "a stalled peer blocks the call indefinitely"
+
+    def __init__(self):
+        super().__init__()
+        self.socket_calls = []  # (node, message), dropped if a default timeout is set
+        self.default_timeout = False
+        self.sets_timeout = False
+
+    def visit(self, node):
+        name = call_name(node)
+        if name == "setdefaulttimeout":
+            self.default_timeout = True
+        elif name in ("settimeout", "setblocking"):
+            self.sets_timeout = True
+        elif name == "create_connection" and not _has_argument(node, "timeout", 1):
+            self.socket_calls.append((node, "socket.create_connection() without a timeout"))
+        elif name == "urlopen" and not _has_argument(node, "timeout", 2):
+            self.socket_calls.append((node, "urlopen() without a timeout"))
+        elif (name in ("HTTPConnection", "HTTPSConnection")
+              and not _has_argument(node, "timeout", 2)):
+            self.socket_calls.append((node, f"{name}() without a timeout"))
+        elif is_module_call(node, "socket", "socket") and isinstance(node.func, ast.Attribute):
+            self.socket_calls.append((node, "socket.socket() never given a timeout"))
+        elif (name in _REQUESTS_VERBS and isinstance(node.func, ast.Attribute)
+              and isinstance(node.func.value, ast.Name) and node.func.value.id == "requests"
+              and not _has_argument(node, "timeout")):
+            self.report(f"requests.{name}() without a timeout: pass timeout=.", node)
+
+    def finish(self):
+        if self.default_timeout:
+            return
+        for node, message in self.socket_calls:
+            if message.startswith("socket.socket") and self.sets_timeout:
+                continue
+            self.report(f"{message}: pass a timeout so a dead peer cannot hang the program.", node)
+
+
+@register
+class MaterializedIterableRule(Rule):
+    """
+    Flags lazy iterables copied into a list only to be consumed once:
+    ``for x in list(gen)``, ``len(list(gen))``, ``list(gen)[0]`` and list
+    comprehensions passed to ``sum``/``any``/``all``/``min``/``max``.
+    """
+
+    rule_id = "materialized-iterable"
+    node_types = (ast.For, ast.AsyncFor, ast.comprehension, ast.Call, ast.Subscript)
+    category = "memory"
+    severity = "low"
+    impact = "O(n) temporary memory instead of O(1)"
+
+    def visit(self, node):
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+            if self._copies_lazy(node.iter):
+                self.report("Iterating over list(...) of a lazy iterable: iterate directly.",
+                            node.iter)
+        elif isinstance(node, ast.Subscript):
+            index = node.slice
+            if (self._is_copy(node.value) and isinstance(index, ast.Constant)
+                    and index.value == 0):
+                self.report("list(...)[0] copies everything to read one item: "
+                            "use next(iter(...)).", node)
+        elif isinstance(node.func, ast.Name) and len(node.args) == 1 and not node.keywords:
+            name, arg = node.func.id, node.args[0]
+            if name == "len" and self._copies_lazy(arg):
+                self.report("len(list(...)) builds a list only to count it: "
+                            "use sum(1 for _ in ...).", node)
+            elif name in ("sum", "any", "all", "min", "max") and isinstance(arg, ast.ListComp):
+                self.report(f"{name}() over a list comprehension: pass a generator "
+                            f"expression instead.", node)
+
+    @staticmethod
+    def _is_copy(node):
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in ("list", "tuple") and len(node.args) == 1)
+
+    @staticmethod
+    def _copies_lazy(node):
+        return MaterializedIterableRule._is_copy(node) and _is_lazy(node.args[0])
+
+
+@register
+class UnclosedFileRule(Rule):
+    """
+    Flags ``open()`` results that are never closed: handles assigned to a
+    name without a later ``close()`` or ``with``, and handles used inline
+    (``json.load(open(p))``, ``open(p).read()``) that rely on garbage
+    collection. Handles returned, yielded, stored on an object or passed
+    to ``ExitStack.enter_context`` are assumed to be managed elsewhere.
+    """
+
+    rule_id = "unclosed-file"
+    node_types = (ast.With, ast.AsyncWith, ast.Assign, ast.Return, ast.Yield, ast.Call)
+    category = "io"
+    severity = "medium"
+    impact = "file descriptor held until garbage collection"
+
+    def __init__(self):
+        super().__init__()
+        self.opens = []
+        self.managed = set()
+        self.assigned = {}
+        self.closed = set()
+
+    def visit(self, node):
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                # Also covers ``with (a if x else open(p)) as f``
+                self.managed.update(id(child) for child in ast.walk(item.context_expr))
+                if isinstance(item.context_expr, ast.Name):
+                    self.closed.add(item.context_expr.id)
+        elif isinstance(node, ast.Assign):
+            target = node.targets[0]
+            if is_open_call(node.value):
+                if len(node.targets) == 1 and isinstance(target, ast.Name):
+                    self.assigned[id(node.value)] = target.id
+                else:
+                    self.managed.add(id(node.value))
+            elif isinstance(node.value, ast.Name) and not isinstance(target, ast.Name):
+                self.closed.add(node.value.id)  # handed over to an object
+        elif isinstance(node, (ast.Return, ast.Yield)):
+            if node.value is not None:
+                self.managed.add(id(node.value))
+        elif is_open_call(node):
+            self.opens.append(node)
+        else:
+            name = call_name(node)
+            if name == "close":
+                # f.close(), or os.close(fd) for a descriptor from os.open()
+                handle = node.func.value if isinstance(node.func, ast.Attribute) else None
+                if not isinstance(handle, ast.Name) and node.args:
+                    handle = node.args[0]
+                if isinstance(handle, ast.Name):
+                    self.closed.add(handle.id)
+            elif name in ("enter_context", "closing"):
+                for arg in node.args:
+                    self.managed.add(id(arg))
+                    if isinstance(arg, ast.Name):
+                        self.closed.add(arg.id)
+
+    def finish(self):
+        for node in self.opens:
+            if id(node) in self.managed:
+                continue
+            name = self.assigned.get(id(node))
+            if name is None:
+                self.report(
+                    "open() result is never closed explicitly: use a with block.",
+                    node, severity="low",
+                )
+            elif name not in self.closed:
+                self.report(
+                    f"File handle '{name}' is never closed: open it in a with block.",
+                    node,
+                )
@@ -0,0 +1,565 @@
+"""
+perf_rules.py
+
+Static performance anti-pattern rules.
+
+The rules register in ``core.rules.DEFAULT_REGISTRY`` under the
+'performance' category. Each finding carries a severity and a short
+estimate of its complexity impact, e.g. "O(n) per call, O(n^2) over the
+loop". Most of these patterns only cost something when they repeat, so the
+loop rules share ``LoopRule``. It walks each outermost loop once and tells
+the rule which loops enclose every node it inspects.
+"""
+
+import ast
+import re
+
+from core.rules import Rule, register
+
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While,
+              ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+# Bodies of these nodes do not run as part of the enclosing loop iteration.
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+_MEMO_DECORATORS = {"cache", "lru_cache", "cached", "memoize", "memoized"}
+# A name hints at a memo table if one of its words (``fib_memo``, ``dpTable``)
+# starts with one of the prefixes or is one of the words.
+_MEMO_PREFIXES = ("memo", "cache")
+_MEMO_WORDS = {"dp"}
+_WORD = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+
+
+def split_loop(node):
+    """
+    Splits a loop's children into those evaluated once and per iteration.
+
+    Returns:
+        tuple: (once, repeated) lists of child nodes.
+    """
+    if isinstance(node, (ast.For, ast.AsyncFor)):
+        return [node.iter, *node.orelse], [node.target, *node.body]
+    if isinstance(node, ast.While):
+        return list(node.orelse), [node.test, *node.body]
+    first, *rest = node.generators
+    if isinstance(node, ast.DictComp):
+        elements = [node.key, node.value]
+    else:
+        elements = [node.elt]
+    return [first.iter], [first.target, *first.ifs, *rest, *elements]
+
+
+def call_name(node):
+    """Returns 'name' for ``name(...)`` and ``obj.name(...)`` calls, else None."""
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def is_self_call(node, name):
+    """
+    True for a call of the function ``name`` from inside its own body.
+
+    Only ``name(...)``, ``self.name(...)`` and ``cls.name(...)`` count:
+    ``self.items.append(x)`` inside ``append`` calls a different method.
+    """
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id == name
+    return (isinstance(func, ast.Attribute) and func.attr == name
+            and isinstance(func.value, ast.Name) and func.value.id in ("self", "cls"))
+
+
+def is_module_call(node, module, name):
+    """True for a call spelled ``module.name(...)`` or a bare ``name(...)``."""
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return (func.attr == name and isinstance(func.value, ast.Name)
+                and func.value.id == module)
+    return isinstance(func, ast.Name) and func.id == name
+
+
+def binding_kind(value):
+    """Classifies an assigned value as 'list', 'str', 'set', 'dict' or 'other'."""
+    if isinstance(value, (ast.List, ast.ListComp)):
+        return "list"
+    if isinstance(value, ast.JoinedStr) or (
+            isinstance(value, ast.Constant) and isinstance(value.value, str)):
+        return "str"
+    if isinstance(value, (ast.Set, ast.SetComp)):
+        return "set"
+    if isinstance(value, (ast.Dict, ast.DictComp)):
+        return "dict"
+    if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+        if value.func.id in ("list", "str", "set", "dict"):
+            return value.func.id
+    return "other"
+
+
+def iteration_nodes(loop):
+    """
+    Lists the nodes under an outermost loop with the loops enclosing them.
+
+    The list is cached on the loop node itself so that every loop rule
+    shares a single walk of each loop.
+
+    Returns:
+        list: (node, loops) pairs in source order, ``loops`` being the
+              enclosing loops, innermost last (empty when the node runs
+              once, e.g. the loop's own iterable).
+    """
+    cached = getattr(loop, "_iteration_nodes", None)
+    if cached is None:
+        cached = []
+        pending = _children(loop, ())
+        while pending:
+            node, loops = pending.pop()
+            cached.append((node, loops))
+            pending.extend(_children(node, loops))
+        loop._iteration_nodes = cached
+    return cached
+
+
+def _children(node, loops):
+    """Returns (child, loops) pairs of ``node`` in reverse source order."""
+    if isinstance(node, LOOP_NODES):
+        once, repeated = split_loop(node)
+        inner = loops + (node,)
+        children = [(child, loops) for child in once] + [(child, inner) for child in repeated]
+    else:
+        children = [(child, loops) for child in ast.iter_child_nodes(node)]
+    return [item for item in reversed(children) if not isinstance(item[0], SCOPE_NODES)]
+
+
+class LoopRule(Rule):
+    """
+    Base class for rules about code that runs once per loop iteration.
+
+    Every loop is dispatched to ``visit``, but only outermost loops are
+    expanded; ``check(node, loops)`` is then called for each node of a
+    type in ``checked_types`` that runs per iteration, ``loops`` holding
+    the enclosing loops, innermost last. Expressions evaluated once when
+    the loop starts (a ``for`` loop's iterable, the first iterable of a
+    comprehension) count as outside that loop, and nested function and
+    class bodies are not entered.
+    """
+
+    node_types = LOOP_NODES
+    category = "performance"
+    checked_types = ()
+
+    def __init__(self):
+        super().__init__()
+        self._inner = set()
+
+    def visit(self, node):
+        if id(node) in self._inner:
+            return
+        checked = self.checked_types
+        for child, loops in iteration_nodes(node):
+            if isinstance(child, LOOP_NODES):
+                self._inner.add(id(child))
+            if loops and isinstance(child, checked):
+                self.check(child, loops)
+
+    def check(self, node, loops):
+        """Inspects a node executed inside ``loops``."""
+        raise NotImplementedError
+
+
+class _BindingLoopRule(LoopRule):
+    """
+    LoopRule that also records what kind of value each name is bound to.
+
+    Findings that depend on a name's type are collected during the walk
+    and resolved in ``finish``, once every assignment has been seen.
+    """
+
+    node_types = LOOP_NODES + (ast.Assign, ast.AnnAssign)
+
+    def __init__(self):
+        super().__init__()
+        self.bindings = {}
+        self.pending = []
+
+    def visit(self, node):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            if node.value is not None:
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                kind = binding_kind(node.value)
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        self.bindings.setdefault(target.id, set()).add(kind)
+            return
+        super().visit(node)
+
+    def bound_only_to(self, name, kind):
+        """True if every assignment to ``name`` binds a value of ``kind``."""
+        return self.bindings.get(name) == {kind}
+
+
+@register
+class PopFrontRule(LoopRule):
+    """Flags ``list.pop(0)`` and ``list.insert(0, x)`` inside loops."""
+
+    rule_id = "pop-front-in-loop"
+    checked_types = (ast.Call,)
+    severity = "high"
+    impact = "O(n) per call, O(n^2) over the loop"
+
+    def check(self, node, loops):
+        name = call_name(node)
+        if name not in ("pop", "insert") or not isinstance(node.func, ast.Attribute):
+            return
+        if (node.args and isinstance(node.args[0], ast.Constant) and node.args[0].value == 0
+                and len(node.args) == (1 if name == "pop" else 2)):
+            self.report(
+                f"list.{name}(0) inside a loop shifts every element: "
+                f"use collections.deque.{'popleft' if name == 'pop' else 'appendleft'}().",
+                node,
+            )
+
+
+@register
+class ListMembershipRule(_BindingLoopRule):
+    """Flags ``x in some_list`` tests repeated inside loops."""
+
+    rule_id = "list-membership-in-loop"
+    checked_types = (ast.Compare,)
+    severity = "medium"
+    impact = "O(n) per test, O(n*m) over the loop"
+
+    def check(self, node, loops):
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(comparator, ast.ListComp) or (
+                    isinstance(comparator, ast.Call) and binding_kind(comparator) == "list"):
+                self._report(node, "a list built in the loop")
+            elif isinstance(comparator, ast.Name):
+                self.pending.append((comparator.id, node))
+
+    def finish(self):
+        for name, node in self.pending:
+            if self.bound_only_to(name, "list"):
+                self._report(node, f"list '{name}'")
+
+    def _report(self, node, what):
+        self.report(
+            f"Membership test on {what} inside a loop is a linear scan: use a set.",
+            node,
+        )
+
+
+@register
+class StringConcatRule(_BindingLoopRule):
+    """Flags strings grown with ``+=`` inside loops."""
+
+    rule_id = "string-concat-in-loop"
+    checked_types = (ast.AugAssign,)
+    severity = "medium"
+    impact = "O(n) copy per step, O(n^2) over the loop"
+
+    def check(self, node, loops):
+        if not isinstance(node.op, ast.Add) or not isinstance(node.target, ast.Name):
+            return
+        if binding_kind(node.value) == "str":
+            self._report(node)
+        else:
+            self.pending.append((node.target.id, node))
+
+    def finish(self):
+        for name, node in self.pending:
+            if self.bound_only_to(name, "str"):
+                self._report(node)
+
+    def _report(self, node):
+        self.report(
+            f"String '{node.target.id}' built with += inside a loop: "
+            f"collect the parts and use ''.join().",
+            node,
+        )
+
+
+def _iterable_key(node):
+    """
+    Normalizes a loop iterable to the collection it traverses.
+
+    ``range(len(x))``, ``enumerate(x)``, ``reversed(x)``, ``sorted(x)`` and
+    ``x.items()``/``keys()``/``values()`` all map to ``x``. Returns a
+    comparable dump of the collection, or None for anything else
+    (literals, ``range(n)``, arbitrary calls).
+    """
+    if isinstance(node, ast.Call):
+        name = call_name(node)
+        if isinstance(node.func, ast.Name) and node.args:
+            if name == "range" and len(node.args) == 1:
+                arg = node.args[0]
+                if isinstance(arg, ast.Call) and call_name(arg) == "len" and arg.args:
+                    return _iterable_key(arg.args[0])
+                return None
+            if name in ("enumerate", "reversed", "sorted", "iter"):
+                return _iterable_key(node.args[0])
+        if isinstance(node.func, ast.Attribute) and name in ("items", "keys", "values"):
+            return _iterable_key(node.func.value)
+        return None
+    if isinstance(node, (ast.Name, ast.Attribute, ast.Subscript)):
+        return ast.dump(node)
+    return None
+
+
+def _iterables(loop):
+    """Returns the iterable expressions a loop node traverses."""
+    if isinstance(loop, (ast.For, ast.AsyncFor)):
+        return [loop.iter]
+    if isinstance(loop, ast.While):
+        return []
+    return [generator.iter for generator in loop.generators]
+
+
+@register
+class NestedLoopRule(LoopRule):
+    """Flags a loop nested inside another loop over the same collection."""
+
+    rule_id = "nested-loop-same-iterable"
+    checked_types = (ast.For, ast.AsyncFor, ast.comprehension)
+    severity = "medium"
+    impact = "O(n^2) over one collection"
+
+    def check(self, node, loops):
+        key = _iterable_key(node.iter)
+        if key is None:
+            return
+        for loop in loops:
+            for iterable in _iterables(loop):
+                if iterable is node.iter:
+                    break  # later generators of a comprehension are inner
+                if _iterable_key(iterable) == key:
+                    self.report(
+                        "Nested loops over the same collection: index it with a "
+                        "dict/set or sort it once instead of comparing all pairs.",
+                        node.iter,
+                    )
+                    return
+
+
+@register
+class SortInLoopRule(LoopRule):
+    """Flags ``sorted()`` and ``list.sort()`` inside loops."""
+
+    rule_id = "sort-in-loop"
+    checked_types = (ast.Call,)
+    severity = "medium"
+    impact = "O(n log n) per iteration"
+
+    def check(self, node, loops):
+        func = node.func
+        if ((isinstance(func, ast.Name) and func.id == "sorted")
+                or (isinstance(func, ast.Attribute) and func.attr == "sort" and not node.args)):
+            self.report(
+                "Sorting inside a loop: sort once outside it, or keep the data "
+                "ordered with heapq or bisect.",
+                node,
+            )
+
+
+@register
+class CompileInLoopRule(LoopRule):
+    """Flags ``re.compile`` inside loops."""
+
+    rule_id = "compile-in-loop"
+    checked_types = (ast.Call,)
+    severity = "low"
+    impact = "constant overhead per iteration"
+
+    def check(self, node, loops):
+        func = node.func
+        if (isinstance(func, ast.Attribute) and func.attr == "compile"
+                and isinstance(func.value, ast.Name) and func.value.id == "re"):
+            self.report(
+                "re.compile() inside a loop: compile the pattern once at module level.",
+                node,
+            )
+
+
+@register
+class HeapqMisuseRule(LoopRule):
+    """
+    Flags priority-queue loops that defeat the heap, as seen in Dijkstra:
+    re-heapifying per iteration, extracting the minimum with ``min()``,
+    and lazy-insertion loops that never skip stale entries.
+    """
+
+    rule_id = "heapq-misuse"
+    checked_types = (ast.Call,)
+    severity = "high"
+
+    def visit(self, node):
+        if isinstance(node, ast.While):
+            self._check_stale_entries(node)
+        super().visit(node)
+
+    def check(self, node, loops):
+        if is_module_call(node, "heapq", "heapify"):
+            self.report(
+                "heapq.heapify() inside a loop rebuilds the heap each iteration: "
+                "use heapq.heappush().",
+                node, impact="O(n) per iteration instead of O(log n)",
+            )
+        elif (isinstance(node.func, ast.Name) and node.func.id in ("min", "max")
+              and node.args and isinstance(node.args[0], ast.Name)):
+            queue = node.args[0].id
+            test = loops[-1].test if isinstance(loops[-1], ast.While) else None
+            if isinstance(test, ast.Name) and test.id == queue:
+                self.report(
+                    f"{node.func.id}() over '{queue}' extracts the next item in O(n): "
+                    f"use heapq as the priority queue.",
+                    node, impact="O(V) per extraction, O(V^2) overall",
+                )
+
+    def _check_stale_entries(self, node):
+        """Reports a heappop/heappush loop without a stale-entry ``continue``."""
+        pops = pushes = has_continue = False
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                pops = pops or is_module_call(child, "heapq", "heappop")
+                pushes = pushes or is_module_call(child, "heapq", "heappush")
+            elif isinstance(child, ast.Continue):
+                has_continue = True
+        if pops and pushes and not has_continue:
+            self.report(
+                "Heap loop never skips outdated entries: after heappop, continue "
+                "when the popped distance exceeds the best known one.",
+                node, severity="medium",
+                impact="up to O(E) redundant expansions",
+            )
+
+
+def _decorator_name(node):
+    """Returns the bare name of a decorator (``functools.lru_cache(...)`` -> 'lru_cache')."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _own_nodes(func):
+    """Yields the nodes of a function body, skipping nested definitions."""
+    pending = [node for node in func.body if not isinstance(node, SCOPE_NODES)]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(
+            child for child in ast.iter_child_nodes(node)
+            if not isinstance(child, SCOPE_NODES)
+        )
+
+
+@register
+class UnmemoizedRecursionRule(Rule):
+    """
+    Flags tree recursion on decreasing arguments without memoization, the
+    classic exponential ``fib(n - 1) + fib(n - 2)``.
+
+    Self-calls are counted as the dispatcher hands over ``Call`` nodes.
+    Nodes arrive in source order, so a function is complete once a node
+    starts after its end position, and only functions with two or more
+    such calls have their bodies searched for a memo table.
+    """
+
+    rule_id = "unmemoized-recursion"
+    version = "4"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Call)
+    category = "performance"
+    severity = "high"
+    impact = "O(2^n) calls instead of O(n)"
+
+    def __init__(self):
+        super().__init__()
+        self._open = []  # [function node, end position, decreasing self-calls]
+
+    def visit(self, node):
+        start = (node.lineno, node.col_offset)
+        while self._open and self._open[-1][1] <= start:
+            self._close(*self._open.pop())
+        if isinstance(node, ast.Call):
+            if self._open:
+                current = self._open[-1]
+                if (is_self_call(node, current[0].name)
+                        and any(decreases_by_constant(arg) for arg in node.args)):
+                    current[2] += 1
+        else:
+            end = (getattr(node, "end_lineno", node.lineno), getattr(node, "end_col_offset", 0))
+            self._open.append([node, end, 0])
+
+    def finish(self):
+        while self._open:
+            self._close(*self._open.pop())
+
+    def _close(self, node, end, decreasing_calls):
+        if decreasing_calls < 2 or is_memoized(node):
+            return
+        self.report(
+            f"Function '{node.name}' recurses more than once on smaller inputs "
+            f"without memoization: decorate it with functools.lru_cache.",
+            node,
+        )
+
+
+def is_memoized(func):
+    """True if a function is cached by a decorator or uses a memo table."""
+    if any(_decorator_name(d) in _MEMO_DECORATORS for d in func.decorator_list):
+        return True
+    names = [arg.arg for arg in func.args.args + func.args.kwonlyargs]
+    for child in _own_nodes(func):
+        if isinstance(child, ast.Name):
+            names.append(child.id)
+        elif isinstance(child, ast.Attribute):
+            names.append(child.attr)
+    return any(
+        word.startswith(_MEMO_PREFIXES) or word in _MEMO_WORDS
+        for name in names if name != func.name
+        for word in map(str.lower, _WORD.findall(name))
+    )
+
+
+def decreases_by_constant(node):
+    """True for arguments of the form ``n - <constant>``."""
+    return (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Sub)
+            and isinstance(node.right, ast.Constant))
+
+
+@register
+class UnboundedCacheRule(Rule):
+    """Flags ``@lru_cache(maxsize=None)`` and ``@cache`` on functions with arguments."""
+
+    rule_id = "unbounded-lru-cache"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    category = "performance"
+    severity = "low"
+    impact = "memory grows with every distinct argument, never evicted"
+
+    def visit(self, node):
+        if not (node.args.args or node.args.kwonlyargs or node.args.vararg):
+            return  # a zero-argument function caches a single entry
+        for decorator in node.decorator_list:
+            name = _decorator_name(decorator)
+            unbounded = name == "cache" or (
+                name == "lru_cache" and isinstance(decorator, ast.Call) and any(
+                    kw.arg == "maxsize" and isinstance(kw.value, ast.Constant)
+                    and kw.value.value is None
+                    for kw in decorator.keywords
+                )
+            )
+            if unbounded:
+                self.report(
+                    f"Unbounded cache on '{node.name}': set an lru_cache maxsize "
+                    f"unless its inputs are known to be few.",
+                    node,
+                )
+                return
@@ -0,0 +1,399 @@
+"""
+project.py
+
+Project-mode analysis of multi-file samples.
+
+A project is a directory tree of Python modules. ``ProjectAnalyzer`` maps
+each file to a dotted module name and reads every file once. Modules that
+are not already known are analyzed in parallel; unchanged modules are
+reused from the ``AnalysisCache`` and, within one ``ProjectAnalyzer``,
+from earlier runs, without being parsed.
+
+The intra-project import graph is built from the 'imported_names' of the
+analysis records, which the analyzer takes from the AST, so imports quoted
+in strings or docstrings do not count and a fully cached run still never
+parses. The modules are then grouped into topological waves: every module
+of a wave only imports modules of earlier waves (import cycles are
+collapsed into one unit), which fills in per-module dependency figures in
+one sweep. Metrics are finally rolled up per package and for the whole
+project.
+"""
+
+import hashlib
+import os
+
+from core.analyzer import CodeAnalyzer
+from core.complexity_class import worst_class
+from core.rules import DEFAULT_REGISTRY, SEVERITY_WEIGHTS
+
+_SKIPPED_DIRS = {"__pycache__", "node_modules", "venv", "env", "build", "dist"}
+
+
+def discover_modules(root):
+    """
+    Maps every Python file under ``root`` to its dotted module name.
+
+    Hidden directories, ``__pycache__`` and common virtualenv/build
+    directories are skipped. Packages are named after their directory
+    (``pkg/__init__.py`` is ``pkg``); when ``root`` itself is a package its
+    name prefixes every module.
+
+    Args:
+        root (str): The project directory.
+
+    Returns:
+        dict: module name -> file path, sorted by module name.
+    """
+    prefix = ()
+    if os.path.isfile(os.path.join(root, "__init__.py")):
+        prefix = (os.path.basename(os.path.abspath(root)),)
+
+    modules = {}
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in _SKIPPED_DIRS)
+        relative = os.path.relpath(directory, root)
+        parts = prefix + (() if relative == os.curdir else tuple(relative.split(os.sep)))
+        for name in files:
+            if not name.endswith(".py"):
+                continue
+            stem = name[:-3]
+            dotted = parts if stem == "__init__" else parts + (stem,)
+            if dotted:
+                modules[".".join(dotted)] = os.path.join(directory, name)
+    return dict(sorted(modules.items()))
+
+
+def resolve_import(name, importer, modules, is_package=False):
+    """
+    Resolves one imported name to a module of the project.
+
+    Args:
+        name (str): An entry of a record's 'imported_names'
+                    (``core.import_rules.imported_names``).
+        importer (str): Module name of the importing file.
+        modules (dict | set): Module names of the project.
+        is_package (bool): True if ``importer`` is a package ``__init__``.
+
+    Returns:
+        str: The longest matching project module, or None for external
+             modules and relative imports that escape the project.
+    """
+    level = len(name) - len(name.lstrip("."))
+    if level:
+        package = importer.split(".") if is_package else importer.split(".")[:-1]
+        if level - 1 > len(package):
+            return None
+        base = package[:len(package) - (level - 1)]
+        rest = name[level:]
+        parts = base + (rest.split(".") if rest else [])
+    else:
+        parts = name.split(".")
+    while parts:
+        candidate = ".".join(parts)
+        if candidate in modules:
+            return candidate
+        parts.pop()
+    return None
+
+
+def import_graph(imports, packages=()):
+    """
+    Builds the intra-project import graph.
+
+    Args:
+        imports (dict): module name -> imported names, as in the
+                        'imported_names' of analysis records.
+        packages (iterable): Module names that are package ``__init__`` files.
+
+    Returns:
+        dict: module name -> sorted list of the project modules it imports.
+    """
+    packages = set(packages)
+    graph = {}
+    for module, names in imports.items():
+        targets = {
+            resolve_import(name, module, imports, module in packages)
+            for name in names
+        }
+        targets.discard(None)
+        targets.discard(module)
+        graph[module] = sorted(targets)
+    return graph
+
+
+def strongly_connected(graph):
+    """
+    Finds the import cycles of ``graph`` with Tarjan's algorithm.
+
+    Returns:
+        list: Strongly connected components (lists of module names). A
+              component is emitted only after every component it imports,
+              so the list is in dependency order.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for start in graph:
+        if start in index:
+            continue
+        work = [(start, iter(graph[start]))]
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(graph[target])))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+    return components
+
+
+def topological_waves(graph):
+    """
+    Groups modules into waves that only import modules of earlier waves.
+
+    Modules of one import cycle always share a wave.
+
+    Args:
+        graph (dict): module name -> imported project modules.
+
+    Returns:
+        tuple: (waves, cycles) where ``waves`` is a list of sorted module
+               lists and ``cycles`` lists the components of more than one
+               module.
+    """
+    components = strongly_connected(graph)
+    owner = {module: i for i, component in enumerate(components) for module in component}
+    level = []
+    for i, component in enumerate(components):
+        # Tarjan emits dependencies first, so their levels are already known.
+        deps = {owner[t] for module in component for t in graph[module]} - {i}
+        level.append(max((level[d] + 1 for d in deps), default=0))
+
+    waves = [[] for _ in range(max(level, default=-1) + 1)]
+    for component, depth in zip(components, level):
+        waves[depth].extend(component)
+    cycles = [component for component in components if len(component) > 1]
+    return [sorted(wave) for wave in waves], sorted(cycles)
+
+
+def _penalty(records, categories):
+    """Sums the severity weights of the records' findings in ``categories``."""
+    return sum(
+        SEVERITY_WEIGHTS.get(issue[2], 0)
+        for r in records for issue in r.get("issues", ()) if issue[1] in categories
+    )
+
+
+def rollup(records):
+    """
+    Aggregates module records into one package-level summary.
+
+    Complexity is averaged over the modules that define functions and
+    docstring coverage over the modules that have a value. Halstead
+    volume, bad practices and the severity-weighted performance and
+    resource (I/O and memory) penalties are summed, and the complexity
+    class is the worst of the modules'.
+
+    Args:
+        records (list): Module records from ``ProjectAnalyzer.analyze``.
+
+    Returns:
+        dict: The package metrics.
+    """
+    parsed = [r for r in records if isinstance(r.get("halstead_metrics"), dict)]
+    complexities = [r["complexity"] for r in parsed if r["functions"]]
+    coverages = [r["docstring_coverage"] for r in parsed if r["docstring_coverage"] is not None]
+    return {
+        "modules": len(records),
+        "functions": sum(len(r.get("functions", ())) for r in records),
+        "complexity": round(sum(complexities) / len(complexities), 2) if complexities else None,
+        "docstring_coverage": round(sum(coverages) / len(coverages), 2) if coverages else None,
+        "halstead_volume": round(sum(r["halstead_metrics"]["volume"] for r in parsed), 2),
+        "bad_practices": sum(len(r.get("bad_practices", ())) for r in records),
+        "performance_penalty": _penalty(records, ("performance",)),
+        "resource_penalty": _penalty(records, ("io", "memory")),
+        "static_complexity_class": worst_class(r.get("static_complexity_class") for r in records),
+        "failed_modules": len(records) - len(parsed),
+    }
+
+
+class ProjectAnalyzer:
+    """
+    Analyzes a multi-module project and rolls metrics up per package.
+
+    An instance remembers the record of every module it analyzed, keyed by
+    the SHA-256 of the source, so calling ``analyze`` again after an edit
+    only re-analyzes the modules whose text changed.
+    """
+
+    def __init__(self, root, workers=None, cache=None, rules=None):
+        """
+        Args:
+            root (str): The project directory.
+            workers (int): Worker processes for modules that must be
+                           analyzed. Defaults to ``os.cpu_count()``; 1
+                           analyzes in-process.
+            cache (AnalysisCache): Optional persistent cache, consulted in
+                                   this process before anything is parsed.
+            rules (RuleRegistry): AST rules to apply. Defaults to
+                                  ``core.rules.DEFAULT_REGISTRY``.
+        """
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.rules = DEFAULT_REGISTRY if rules is None else rules
+        self.reused = 0
+        self.analyzed = 0
+        self._known = {}
+        self._rules_version = self.rules.version
+
+    def analyze(self):
+        """
+        Analyzes every module of the project.
+
+        Returns:
+            dict: 'root'; 'modules' (module name -> analysis record plus
+                  'file', 'package', 'wave', 'imports' and
+                  'transitive_imports'); 'packages' (package name ->
+                  ``rollup`` of its modules and subpackages); 'summary' (the
+                  ``rollup`` of the whole project); 'waves'; 'cycles'; and
+                  'reused' / 'analyzed' module counts for this run.
+        """
+        if self._rules_version != self.rules.version:
+            self._known = {}
+            self._rules_version = self.rules.version
+
+        paths = discover_modules(self.root)
+        sources = {}
+        unreadable = {}
+        for module, path in paths.items():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    sources[module] = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                unreadable[module] = {"file": path, "error": str(e)}
+
+        records = self._records(paths, sources)
+        packages = {m for m, p in paths.items() if os.path.basename(p) == "__init__.py"}
+        graph = import_graph(
+            {module: record.get("imported_names") or () for module, record in records.items()},
+            packages,
+        )
+        waves, cycles = topological_waves(graph)
+        cycle_of = {module: cycle for cycle in cycles for module in cycle}
+        bit = {module: 1 << i for i, module in enumerate(graph)}
+
+        modules = {}
+        transitive = {}
+        for depth, wave in enumerate(waves):
+            for module in wave:
+                # Members of an import cycle share the imports of the whole
+                # cycle; everything else they import is in an earlier wave
+                # and already has its closure. Closures are bit sets over
+                # module positions.
+                members = cycle_of.get(module, (module,))
+                closure = 0
+                for member in members:
+                    closure |= bit[member]
+                    for target in graph[member]:
+                        closure |= bit[target] | transitive.get(target, 0)
+                transitive[module] = closure & ~bit[module]
+                modules[module] = {
+                    "file": paths[module],
+                    "package": module if module in packages else module.rpartition(".")[0],
+                    "wave": depth,
+                    "imports": graph[module],
+                    "transitive_imports": transitive[module].bit_count(),
+                    **records[module],
+                }
+        modules.update(unreadable)
+
+        return {
+            "root": self.root,
+            "modules": dict(sorted(modules.items())),
+            "packages": self._packages(modules),
+            "summary": rollup([r for r in modules.values() if "error" not in r]),
+            "waves": waves,
+            "cycles": cycles,
+            "reused": self.reused,
+            "analyzed": self.analyzed,
+        }
+
+    def _records(self, paths, sources):
+        """
+        Returns module -> analysis record for every module read.
+
+        Known modules are taken from memory or the cache; the rest are
+        analyzed together from the text already read, on a process pool
+        when there are several of them. Modules with identical text
+        (vendored copies, empty ``__init__.py`` files) are analyzed once
+        and share the record; all but the first count as reused.
+        """
+        self.reused = self.analyzed = 0
+        known = {}
+        records = {}
+        missing = {}  # digest -> modules with that text, the first one analyzed
+        for module, code in sources.items():
+            digest = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+            if digest in missing:
+                missing[digest].append(module)
+                continue
+            record = self._known.get(digest) or known.get(digest)
+            if record is None:
+                record = CodeAnalyzer(code, cache=self.cache, rules=self.rules).cached()
+            if record is None:
+                missing[digest] = [module]
+                continue
+            known[digest] = record
+            records[module] = record
+            self.reused += 1
+
+        by_path = {paths[modules[0]]: digest for digest, modules in missing.items()}
+        for result in CodeAnalyzer.analyze_many(
+                by_path, workers=self.workers, cache=self.cache, rules=self.rules,
+                sources={path: sources[missing[digest][0]] for path, digest in by_path.items()}):
+            digest = by_path[result.pop("file")]
+            if "error" not in result:
+                known[digest] = result
+            for module in missing[digest]:
+                records[module] = result
+            self.analyzed += 1
+            self.reused += len(missing[digest]) - 1
+        self._known = known
+        return records
+
+    @staticmethod
+    def _packages(modules):
+        """Rolls module records up to every enclosing package."""
+        members = {}
+        for module, record in modules.items():
+            if "error" in record:
+                continue
+            package = record["package"]
+            while package:
+                members.setdefault(package, []).append(record)
+                package = package.rpartition(".")[0]
+        return {package: rollup(records) for package, records in sorted(members.items())}
@@ -27,7 +27,11 @@ class VibeReporter:
         for entry in self.data:
             m = entry.get('model', 'Unknown')
             if m not in models:
-                models[m] = {"comp": [], "time": [], "docs": [], "bugs": 0}
+                models[m] = {"comp": [], "time": [], "mem": [], "docs": [], "bugs": 0,
+                             "success": 0, "total": 0}
+            models[m]["total"] += 1
+            if entry.get('status') == 'Success':
+                models[m]["success"] += 1
             
             # Handle potential 'Error' strings in numeric fields
             comp = entry.get('complexity')
@@ -37,6 +41,11 @@ class VibeReporter:
             exec_time = entry.get('execution_time_sec')
             if isinstance(exec_time, (int, float)):
                 models[m]["time"].append(exec_time)
+
+            # Only present when the benchmark ran with --trace-memory
+            peak_mem = entry.get('peak_traced_mb')
+            if isinstance(peak_mem, (int, float)):
+                models[m]["mem"].append(peak_mem)
             
             doc_cov = entry.get('docstring_coverage', 0)
             if isinstance(doc_cov, (int, float)):
@@ -46,8 +55,9 @@ class VibeReporter:
 
         # 2. Summary Leaderboard Table
         md_content += "## 📈 Model Comparison Summary\n"
-        md_content += "| Model | Avg Complexity | Avg Exec Time | Doc Coverage | Total Bad Practices |\n"
-        md_content += "| :--- | :---: | :---: | :---: | :---: |\n"
+        md_content += ("| Model | Avg Complexity | Avg Exec Time | Max Peak Memory | Doc Coverage "
+                       "| Total Bad Practices | Success Rate |\n")
+        md_content += "| :--- | :---: | :---: | :---: | :---: | :---: | :---: |\n"
 
         # Sort models by success rate descending, then by avg complexity ascending
         sorted_models = sorted(
@@ -63,26 +73,24 @@ class VibeReporter:
             avg_c = sum(stats["comp"]) / len(stats["comp"]) if stats["comp"] else 0
             avg_t = sum(stats["time"]) / len(stats["time"]) if stats["time"] else 0
             avg_d = sum(stats["docs"]) / len(stats["docs"]) if stats["docs"] else 0
-
-            if m not in models:
-              
-              models[m] = {"comp": [], "time": [], "docs": [], "bugs": 0, "success": 0, "total": 0}
-            models[m]["total"] += 1
-            if entry.get('status') == 'Success':
-                models[m]["success"] += 1
+            max_m = f"{max(stats['mem']):.2f} MB" if stats["mem"] else "N/A"
 
             success_rate = (stats["success"] / stats["total"] * 100) if stats["total"] > 0 else 0
-            md_content += f"| {m.upper()} | {avg_c:.2f} | {avg_t:.4f}s | {avg_d:.1f}% | {stats['bugs']} | {success_rate:.1f}% |\n"
+            md_content += (f"| {m.upper()} | {avg_c:.2f} | {avg_t:.4f}s | {max_m} | {avg_d:.1f}% "
+                           f"| {stats['bugs']} | {success_rate:.1f}% |\n")
 
 
         # 3. Detailed Data Table
         md_content += "\n## 🔍 Detailed File Analysis\n"
-        md_content += "| Model | Avg Complexity | Avg Exec Time | Doc Coverage | Total Bad Practices | Success Rate |\n"
-        md_content += "| :--- | :---: | :---: | :---: | :---: | :---: |\n"
+        md_content += "| Model | File | Complexity | Exec Time | Peak Memory | Status |\n"
+        md_content += "| :--- | :--- | :---: | :---: | :---: | :---: |\n"
 
         for entry in self.data:
+            peak_mem = entry.get('peak_traced_mb')
+            peak_mem = f"{peak_mem} MB" if peak_mem is not None else "N/A"
             md_content += (f"| {entry.get('model', 'N/A').upper()} | {entry['file']} | "
-                          f"{entry['complexity']} | {entry['execution_time_sec']}s | {entry['status']} |\n")
+                          f"{entry['complexity']} | {entry['execution_time_sec']}s | {peak_mem} | "
+                          f"{entry['status']} |\n")
 
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(md_content)
@@ -0,0 +1,298 @@
+"""
+rules.py
+
+Plugin API for AST-based bad-practice rules.
+
+Each rule declares the AST node types it inspects. A ``RuleRegistry``
+turns the enabled rules into a dispatch table keyed by node type, so the
+analyzer's single traversal hands every node only to the rules that asked
+for it. The table is built once and reused for every file until the set
+of enabled rules changes. The registry also accumulates per-rule call counts, hit counts and
+cumulative run time so that expensive rules can be found and disabled.
+"""
+
+import ast
+import time
+from collections import namedtuple
+
+# Ordered from least to most severe; the weights feed per-file penalties.
+SEVERITY_WEIGHTS = {"low": 1, "medium": 3, "high": 5}
+
+Finding = namedtuple("Finding", [
+    "rule_id", "category", "severity", "line", "message", "impact",
+])
+Finding.__doc__ = """One rule finding; ``impact`` describes its estimated complexity cost."""
+
+
+class Rule:
+    """
+    Base class for AST rules.
+
+    A fresh instance is created for every analyzed file, so subclasses may
+    keep per-file state on ``self``. Subclasses set ``rule_id`` and
+    ``node_types``, implement ``visit`` and call ``report`` for each
+    finding; rules that aggregate over the whole file can override
+    ``finish``. Bump ``version`` whenever a rule's behaviour changes so
+    that cached results are invalidated.
+
+    ``category`` groups rules (e.g. 'style', 'performance'), ``severity``
+    is one of ``SEVERITY_WEIGHTS`` and ``impact`` is a short description
+    of the estimated complexity cost; ``report`` may override the latter
+    two per finding.
+    """
+
+    rule_id = None
+    node_types = ()
+    version = "1"
+    category = "style"
+    severity = "low"
+    impact = None
+
+    def __init__(self):
+        self.findings = []
+
+    def report(self, message, node=None, severity=None, impact=None):
+        """
+        Records one finding.
+
+        Args:
+            message (str): Human-readable description.
+            node (ast.AST): Node the finding points at, for its line number.
+            severity (str): Overrides the rule's default severity.
+            impact (str): Overrides the rule's default complexity impact.
+        """
+        self.findings.append(Finding(
+            self.rule_id, self.category, severity or self.severity,
+            getattr(node, "lineno", None), message, impact or self.impact,
+        ))
+
+    def visit(self, node):
+        """Inspects a node whose type is listed in ``node_types``."""
+        raise NotImplementedError
+
+    def finish(self):
+        """Called once after the traversal, before findings are collected."""
+
+
+class RuleStats:
+    """Cumulative cost and yield of a single rule."""
+
+    __slots__ = ("calls", "hits", "seconds")
+
+    def __init__(self, calls=0, hits=0, seconds=0.0):
+        self.calls = calls
+        self.hits = hits
+        self.seconds = seconds
+
+    def as_dict(self):
+        return {"calls": self.calls, "hits": self.hits, "seconds": round(self.seconds, 6)}
+
+
+class RuleRegistry:
+    """
+    Ordered collection of rule classes with enable/disable switches.
+
+    Findings are emitted in registration order, and the registry is
+    picklable so it can be shipped to process-pool workers.
+    """
+
+    def __init__(self):
+        self._rules = {}
+        self._disabled = set()
+        self._layout = None  # (enabled rule classes, dispatch table), see instantiate
+        self.stats = {}
+
+    def register(self, rule_cls):
+        """
+        Adds a rule class to the registry. Usable as a class decorator.
+
+        Raises:
+            ValueError: If the rule has no ``rule_id`` or no ``node_types``,
+                        or if the id is already registered.
+        """
+        if not rule_cls.rule_id or not rule_cls.node_types:
+            raise ValueError(f"{rule_cls.__name__} must define rule_id and node_types")
+        if rule_cls.rule_id in self._rules:
+            raise ValueError(f"Rule '{rule_cls.rule_id}' is already registered")
+        self._rules[rule_cls.rule_id] = rule_cls
+        self.stats[rule_cls.rule_id] = RuleStats()
+        self._layout = None
+        return rule_cls
+
+    def disable(self, rule_id):
+        """Excludes a registered rule from future analyses."""
+        if rule_id not in self._rules:
+            raise KeyError(f"Unknown rule '{rule_id}'")
+        self._disabled.add(rule_id)
+        self._layout = None
+
+    def enable(self, rule_id):
+        """Re-includes a previously disabled rule."""
+        if rule_id not in self._rules:
+            raise KeyError(f"Unknown rule '{rule_id}'")
+        self._disabled.discard(rule_id)
+        self._layout = None
+
+    def copy(self):
+        """
+        Returns an independent registry with the same rules and switches.
+
+        Statistics start at zero, so a long-lived process can hand each
+        request its own registry without sharing enable/disable state.
+        """
+        clone = RuleRegistry()
+        for rule_cls in self._rules.values():
+            clone.register(rule_cls)
+        clone._disabled = set(self._disabled)
+        return clone
+
+    @property
+    def rule_ids(self):
+        """Ids of all registered rules, in registration order."""
+        return list(self._rules)
+
+    @property
+    def version(self):
+        """A string identifying the enabled rules and their versions."""
+        return ",".join(
+            f"{rule_id}@{rule_cls.version}"
+            for rule_id, rule_cls in self._rules.items()
+            if rule_id not in self._disabled
+        )
+
+    def _build_layout(self):
+        """Returns the enabled rule classes and the dispatch table over their positions."""
+        classes = [
+            rule_cls for rule_id, rule_cls in self._rules.items()
+            if rule_id not in self._disabled
+        ]
+        dispatch = {}
+        for index, rule_cls in enumerate(classes):
+            for node_type in rule_cls.node_types:
+                # Expand abstract bases (e.g. ast.stmt) to their concrete
+                # subclasses so lookups can key on type(node) directly.
+                for concrete in _concrete_node_types(node_type):
+                    indices = dispatch.setdefault(concrete, [])
+                    if index not in indices:
+                        indices.append(index)
+        return classes, {node_type: tuple(indices) for node_type, indices in dispatch.items()}
+
+    def instantiate(self):
+        """
+        Creates per-file instances of every enabled rule.
+
+        Only the instances are new; the dispatch table is shared by every
+        call until a rule is registered, enabled or disabled.
+
+        Returns:
+            tuple: (rules, dispatch) where ``rules`` is the list of rule
+                   instances and ``dispatch`` maps each AST node class to
+                   the positions in ``rules`` of the instances interested
+                   in it. ``dispatch`` must not be modified.
+        """
+        if self._layout is None:
+            self._layout = self._build_layout()
+        classes, dispatch = self._layout
+        return [rule_cls() for rule_cls in classes], dispatch
+
+    def run(self, rule, node):
+        """Invokes ``rule.visit(node)`` while recording its cost."""
+        stats = self.stats[rule.rule_id]
+        start = time.perf_counter()
+        rule.visit(node)
+        stats.seconds += time.perf_counter() - start
+        stats.calls += 1
+
+    def collect(self, rules):
+        """
+        Finishes each rule and gathers its findings in registration order.
+
+        Returns:
+            list: All ``Finding`` records from ``rules``.
+        """
+        findings = []
+        for rule in rules:
+            stats = self.stats[rule.rule_id]
+            start = time.perf_counter()
+            rule.finish()
+            stats.seconds += time.perf_counter() - start
+            stats.hits += len(rule.findings)
+            findings.extend(rule.findings)
+        return findings
+
+    def timings(self):
+        """
+        Returns per-rule statistics, most expensive first.
+
+        Returns:
+            dict: rule_id -> {'calls', 'hits', 'seconds'}.
+        """
+        ordered = sorted(self.stats.items(), key=lambda item: -item[1].seconds)
+        return {rule_id: stats.as_dict() for rule_id, stats in ordered}
+
+    def merge_stats(self, timings):
+        """Adds statistics gathered elsewhere (e.g. in a worker process)."""
+        for rule_id, values in timings.items():
+            stats = self.stats.setdefault(rule_id, RuleStats())
+            stats.calls += values["calls"]
+            stats.hits += values["hits"]
+            stats.seconds += values["seconds"]
+
+    def reset_stats(self):
+        """Zeroes every rule's statistics."""
+        self.stats = {rule_id: RuleStats() for rule_id in self._rules}
+
+
+def _concrete_node_types(node_type):
+    """Returns ``node_type`` and all of its AST subclasses that can occur."""
+    found = [node_type]
+    pending = list(node_type.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+DEFAULT_REGISTRY = RuleRegistry()
+register = DEFAULT_REGISTRY.register
+
+
+# --- Built-in rules ---
+
+@register
+class DuplicateImportRule(Rule):
+    """Flags modules or names imported more than once."""
+
+    rule_id = "duplicate-import"
+    node_types = (ast.Import, ast.ImportFrom)
+
+    def __init__(self):
+        super().__init__()
+        self.names = []
+
+    def visit(self, node):
+        self.names.extend(alias.name for alias in node.names)
+
+    def finish(self):
+        if len(set(self.names)) != len(self.names):
+            self.report("Duplicate imports detected.")
+
+
+@register
+class MutableDefaultRule(Rule):
+    """Flags functions using a list, dict or set literal as a default value."""
+
+    rule_id = "mutable-default"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    severity = "medium"
+
+    def visit(self, node):
+        for default in node.args.defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self.report(
+                    f"Mutable default argument in function "
+                    f"'{node.name}': use None as default instead.",
+                    node,
+                )
+                break  # one finding per function is enough
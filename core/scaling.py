@@ -0,0 +1,219 @@
+"""
+scaling.py
+
+Empirical time complexity: how a sample's entry function scales with input size.
+
+``CodeExecutor.scale`` starts ``python scaling.py STATUS_FD SPEC FILE``.
+The child loads the sample under a name other than ``__main__`` (so its
+demo code does not run), looks up the task's entry function and calls it
+at geometrically increasing sizes n = 2^min_exponent ... 2^max_exponent.
+Every call gets a fresh, deterministic input built outside the timed
+region, so functions that mutate their argument (reversing a linked list
+in place) are timed fairly; the fastest of a few calls is kept per size.
+Each point is written to STATUS_FD as soon as it is measured, one
+``n seconds`` line per size, so the parent keeps what was measured even
+if it has to kill the child.
+
+The parent fits the points with ``fit_complexity``: for every candidate
+class f(n) (1, log n, n, n log n, n^2, n^3, 2^n) the constant c of
+t = c * f(n) is fitted by least squares in log space, where it is the
+geometric mean of t / f(n), and the class with the smallest residual is
+reported together with its c.
+
+SPEC is a task's ``scaling`` entry from ``prompts.json``: 'entry' (names
+to look for, in order), 'input' (a key of ``INPUTS``) and optionally
+'min_exponent', 'max_exponent', 'budget' (seconds for the whole series)
+and 'max_call' (seconds a single call may take).
+
+This file runs as a script, so it imports only the standard library.
+"""
+
+import json
+import math
+import os
+import random
+import runpy
+import sys
+import time
+
+SCALING_SCRIPT = os.path.abspath(__file__)
+
+DEFAULT_SPEC = {"min_exponent": 6, "max_exponent": 16, "budget": 20.0, "max_call": 1.0}
+
+# Calls per size; the fastest is kept. Sizes whose calls are slow get fewer.
+_CALLS = 5
+_SIZE_BUDGET = 0.5
+
+_MIN_POINTS = 4
+
+
+class _Node:
+    """A singly linked list node answering to the usual field names."""
+
+    def __init__(self, value, next=None):
+        self.val = self.value = self.data = value
+        self.next = next
+
+
+def _linked_nodes(n, rng):
+    head = None
+    for value in reversed([rng.randrange(n) for _ in range(n)]):
+        head = _Node(value, head)
+    return (head,)
+
+
+def _sequence(n, rng):
+    return ([rng.randrange(n) for _ in range(n)],)
+
+
+def _graph_edges(n, rng):
+    """A path through all nodes (so every node is reachable) plus 3 random edges each."""
+    edges = {u: {} for u in range(n)}
+    for u in range(n):
+        if u + 1 < n:
+            edges[u][u + 1] = rng.randint(1, 100)
+        for _ in range(3):
+            edges[u][rng.randrange(n)] = rng.randint(1, 100)
+    return edges
+
+
+def _graph_mapping(n, rng):
+    return _graph_edges(n, rng), 0
+
+
+def _graph_pairs(n, rng):
+    return {u: list(targets.items()) for u, targets in _graph_edges(n, rng).items()}, 0
+
+
+# Input kind -> variants tried in order at the smallest size; the first one
+# the entry function accepts is used for the whole series.
+INPUTS = {
+    "sequence": (("list", _sequence),),
+    "linked_list": (("nodes", _linked_nodes), ("list", _sequence)),
+    "weighted_graph": (("dict of dicts", _graph_mapping), ("dict of lists", _graph_pairs)),
+}
+
+# Complexity class -> log f(n)
+_MODELS = {
+    "O(1)": lambda n: 0.0,
+    "O(log n)": lambda n: math.log(math.log(n)),
+    "O(n)": lambda n: math.log(n),
+    "O(n log n)": lambda n: math.log(n) + math.log(math.log(n)),
+    "O(n^2)": lambda n: 2 * math.log(n),
+    "O(n^3)": lambda n: 3 * math.log(n),
+    "O(2^n)": lambda n: n * math.log(2),
+}
+
+
+def fit_complexity(points):
+    """
+    Fits measured (n, seconds) points to the candidate complexity classes.
+
+    Args:
+        points (list): (n, seconds) pairs with n >= 2 and seconds > 0.
+
+    Returns:
+        dict: 'class' (the best fit, labelled as by
+              ``core.complexity_class.format_bound``), 'constant' (its c in
+              seconds per unit of f(n)) and 'residuals' (class -> mean
+              squared log error), or None with fewer than 4 usable points.
+    """
+    points = [(n, t) for n, t in points if n >= 2 and t > 0]
+    if len(points) < _MIN_POINTS:
+        return None
+    residuals = {}
+    constants = {}
+    for label, log_f in _MODELS.items():
+        offsets = [math.log(t) - log_f(n) for n, t in points]
+        log_c = sum(offsets) / len(offsets)
+        residuals[label] = round(sum((o - log_c) ** 2 for o in offsets) / len(offsets), 5)
+        constants[label] = math.exp(log_c) if log_c > -700 else 0.0
+    best = min(residuals, key=residuals.get)
+    return {"class": best, "constant": float(f"{constants[best]:.3g}"), "residuals": residuals}
+
+
+def _time_call(func, build, n):
+    """Returns the fastest of a few calls of ``func`` on fresh inputs of size n."""
+    best = math.inf
+    spent = 0.0
+    for _ in range(_CALLS):
+        args = build(n, random.Random(n))
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent >= _SIZE_BUDGET:
+            break
+    return best
+
+
+def measure(func, spec, report):
+    """
+    Times ``func`` at increasing sizes until the series ends or a limit is hit.
+
+    The next size is skipped when extrapolating the last two points says
+    one call would exceed 'max_call' or the series would exceed 'budget'.
+
+    Args:
+        func (callable): The sample's entry function.
+        spec (dict): The task's scaling spec merged over ``DEFAULT_SPEC``.
+        report (callable): Called with (n, seconds) after every size.
+
+    Returns:
+        tuple: (input variant used or None if none was accepted, reason the
+               series stopped early or None).
+    """
+    sizes = [2 ** k for k in range(spec["min_exponent"], spec["max_exponent"] + 1)]
+    variant = build = None
+    error = None
+    for name, candidate in INPUTS[spec["input"]]:
+        try:
+            candidate_time = _time_call(func, candidate, sizes[0])
+        except Exception as exc:
+            error = exc
+            continue
+        variant, build = name, candidate
+        break
+    if build is None:
+        return None, f"no input variant accepted ({type(error).__name__}: {error})"
+
+    started = time.perf_counter()
+    times = [candidate_time]
+    report(sizes[0], candidate_time)
+    for n in sizes[1:]:
+        growth = times[-1] / times[-2] if len(times) > 1 and times[-2] > 0 else 2.0
+        predicted = times[-1] * max(growth, 1.0)
+        if predicted > spec["max_call"]:
+            return variant, f"predicted call time {predicted:.2f}s at n={n}"
+        if time.perf_counter() - started + predicted > spec["budget"]:
+            return variant, f"budget of {spec['budget']}s reached at n={n}"
+        try:
+            times.append(_time_call(func, build, n))
+        except Exception as exc:
+            return variant, f"{type(exc).__name__} at n={n}"
+        report(n, times[-1])
+    return variant, None
+
+
+def main():
+    status_fd, spec, path = int(sys.argv[1]), json.loads(sys.argv[2]), sys.argv[3]
+    spec = {**DEFAULT_SPEC, **spec}
+    sys.path[0] = os.path.dirname(path)
+
+    def write(line):
+        os.write(status_fd, (line + "\n").encode("utf-8"))
+
+    namespace = runpy.run_path(path, run_name="__vibebench_scaling__")
+    entry = next((name for name in spec["entry"] if callable(namespace.get(name))), None)
+    if entry is None:
+        write("# " + json.dumps({"entry": None, "stopped": "entry function not found"}))
+        return 0
+    write("# " + json.dumps({"entry": entry}))
+    variant, stopped = measure(namespace[entry], spec, lambda n, t: write(f"{n} {t!r}"))
+    write("# " + json.dumps({"input": variant, "stopped": stopped}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+secret_scanner.py
+
+Multi-pattern secret detection for generated code.
+
+Provider credentials are located with one compiled alternation of their
+literal prefixes (``AKIA``, ``ghp_``, ``xoxb-``, ...), so every prefix is
+searched in a single pass of the ``re`` engine however many rules exist;
+only positions where a prefix matches are confirmed with the rule's
+anchored regex. Literals without a known prefix are scored by Shannon entropy, and
+credential-like names (``password``, ``api_key``...) assigned or mapped
+to a literal are reported as keyword hits.
+"""
+
+import math
+import re
+from collections import Counter, namedtuple
+
+SecretHit = namedtuple("SecretHit", ["rule_id", "line", "column"])
+
+# (rule_id, literal prefix, regex for the full secret starting at the prefix)
+PROVIDER_RULES = (
+    ("aws-access-key", "AKIA", r"AKIA[0-9A-Z]{16}"),
+    ("aws-access-key", "ASIA", r"ASIA[0-9A-Z]{16}"),
+    ("github-token", "ghp_", r"ghp_[0-9A-Za-z]{36}"),
+    ("github-token", "gho_", r"gho_[0-9A-Za-z]{36}"),
+    ("github-token", "ghs_", r"ghs_[0-9A-Za-z]{36}"),
+    ("github-token", "github_pat_", r"github_pat_[0-9A-Za-z_]{22,}"),
+    ("gitlab-token", "glpat-", r"glpat-[0-9A-Za-z_\-]{20}"),
+    ("slack-token", "xoxb-", r"xoxb-[0-9A-Za-z\-]{10,}"),
+    ("slack-token", "xoxp-", r"xoxp-[0-9A-Za-z\-]{10,}"),
+    ("stripe-key", "sk_live_", r"sk_live_[0-9A-Za-z]{16,}"),
+    ("stripe-key", "rk_live_", r"rk_live_[0-9A-Za-z]{16,}"),
+    ("openai-key", "sk-", r"sk-(?:proj-)?[0-9A-Za-z_\-]{20,}"),
+    ("google-api-key", "AIza", r"AIza[0-9A-Za-z_\-]{35}"),
+    ("groq-key", "gsk_", r"gsk_[0-9A-Za-z]{20,}"),
+    ("huggingface-token", "hf_", r"hf_[0-9A-Za-z]{30,}"),
+    ("sendgrid-key", "SG.", r"SG\.[0-9A-Za-z_\-]{22}\.[0-9A-Za-z_\-]{43}"),
+    ("private-key", "-----BEGIN", r"-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----"),
+)
+
+# Substrings that mark an identifier or dict key as holding a credential
+SENSITIVE_NAMES = (
+    "api_key", "apikey", "password", "passwd", "secret", "token",
+    "access_key", "private_key", "auth_key",
+)
+
+_KEYWORD_VALUE = re.compile(r"[\w]{8,}")
+_ENTROPY_CHARSET = re.compile(r"[A-Za-z0-9+/=_\-]+")
+_HEX_CHARSET = re.compile(r"[0-9a-fA-F]+")
+_DIGIT = re.compile(r"[0-9]")
+_UPPER = re.compile(r"[A-Z]")
+_LOWER = re.compile(r"[a-z]")
+# Lower-case runs of four or more letters are word fragments; they cover most
+# of an identifier such as "ABNewPersonViewController" but little of a key.
+_WORD_FRAGMENT = re.compile(r"[a-z]{4,}")
+_SEQUENTIAL_RUN = re.compile(
+    r"(?:abcde|bcdef|cdefg|defgh|ABCDE|BCDEF|CDEFG|DEFGH|01234|12345|23456|34567)"
+)
+
+
+def _alternation(literals, suffix=""):
+    """Compiles a regex matching any of ``literals``, longest first, followed by ``suffix``."""
+    ordered = sorted(set(literals), key=len, reverse=True)
+    return re.compile(f"(?:{'|'.join(map(re.escape, ordered))}){suffix}")
+
+
+def shannon_entropy(text):
+    """Returns the Shannon entropy of ``text`` in bits per character."""
+    if not text:
+        return 0.0
+    length = len(text)
+    return -sum(
+        count / length * math.log2(count / length) for count in Counter(text).values()
+    )
+
+
+class SecretScanner:
+    """
+    Finds provider credentials, high-entropy literals and keyword secrets.
+
+    ``scan_text`` works on any text; ``scan_literal`` and
+    ``is_keyword_secret`` are the token-level entry points used by
+    ``CodeAnalyzer`` during its single ``tokenize`` pass.
+    """
+
+    def __init__(self, rules=PROVIDER_RULES, sensitive_names=SENSITIVE_NAMES,
+                 min_entropy_length=24, base64_entropy=4.5, hex_entropy=3.0):
+        """
+        Args:
+            rules (tuple): (rule_id, literal prefix, regex) triples.
+            sensitive_names (tuple): Lower-case substrings of credential names.
+            min_entropy_length (int): Shortest literal scored by entropy.
+            base64_entropy (float): Bits/char above which a base64-like
+                                    literal is reported.
+            hex_entropy (float): Bits/char above which a hex literal is
+                                 reported.
+        """
+        self._rules = {}  # prefix -> [(rule_id, compiled regex)]
+        for rule_id, prefix, pattern in rules:
+            self._rules.setdefault(prefix, []).append((rule_id, re.compile(pattern)))
+        self._prefixes = _alternation(self._rules)
+        # A name is sensitive if a credential word is not continued by a letter.
+        self._names = _alternation(sensitive_names, r"(?![^\W\d_])")
+        self.min_entropy_length = min_entropy_length
+        self.base64_entropy = base64_entropy
+        self.hex_entropy = hex_entropy
+
+    def _provider_hits(self, text):
+        """Yields (offset, rule_id) for each confirmed provider credential."""
+        for match in self._prefixes.finditer(text):
+            start = match.start()
+            if start and text[start - 1].isalnum():
+                continue  # "sk-" inside "asterisk-..." is not a key prefix
+            for rule_id, pattern in self._rules[match.group()]:
+                if pattern.match(text, start):
+                    yield start, rule_id
+
+    def is_high_entropy(self, value):
+        """True if ``value`` looks like a random key rather than prose or code."""
+        if len(value) < self.min_entropy_length:
+            return False
+        if value.isdigit() or _SEQUENTIAL_RUN.search(value):
+            return False  # numbers and alphabets such as "abcdef...", "0123..."
+        if _HEX_CHARSET.fullmatch(value):
+            return shannon_entropy(value) >= self.hex_entropy
+        if _ENTROPY_CHARSET.fullmatch(value):
+            # Random keys mix cases and digits; identifiers and words do not.
+            if not (_DIGIT.search(value) and _UPPER.search(value) and _LOWER.search(value)):
+                return False
+            if sum(map(len, _WORD_FRAGMENT.findall(value))) * 3 > len(value):
+                return False
+            return shannon_entropy(value) >= self.base64_entropy
+        return False
+
+    def is_sensitive_name(self, name):
+        """
+        True if an identifier or key contains a credential-like word that is
+        not continued by further letters (``db_password`` but not ``tokens``).
+        """
+        return self._names.search(name.lower()) is not None
+
+    @staticmethod
+    def is_keyword_secret(literal):
+        """True if a quoted literal looks like a password-style value."""
+        return len(literal) >= 2 and literal[0] in "\"'" and literal[-1] == literal[0] \
+            and _KEYWORD_VALUE.fullmatch(literal[1:-1]) is not None
+
+    def scan_literal(self, literal, line, column):
+        """
+        Scans the text of one string token.
+
+        Args:
+            literal (str): The token text, quotes and prefixes included.
+            line (int): 1-based line of the token start.
+            column (int): 0-based column of the token start.
+
+        Returns:
+            list: ``SecretHit`` records; at most one 'high-entropy-string'
+                  hit, and only when no provider rule matched.
+        """
+        hits = [
+            SecretHit(rule_id, *_offset_to_position(literal, offset, line, column))
+            for offset, rule_id in self._provider_hits(literal)
+        ]
+        if not hits:
+            value = _strip_quotes(literal)
+            if self.is_high_entropy(value):
+                hits.append(SecretHit("high-entropy-string", line, column))
+        return hits
+
+    def scan_text(self, text):
+        """
+        Scans arbitrary text for provider credentials in one linear pass.
+
+        Returns:
+            list: ``SecretHit`` records ordered by position.
+        """
+        return [
+            SecretHit(rule_id, *_offset_to_position(text, offset, 1, 0))
+            for offset, rule_id in self._provider_hits(text)
+        ]
+
+
+def _offset_to_position(text, offset, line, column):
+    """Converts an offset within ``text`` starting at (line, column)."""
+    newlines = text.count("\n", 0, offset)
+    if not newlines:
+        return line, column + offset
+    return line + newlines, offset - text.rfind("\n", 0, offset) - 1
+
+
+def _strip_quotes(literal):
+    """Returns the body of a string literal token without prefix or quotes."""
+    body = literal.lstrip("rRbBuUfF")
+    for quote in ('"""', "'''", '"', "'"):
+        if body.startswith(quote) and body.endswith(quote) and len(body) >= 2 * len(quote):
+            return body[len(quote):-len(quote)]
+    return body
+
+
+DEFAULT_SCANNER = SecretScanner()
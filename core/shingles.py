@@ -0,0 +1,107 @@
+"""
+shingles.py
+
+Normalized AST subtree shingles, the clone fingerprint of a sample.
+
+A shingle is the hash of a depth-limited subtree in which variable names
+and literal values are abstracted away, so renaming variables or changing
+constants does not change it. ``CodeAnalyzer`` stores the shingles of
+every analyzed file in its record, so ``core.clones.CloneIndex`` can index
+cached files without parsing them again.
+
+This module avoids NumPy so that the analyzer does not pay for importing it.
+"""
+
+import ast
+import zlib
+
+DEPTH = 3
+
+
+def _label(node):
+    """Returns the normalized label of a node, hiding identifiers and values."""
+    if isinstance(node, ast.Constant):
+        return f"Constant:{type(node.value).__name__}"
+    if isinstance(node, ast.Attribute):
+        # Method and attribute names carry API usage, so they are kept.
+        return f"Attribute:{node.attr}"
+    return type(node).__name__
+
+
+def _fingerprints(label, child_sigs, depth):
+    """sigs[k] fingerprints the subtree of height k rooted at a node with ``label``."""
+    label = label.encode()
+    sigs = [zlib.crc32(label)]
+    for k in range(1, depth):
+        payload = label + b"(" + b",".join(
+            str(child[k - 1]).encode() for child in child_sigs
+        ) + b")"
+        sigs.append(zlib.crc32(payload))
+    return sigs
+
+
+def subtree_shingles(node, depth=DEPTH):
+    """
+    Computes the shingles of ``node``'s subtree.
+
+    The tree is walked with an explicit stack, so arbitrarily deep
+    expressions do not hit the recursion limit.
+
+    Args:
+        node (ast.AST): Root of the subtree.
+        depth (int): Height of the subtree fingerprint rooted at each node.
+
+    Returns:
+        tuple: (set of 32-bit shingles, fingerprints of ``node`` itself by
+               height), the latter as ``module_shingles`` expects them.
+    """
+    result = set()
+    finished = []  # fingerprints of completed subtrees, in visiting order
+    stack = [(node, None)]
+    while stack:
+        current, children = stack.pop()
+        if children is None:
+            children = [
+                child for child in ast.iter_child_nodes(current)
+                if not isinstance(child, ast.expr_context)
+            ]
+            stack.append((current, children))
+            stack.extend((child, None) for child in reversed(children))
+            continue
+        split = len(finished) - len(children)
+        sigs = _fingerprints(_label(current), finished[split:], depth)
+        del finished[split:]
+        result.add(sigs[-1])
+        finished.append(sigs)
+    return result, finished[0]
+
+
+def shingles(tree, depth=DEPTH):
+    """
+    Computes the normalized subtree shingles of a parsed module.
+
+    Args:
+        tree (ast.AST): The parsed source.
+        depth (int): Height of the subtree fingerprint rooted at each node.
+
+    Returns:
+        set: 32-bit integer hashes, one per distinct depth-limited subtree.
+    """
+    return subtree_shingles(tree, depth)[0]
+
+
+def module_shingles(statements, depth=DEPTH):
+    """
+    Combines per-statement results into the shingles of a whole module.
+
+    Args:
+        statements (list): ``subtree_shingles`` of each top-level statement,
+                           in order.
+        depth (int): The depth they were computed with.
+
+    Returns:
+        set: What ``shingles`` returns for the module.
+    """
+    result = set().union(*(found for found, _ in statements))
+    result.add(_fingerprints("Module", [sigs for _, sigs in statements], depth)[-1])
+    return result
@@ -0,0 +1,114 @@
+"""
+timing.py
+
+Robust statistics for repeated execution-time measurements.
+
+One run of a short sample is dominated by scheduling noise, so
+``CodeExecutor.measure`` repeats it. These helpers decide how often it
+repeats and summarise the runs. They use the median and a distribution-free
+confidence interval for it, built from order statistics of the binomial
+distribution, because run times are skewed by outliers that would distort
+a mean and a t-interval.
+"""
+
+import math
+import statistics
+from collections import namedtuple
+
+TimingPolicy = namedtuple("TimingPolicy", ["warmup", "min_runs", "max_runs", "target", "budget"])
+TimingPolicy.__doc__ = """
+How ``CodeExecutor.measure`` repeats a sample: discarded warmup runs, the
+run count bounds, the target relative half-width of the 95% confidence
+interval of the median, and a wall-clock budget in seconds (None for none).
+"""
+
+DEFAULT_POLICY = TimingPolicy(warmup=1, min_runs=6, max_runs=50, target=0.05, budget=30.0)
+
+# 95% two-sided normal quantile and the asymptotic efficiency loss of the
+# median relative to the mean (sqrt(pi / 2)).
+_Z95 = 1.959964
+_MEDIAN_SE_FACTOR = 1.2533
+# IQR of a normal distribution in standard deviations.
+_IQR_PER_SD = 1.349
+
+
+def median_ci(samples, confidence=0.95):
+    """
+    Distribution-free confidence interval for the median.
+
+    The interval is [x(k), x(n-k+1)] of the sorted samples, with k the
+    largest rank for which the binomial tail P(B <= k - 1), B ~ Bin(n, 1/2),
+    stays within (1 - confidence) / 2.
+
+    Args:
+        samples (list): Measured values.
+        confidence (float): Coverage probability.
+
+    Returns:
+        tuple: (low, high), or None if there are too few samples (fewer
+               than 6 at 95%) for any interval to reach that coverage.
+    """
+    values = sorted(samples)
+    n = len(values)
+    alpha = (1 - confidence) / 2
+    tail = 0.0
+    k = 0
+    while k < n:
+        tail += math.comb(n, k) / 2 ** n
+        if tail > alpha:
+            break
+        k += 1
+    if k == 0:
+        return None
+    return values[k - 1], values[n - k]
+
+
+def summarize(samples):
+    """
+    Summarises repeated measurements.
+
+    Args:
+        samples (list): At least one measured value, in seconds.
+
+    Returns:
+        dict: 'runs', 'median', 'min', 'iqr' and 'ci95' ([low, high] of the
+              median, or None with fewer than 6 runs), rounded to 0.1 us.
+    """
+    values = sorted(samples)
+    if len(values) > 1:
+        q1, _, q3 = statistics.quantiles(values, n=4, method="inclusive")
+    else:
+        q1 = q3 = values[0]
+    ci = median_ci(values)
+    return {
+        "runs": len(values),
+        "median": round(statistics.median(values), 7),
+        "min": round(values[0], 7),
+        "iqr": round(q3 - q1, 7),
+        "ci95": [round(ci[0], 7), round(ci[1], 7)] if ci else None,
+    }
+
+
+def relative_half_width(summary):
+    """Half-width of the median's 95% CI relative to the median (inf if unknown)."""
+    if summary["ci95"] is None or summary["median"] <= 0:
+        return math.inf
+    low, high = summary["ci95"]
+    return (high - low) / 2 / summary["median"]
+
+
+def planned_runs(noise, policy):
+    """
+    Number of runs expected to reach ``policy.target`` under a given noise.
+
+    Args:
+        noise (float): Relative dispersion of the machine, as IQR / median
+                       of a trivial sample (see ``CodeExecutor.calibrate``).
+        policy (TimingPolicy): Bounds and target.
+
+    Returns:
+        int: A run count between ``policy.min_runs`` and ``policy.max_runs``.
+    """
+    sd = noise / _IQR_PER_SD
+    needed = math.ceil((_Z95 * _MEDIAN_SE_FACTOR * sd / policy.target) ** 2)
+    return max(policy.min_runs, min(policy.max_runs, needed))
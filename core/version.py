@@ -0,0 +1,13 @@
+"""
+version.py
+
+Versions of the analysis engine, in a module of their own so that the
+``core.daemon`` client can compare them with a server's without importing
+the analyzer.
+"""
+
+# Bump ANALYZER_VERSION when metric computation changes and RULESET_VERSION
+# when the built-in token rules change; both are part of every cache key,
+# together with the versions of the enabled AST rules (see core.rules).
+ANALYZER_VERSION = "2.11"
+RULESET_VERSION = "3"
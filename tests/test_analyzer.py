@@ -1,10 +1,12 @@
+import ast
 import pytest
 import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.analyzer import CodeAnalyzer
+from core.analyzer import CodeAnalyzer, IncrementalAnalyzer, _UNPARSED
+from core.rules import Rule, RuleRegistry
 
 
 # --- Test fixtures ---
@@ -143,6 +145,25 @@ class TestDetectBadPractices:
         analyzer = CodeAnalyzer(code)
         findings = analyzer.detect_bad_practices()
         assert any("mutable default" in f.lower() for f in findings)
+    def test_ignores_placeholder_inside_string_literal(self):
+        code = 'MESSAGE = "# TODO: insert here"\n'
+        findings = CodeAnalyzer(code).detect_bad_practices()
+        assert not any("placeholder" in f.lower() for f in findings)
+
+    def test_ignores_ghost_comment_inside_docstring(self):
+        code = 'def f():\n    """\n    #\n    """\n'
+        findings = CodeAnalyzer(code).detect_bad_practices()
+        assert not any("ghost" in f.lower() for f in findings)
+
+    def test_ignores_credential_inside_string_literal(self):
+        code = 'EXAMPLE = "api_key = \'abcdef1234567890\'"\n'
+        findings = CodeAnalyzer(code).detect_bad_practices()
+        assert not any("credential" in f.lower() for f in findings)
+
+    def test_detects_credential_keyword_argument(self):
+        code = 'connect(password="hunter22hunter")\n'
+        findings = CodeAnalyzer(code).detect_bad_practices()
+        assert any("credential" in f.lower() for f in findings)
     def test_clean_function_no_mutable_default(self):
             code = "def fibonacci(n, memo=None):\n    return n"
             analyzer = CodeAnalyzer(code)
@@ -179,3 +200,233 @@ class TestDocstringCoverage:
         result = analyzer.get_docstring_coverage()
         assert result == 0.0
 
+
+
+# --- Cyclomatic Complexity Tests ---
+
+BRANCHY_CODE = """
+def classify(n):
+    if n < 0:
+        return "negative"
+    elif n == 0:
+        return "zero"
+    for i in range(n):
+        if i and n:
+            pass
+    return "positive"
+
+class Shape:
+    def area(self):
+        return 0
+
+    def scale(self, k):
+        return [k * x for x in range(3) if x]
+"""
+
+
+class TestCyclomaticComplexity:
+
+    def test_simple_functions_score_one(self):
+        analyzer = CodeAnalyzer(SIMPLE_CODE)
+        assert analyzer.get_complexity() == 1.0
+
+    def test_syntax_error_returns_none(self):
+        analyzer = CodeAnalyzer(SYNTAX_ERROR_CODE)
+        assert analyzer.get_complexity() is None
+
+    def test_no_blocks_returns_zero(self):
+        analyzer = CodeAnalyzer(SCRIPT_NO_FUNCTIONS)
+        assert analyzer.get_complexity() == 0
+
+    def test_matches_radon(self):
+        cc_visit = pytest.importorskip("radon.complexity").cc_visit
+        blocks = cc_visit(BRANCHY_CODE)
+        expected = round(sum(b.complexity for b in blocks) / len(blocks), 2)
+        assert CodeAnalyzer(BRANCHY_CODE).get_complexity() == expected
+
+
+# --- Per-Function Metrics Tests ---
+
+class TestFunctionMetrics:
+
+    def test_one_record_per_function_with_qualified_names(self):
+        functions = CodeAnalyzer(BRANCHY_CODE).get_function_metrics()
+        assert [f.name for f in functions] == ["classify", "Shape.area", "Shape.scale"]
+
+    def test_records_line_span_complexity_and_docstring(self):
+        add, subtract = CodeAnalyzer(SIMPLE_CODE).get_function_metrics()
+        assert (add.lineno, add.end_lineno) == (2, 4)
+        assert add.has_docstring and not subtract.has_docstring
+        assert add.complexity == 1
+        classify = CodeAnalyzer(BRANCHY_CODE).get_function_metrics()[0]
+        assert classify.complexity == 6
+
+    def test_halstead_primitives_cover_nested_functions(self):
+        code = "def outer(a):\n    def inner(b):\n        return b + 1\n    return inner(a) - 2\n"
+        outer, inner = CodeAnalyzer(code).get_function_metrics()
+        assert outer.name == "outer" and inner.name == "outer.inner"
+        assert (inner.n1, inner.N1) == (1, 1)
+        assert (outer.n1, outer.N1) == (2, 2)
+
+    def test_records_use_slots(self):
+        record = CodeAnalyzer(SIMPLE_CODE).get_function_metrics()[0]
+        assert not hasattr(record, "__dict__")
+
+    def test_syntax_error_returns_empty_list(self):
+        assert CodeAnalyzer(SYNTAX_ERROR_CODE).get_function_metrics() == []
+
+
+# --- Fused Analysis Tests ---
+
+class TestAnalyze:
+
+    def test_record_contains_all_metrics(self):
+        result = CodeAnalyzer(SIMPLE_CODE).analyze()
+        assert set(result) == {
+            "halstead_metrics", "complexity", "docstring_coverage", "bad_practices",
+            "functions", "secrets", "issues", "static_complexity_class",
+            "module_imports", "imported_names", "clone_shingles",
+        }
+
+    def test_accessors_agree_with_record(self):
+        analyzer = CodeAnalyzer(BRANCHY_CODE)
+        result = analyzer.analyze()
+        assert analyzer.calculate_halstead_metrics() == result["halstead_metrics"]
+        assert analyzer.get_docstring_coverage() == result["docstring_coverage"]
+        assert analyzer.detect_bad_practices() == result["bad_practices"]
+
+    def test_mutable_defaults_reported_for_every_function(self):
+        code = "def a(x=[]):\n    pass\n\ndef b(y={}):\n    pass\n"
+        findings = CodeAnalyzer(code).detect_bad_practices()
+        assert sum("mutable default" in f.lower() for f in findings) == 2
+
+    def test_deeply_nested_expression(self):
+        code = "x = " + " + ".join(['"s"'] * 600) + "\n"
+        result = CodeAnalyzer(code).analyze()
+        assert result["halstead_metrics"]["N1"] == 599
+        assert IncrementalAnalyzer().analyze(code) == result
+
+    def test_too_deep_for_the_parser(self):
+        code = "x = " + " + ".join(["1"] * 100000) + "\n"
+        assert CodeAnalyzer(code).analyze()["halstead_metrics"] == "Syntax Error"
+
+
+# --- Bulk Analysis Tests ---
+
+class TestAnalyzeMany:
+
+    def _write_samples(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"sample_{i}.py"
+            path.write_text(SIMPLE_CODE if i % 2 else UNDOCUMENTED_CODE)
+            paths.append(str(path))
+        return paths
+
+    def test_process_pool_returns_every_file(self, tmp_path):
+        paths = self._write_samples(tmp_path, 6)
+        records = list(CodeAnalyzer.analyze_many(paths, workers=2, chunk_size=2))
+        assert sorted(r["file"] for r in records) == sorted(paths)
+        for record in records:
+            assert record == dict(CodeAnalyzer(open(record["file"]).read()).analyze(),
+                                  file=record["file"])
+
+    def test_in_process_mode(self, tmp_path):
+        paths = self._write_samples(tmp_path, 3)
+        records = list(CodeAnalyzer.analyze_many(paths, workers=1))
+        assert [r["file"] for r in records] == paths
+
+    def test_unreadable_file_reports_error(self, tmp_path):
+        missing = str(tmp_path / "missing.py")
+        records = list(CodeAnalyzer.analyze_many([missing], workers=1))
+        assert records[0]["file"] == missing
+        assert "error" in records[0]
+
+    def test_failing_file_does_not_abort_the_run(self, tmp_path):
+        class Boom(Rule):
+            rule_id = "boom"
+            node_types = (ast.Name,)
+
+            def visit(self, node):
+                if node.id == "boom":
+                    raise ValueError("rule failed")
+
+        registry = RuleRegistry()
+        registry.register(Boom)
+        bad, good = tmp_path / "bad.py", tmp_path / "good.py"
+        bad.write_text("boom = 1\n")
+        good.write_text(SIMPLE_CODE)
+        records = list(CodeAnalyzer.analyze_many([str(bad), str(good)], workers=1, rules=registry))
+        assert records[0] == {"file": str(bad), "error": "ValueError: rule failed"}
+        assert records[1]["complexity"] == 1.0
+
+
+# --- Incremental Analysis Tests ---
+
+REVISION_1 = """
+import os
+
+def first(items=[]):
+    \"\"\"Documented.\"\"\"
+    return [x for x in items if x]
+
+class Second:
+    def method(self):
+        return 1
+"""
+
+REVISION_2 = REVISION_1.replace("return 1", "return 1 if self else 2")
+
+
+class TestIncrementalAnalyzer:
+
+    def test_matches_full_analysis(self):
+        incremental = IncrementalAnalyzer()
+        for revision in (REVISION_1, REVISION_2, "import os\n" + REVISION_2):
+            assert incremental.analyze(revision) == CodeAnalyzer(revision).analyze()
+
+    def test_only_changed_definitions_are_recomputed(self):
+        incremental = IncrementalAnalyzer()
+        incremental.analyze(REVISION_1)
+        assert (incremental.reused, incremental.recomputed) == (0, 2)
+        incremental.analyze(REVISION_2)
+        assert (incremental.reused, incremental.recomputed) == (1, 1)
+
+    def test_reused_definitions_follow_line_shifts(self):
+        incremental = IncrementalAnalyzer()
+        incremental.analyze(REVISION_1)
+        incremental.analyze("\n\n" + REVISION_1)
+        unit = next(iter(incremental._units.values()))
+        assert unit.node.lineno == 6  # 'def first' moved down from line 4
+
+    def test_syntax_error_falls_back_to_full_analysis(self):
+        assert IncrementalAnalyzer().analyze(SYNTAX_ERROR_CODE)["halstead_metrics"] == "Syntax Error"
+
+
+# --- Lean Analyzer Tests ---
+
+class TestLeanAnalyzer:
+
+    def test_uses_slots(self):
+        assert not hasattr(CodeAnalyzer(SIMPLE_CODE), "__dict__")
+
+    def test_text_only_checks_do_not_parse(self):
+        analyzer = CodeAnalyzer(CODE_WITH_TODO)
+        findings = analyzer.detect_bad_practices(ast_rules=False)
+        assert any("todo" in f.lower() for f in findings)
+        assert analyzer._tree is _UNPARSED
+
+    def test_summarize_releases_source_and_tree(self):
+        analyzer = CodeAnalyzer(SIMPLE_CODE)
+        expected = analyzer.analyze()
+        summary = analyzer.summarize()
+        assert summary.complexity == expected["complexity"]
+        assert summary.halstead_volume == expected["halstead_metrics"]["volume"]
+        assert summary.function_count == 2
+        assert analyzer.code is None and analyzer.tree is None
+        assert analyzer.get_docstring_coverage() == expected["docstring_coverage"]
+
+    def test_summarize_syntax_error(self):
+        summary = CodeAnalyzer(SYNTAX_ERROR_CODE).summarize()
+        assert summary.complexity is None
+        assert summary.halstead_volume is None
@@ -0,0 +1,92 @@
+import pickle
+import sqlite3
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer, ANALYZER_VERSION, RULESET_VERSION, _UNPARSED
+from core import cache as cache_module
+from core.cache import AnalysisCache
+from core.rules import DEFAULT_REGISTRY
+
+
+CODE = """
+def add(a, b):
+    \"\"\"Adds two numbers.\"\"\"
+    return a + b
+"""
+
+
+class TestAnalysisCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"))
+        cache.put("k", {"complexity": 1.0, "bad_practices": []})
+        assert cache.get("k") == {"complexity": 1.0, "bad_practices": []}
+        assert cache.get("missing") is None
+
+    def test_key_depends_on_versions(self):
+        key = AnalysisCache.make_key(CODE, "1", "1")
+        assert key == AnalysisCache.make_key(CODE, "1", "1")
+        assert key != AnalysisCache.make_key(CODE, "2", "1")
+        assert key != AnalysisCache.make_key(CODE, "1", "2")
+        assert key != AnalysisCache.make_key(CODE + "\n", "1", "1")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"), max_bytes=80)
+        cache.put("old", {"payload": "x" * 20})
+        cache.put("new", {"payload": "y" * 20})
+        cache.get("old")
+        cache.put("newest", {"payload": "z" * 20})
+        assert cache.get("new") is None
+        assert cache.get("old") is not None
+        assert cache.size_bytes() <= 80
+
+    def test_hits_are_written_in_batches(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "cache.sqlite")
+        monkeypatch.setattr(cache_module, "FLUSH_EVERY", 3)
+        cache = AnalysisCache(path)
+        for key in ("a", "b", "c"):
+            cache.put(key, {"v": key})
+
+        def last_access():
+            with sqlite3.connect(path) as conn:
+                return dict(conn.execute("SELECT key, last_access FROM records"))
+
+        stored = last_access()
+        cache.get("a")
+        cache.get("b")
+        assert last_access() == stored
+        cache.get("c")
+        assert all(last_access()[key] > stored[key] for key in "abc")
+
+        stored = last_access()
+        cache.get("a")
+        cache.close()
+        assert last_access()["a"] > stored["a"]
+
+    def test_survives_pickling(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"))
+        cache.put("k", {"v": 1})
+        clone = pickle.loads(pickle.dumps(cache))
+        assert clone.get("k") == {"v": 1}
+
+
+class TestAnalyzerCaching:
+
+    def test_hit_skips_parsing(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"))
+        first = CodeAnalyzer(CODE, cache=cache).analyze()
+
+        analyzer = CodeAnalyzer(CODE, cache=cache)
+        assert analyzer.analyze() == first
+        assert analyzer._tree is _UNPARSED
+
+    def test_entry_is_keyed_by_versions(self, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"))
+        CodeAnalyzer(CODE, cache=cache).analyze()
+        key = cache.make_key(
+            CODE, ANALYZER_VERSION, f"{RULESET_VERSION}+{DEFAULT_REGISTRY.version}"
+        )
+        assert cache.get(key) == CodeAnalyzer(CODE).analyze()
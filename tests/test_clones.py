@@ -0,0 +1,95 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.clones import CloneIndex, shingles
+
+
+FIBONACCI = """
+def fibonacci(n, memo=None):
+    if memo is None:
+        memo = {}
+    if n in memo:
+        return memo[n]
+    if n <= 1:
+        return n
+    memo[n] = fibonacci(n - 1, memo) + fibonacci(n - 2, memo)
+    return memo[n]
+
+print([fibonacci(i) for i in range(50)])
+"""
+
+# Same structure, every identifier and literal changed
+FIBONACCI_RENAMED = """
+def fib(k, cache=None):
+    if cache is None:
+        cache = {}
+    if k in cache:
+        return cache[k]
+    if k <= 2:
+        return k
+    cache[k] = fib(k - 1, cache) + fib(k - 2, cache)
+    return cache[k]
+
+print([fib(j) for j in range(40)])
+"""
+
+UNRELATED = """
+import csv
+
+with open("data.csv") as handle:
+    rows = list(csv.reader(handle))
+total = sum(float(row[1]) for row in rows[1:])
+with open("result.txt", "w") as out:
+    out.write(str(total / max(len(rows) - 1, 1)))
+"""
+
+
+class TestCloneIndex:
+
+    def _index(self):
+        index = CloneIndex()
+        index.add("fib", FIBONACCI)
+        index.add("fib_renamed", FIBONACCI_RENAMED)
+        index.add("csv", UNRELATED)
+        return index
+
+    def test_shingles_ignore_identifiers_and_literals(self):
+        import ast
+        assert shingles(ast.parse(FIBONACCI)) == shingles(ast.parse(FIBONACCI_RENAMED))
+
+    def test_renamed_clone_is_a_near_duplicate(self):
+        matches = self._index().near_duplicates("fib")
+        assert matches == [("fib_renamed", 1.0)]
+
+    def test_unrelated_sample_has_no_near_duplicates(self):
+        assert self._index().near_duplicates("csv") == []
+
+    def test_query_unindexed_source(self):
+        assert [key for key, _ in self._index().query(FIBONACCI)] == ["fib", "fib_renamed"]
+
+    def test_clusters_group_clones(self):
+        clusters = self._index().clusters()
+        assert clusters["fib"] == clusters["fib_renamed"]
+        assert clusters["csv"] != clusters["fib"]
+
+    def test_unparsable_source_is_skipped(self):
+        index = CloneIndex()
+        assert index.add("broken", "def broken(:\n    pass\n") is False
+        assert "broken" not in index
+
+    def test_signature_from_stored_shingles(self):
+        from core.analyzer import CodeAnalyzer
+        index = CloneIndex()
+        stored = CodeAnalyzer(FIBONACCI).analyze()["clone_shingles"]
+        assert (index.signature(stored) == index.signature(FIBONACCI)).all()
+
+    def test_readding_a_key_replaces_its_buckets(self):
+        index = self._index()
+        index.add("fib", UNRELATED)
+        index.add("fib", UNRELATED)
+        entries = [key for buckets in index._buckets for keys in buckets.values() for key in keys]
+        assert len(entries) == index.bands * len(index)
+        assert index.near_duplicates("fib_renamed") == []
+        assert index.near_duplicates("csv") == [("fib", 1.0)]
@@ -0,0 +1,166 @@
+import sys
+import os
+import ast
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+from core.complexity_class import (
+    LINEARITHMIC, format_bound, infer_complexity_class, parse_complexity_class, worst_class,
+)
+
+
+def bound(code):
+    return infer_complexity_class(ast.parse(code).body[0])
+
+
+class TestInference:
+
+    def test_constant(self):
+        assert bound("def f(a, b):\n    return max(a, b) + 1\n") == "O(1)"
+
+    def test_single_loop_is_linear(self):
+        assert bound("def f(xs):\n    t = 0\n    for x in xs:\n        t += x\n    return t\n") == "O(n)"
+
+    def test_nested_loops_are_quadratic(self):
+        code = (
+            "def pairs(xs):\n"
+            "    for a in xs:\n"
+            "        for b in xs:\n"
+            "            print(a, b)\n"
+        )
+        assert bound(code) == "O(n^2)"
+
+    def test_loop_over_literal_is_constant(self):
+        assert bound("def f():\n    for i in range(10):\n        print(i)\n") == "O(1)"
+
+    def test_sort_is_linearithmic(self):
+        assert bound("def f(xs):\n    return sorted(xs)[0]\n") == "O(n log n)"
+
+    def test_index_in_loop_is_quadratic(self):
+        code = "def f(xs, ys):\n    for y in ys:\n        xs.index(y)\n"
+        assert bound(code) == "O(n^2)"
+
+    def test_halving_while_is_logarithmic(self):
+        code = "def bits(n):\n    c = 0\n    while n:\n        n //= 2\n        c += 1\n    return c\n"
+        assert bound(code) == "O(log n)"
+
+    def test_recursive_binary_search(self):
+        code = (
+            "def search(xs, t, lo, hi):\n"
+            "    if lo > hi:\n"
+            "        return -1\n"
+            "    mid = (lo + hi) // 2\n"
+            "    if xs[mid] < t:\n"
+            "        return search(xs, t, mid + 1, hi)\n"
+            "    return search(xs, t, lo, mid - 1)\n"
+        )
+        assert bound(code) == "O(log n)"
+
+    def test_merge_sort(self):
+        code = (
+            "def merge_sort(xs):\n"
+            "    if len(xs) < 2:\n"
+            "        return xs\n"
+            "    mid = len(xs) // 2\n"
+            "    left = merge_sort(xs[:mid])\n"
+            "    right = merge_sort(xs[mid:])\n"
+            "    out = []\n"
+            "    while left and right:\n"
+            "        out.append(left.pop() if left[-1] > right[-1] else right.pop())\n"
+            "    return out\n"
+        )
+        assert bound(code) == "O(n log n)"
+
+    def test_naive_fibonacci_is_exponential(self):
+        code = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\n"
+        assert bound(code) == "O(2^n)"
+
+    def test_memoized_fibonacci_is_linear(self):
+        code = (
+            "@lru_cache(maxsize=None)\n"
+            "def fib(n):\n"
+            "    if n < 2:\n"
+            "        return n\n"
+            "    return fib(n - 1) + fib(n - 2)\n"
+        )
+        assert bound(code) == "O(n)"
+
+    def test_same_named_method_of_another_object_is_not_recursion(self):
+        code = (
+            "class Stack:\n"
+            "    def append(self, x):\n"
+            "        self.items.append(x)\n"
+            "    def pop(self):\n"
+            "        return self.items.pop()\n"
+        )
+        methods = ast.parse(code).body[0].body
+        assert [infer_complexity_class(m) for m in methods] == ["O(1)", "O(1)"]
+
+    def test_recursive_method(self):
+        code = (
+            "class Tree:\n"
+            "    def size(self, n):\n"
+            "        return 0 if n < 1 else 1 + self.size(n - 1) + self.size(n - 2)\n"
+        )
+        assert infer_complexity_class(ast.parse(code).body[0].body[0]) == "O(2^n)"
+
+
+class TestLabels:
+
+    def test_round_trip(self):
+        for label in ("O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n^3)", "O(2^n)"):
+            assert format_bound(parse_complexity_class(label)) == label
+        assert parse_complexity_class("O(n log n)") == LINEARITHMIC
+
+    def test_rejects_unknown_label(self):
+        with pytest.raises(ValueError):
+            parse_complexity_class("O(n!)")
+
+    def test_worst_class(self):
+        assert worst_class(["O(n)", None, "O(n log n)", "O(log n)"]) == "O(n log n)"
+        assert worst_class([]) is None
+
+
+class TestAnalyzerRecord:
+
+    def test_function_and_file_classes(self):
+        code = "def f(xs):\n    return sorted(xs)\n\nfor a in range(3):\n    pass\n"
+        analyzer = CodeAnalyzer(code)
+        assert analyzer.get_function_metrics()[0].static_complexity_class == "O(n log n)"
+        assert analyzer.analyze()["static_complexity_class"] == "O(n log n)"
+
+    def test_single_pass_matches_standalone_inference(self):
+        code = (
+            "def outer(xs):\n"
+            "    for x in xs:\n"
+            "        if x in seen:\n"
+            "            pass\n"
+            "    def inner():\n"
+            "        seen = []\n"
+            "    n = len(xs)\n"
+            "    while n:\n"
+            "        ys = [y for y in xs if y]\n"
+            "    else:\n"
+            "        n //= 2\n"
+            "    return ys\n"
+            "class Box:\n"
+            "    def scan(self, n):\n"
+            "        f = lambda: sorted(n)\n"
+            "        return [[i, j] for i in range(n) for j in range(n)]\n"
+            "seen = {}\n"
+            "for item in seen:\n"
+            "    item = item[1:]\n"
+        )
+        tree = ast.parse(code)
+        functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+        records = CodeAnalyzer(code).get_function_metrics()
+        assert [r.static_complexity_class for r in records] == [
+            infer_complexity_class(node) for node in functions
+        ] == ["O(n^2)", "O(1)", "O(n^2)"]
+        assert CodeAnalyzer(code).analyze()["static_complexity_class"] == "O(n^2)"
+
+    def test_syntax_error_has_no_class(self):
+        assert CodeAnalyzer("def f(:\n").analyze()["static_complexity_class"] is None
@@ -0,0 +1,133 @@
+import sys
+import os
+import json
+import subprocess
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import analyzer
+from core.analyzer import CodeAnalyzer
+from core.daemon import AnalysisServer, DaemonError, forward_cli, request
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(__import__("socket"), "AF_UNIX"), reason="Unix sockets unavailable"
+)
+
+CODE = """
+import os
+import os
+
+def process(items=[]):
+    if items:
+        return items.pop()
+"""
+
+
+@pytest.fixture
+def server(tmp_path):
+    # Socket paths are limited to ~100 bytes, so keep the name short.
+    path = str(tmp_path / "vb.sock")
+    server = AnalysisServer(path)
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    request({"op": "shutdown"}, path)
+    thread.join(timeout=5)
+
+
+class TestAnalysisServer:
+
+    def test_ping(self, server):
+        response = request({"op": "ping"}, server.socket_path)
+        assert response["status"] == "ok"
+        assert response["pid"] == os.getpid()
+
+    def test_analyze_matches_in_process_analysis(self, server, tmp_path):
+        cache = str(tmp_path / "cache.sqlite")
+        expected = CodeAnalyzer(CODE).analyze()
+        for _ in range(2):  # second request is a warm cache hit
+            response = request({"op": "analyze", "code": CODE, "cache": cache},
+                               server.socket_path)
+            record = response["record"]
+            assert record["bad_practices"] == expected["bad_practices"]
+            assert record["halstead_metrics"] == expected["halstead_metrics"]
+            assert record["functions"][0]["name"] == "process"
+
+    def test_disabled_rules_do_not_leak_between_requests(self, server):
+        disabled = request({"op": "analyze", "code": CODE,
+                            "disabled_rules": ["duplicate-import"]}, server.socket_path)
+        default = request({"op": "analyze", "code": CODE}, server.socket_path)
+        assert "Duplicate imports detected." not in disabled["record"]["bad_practices"]
+        assert "Duplicate imports detected." in default["record"]["bad_practices"]
+
+    def test_errors_are_reported(self, server):
+        assert request({"op": "bogus"}, server.socket_path)["status"] == "error"
+        response = request({"op": "analyze", "code": CODE,
+                            "disabled_rules": ["no-such-rule"]}, server.socket_path)
+        assert response["status"] == "error"
+
+    def test_failing_requests_do_not_stop_the_server(self, server, monkeypatch):
+        response = request({"op": "analyze", "code": 123}, server.socket_path)
+        assert response == {"status": "error", "error": "TypeError: 'code' must be a string"}
+
+        def deep(message):
+            raise RecursionError("maximum recursion depth exceeded")
+
+        monkeypatch.setattr(server, "_analyze", deep)
+        response = request({"op": "analyze", "code": CODE}, server.socket_path)
+        assert response["error"].startswith("RecursionError")
+        assert request({"op": "ping"}, server.socket_path)["status"] == "ok"
+
+    def test_client_ignores_a_server_of_another_version(self, server, tmp_path,
+                                                        monkeypatch, capsys):
+        path = tmp_path / "sample.py"
+        path.write_text(CODE)
+        argv = ["--input", str(path), "--socket", server.socket_path, "--no-cache"]
+        with pytest.raises(SystemExit):
+            forward_cli(argv, "1")
+        assert '"file"' in capsys.readouterr().out
+
+        monkeypatch.setattr(analyzer, "ANALYZER_VERSION", "0.0")
+        forward_cli(argv, "1")  # returns, leaving the request to the caller
+        captured = capsys.readouterr()
+        assert captured.out == "" and "ignoring the daemon" in captured.err
+
+    def test_single_file_and_directory_runs_emit_the_same_fields(self, server, tmp_path,
+                                                                capsys):
+        (tmp_path / "sample.py").write_text(CODE)
+        path = str(tmp_path / "sample.py")
+        script = os.path.join(os.path.dirname(__file__), "..", "vibebench.py")
+
+        def cli(*args):
+            out = subprocess.run([sys.executable, script, "analyze", "--no-cache", *args],
+                                 capture_output=True, text=True, check=True).stdout
+            return json.loads(out)
+
+        in_process = cli("--input", path, "--no-daemon")
+        directory = cli("--input", str(tmp_path), "--workers", "1")
+        with pytest.raises(SystemExit):
+            forward_cli(["--input", path, "--socket", server.socket_path, "--no-cache"], "1.2")
+        forwarded = json.loads(capsys.readouterr().out)
+
+        assert set(in_process) == set(directory) == set(forwarded)
+        assert {"secrets", "issues", "module_imports", "estimated_import_ms"} <= set(in_process)
+        assert in_process["issues"] == directory["issues"] == forwarded["issues"]
+
+    def test_refuses_to_replace_a_live_server(self, server):
+        with pytest.raises(DaemonError):
+            AnalysisServer(server.socket_path).bind()
+
+    def test_shutdown_removes_socket(self, tmp_path):
+        path = str(tmp_path / "vb.sock")
+        server = AnalysisServer(path)
+        server.bind()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert request({"op": "shutdown"}, path) == {"status": "ok"}
+        thread.join(timeout=5)
+        assert not os.path.exists(path)
+        assert request({"op": "ping"}, path) is None
@@ -0,0 +1,239 @@
+import sys
+import os
+import time
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.executor import CodeExecutor
+from core.timing import TimingPolicy
+
+
+@pytest.fixture
+def samples(tmp_path):
+    """Small scripts covering each execution status."""
+    files = {
+        "ok.py": "print('hello')\n",
+        "crash.py": "raise ValueError('boom')\n",
+        "slow.py": "import time\ntime.sleep(0.6)\n",
+        "hang.py": "import time\ntime.sleep(30)\n",
+    }
+    paths = {}
+    for name, code in files.items():
+        path = tmp_path / name
+        path.write_text(code)
+        paths[name] = str(path)
+    return paths
+
+
+class TestRun:
+
+    def test_statuses(self, samples):
+        executor = CodeExecutor(timeout=1)
+        assert executor.run(samples["ok.py"])["stdout_preview"] == "hello"
+        assert executor.run(samples["crash.py"])["status"] == "Runtime Error"
+        assert executor.run(samples["hang.py"])["status"] == "Timeout"
+        assert executor.run("missing.py")["status"] == "Error"
+
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="rusage needs os.wait4")
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_rusage_for_every_outcome(self, samples, tmp_path, warm):
+        spin = tmp_path / "spin.py"
+        spin.write_text("data = bytearray(50 * 1024 * 1024)\nwhile True:\n    pass\n")
+        executor = CodeExecutor(timeout=1, warm=warm)
+        try:
+            timed_out = executor.run(str(spin))
+            crashed = executor.run(samples["crash.py"])
+        finally:
+            executor.close()
+        assert timed_out["status"] == "Timeout"
+        usage = timed_out["rusage"]
+        assert usage["user_time"] + usage["system_time"] > 0.5
+        assert usage["max_rss_kb"] > 50 * 1024
+        assert usage["minor_faults"] > 0 and usage["involuntary_switches"] >= 0
+        assert set(crashed["rusage"]) == set(usage)
+
+
+class TestArun:
+
+    def test_matches_run(self, samples):
+        executor = CodeExecutor(timeout=1)
+        for name in ("ok.py", "crash.py", "hang.py"):
+            expected, actual = executor.run(samples[name]), asyncio.run(executor.arun(samples[name]))
+            assert actual["status"] == expected["status"]
+            assert actual.get("stdout_preview") == expected.get("stdout_preview")
+            assert actual.get("stderr") == expected.get("stderr")
+        assert asyncio.run(executor.arun("missing.py"))["status"] == "Error"
+
+    def test_children_overlap_and_cancel(self, samples):
+        executor = CodeExecutor(timeout=5)
+
+        async def main():
+            start = time.perf_counter()
+            results = await asyncio.gather(*[executor.arun(samples["slow.py"]) for _ in range(8)])
+            elapsed = time.perf_counter() - start
+            hung = asyncio.ensure_future(executor.arun(samples["hang.py"]))
+            await asyncio.sleep(0.2)
+            hung.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await hung
+            return results, elapsed, time.perf_counter() - start
+
+        results, elapsed, total = asyncio.run(main())
+        assert {result["status"] for result in results} == {"Success"}
+        assert elapsed < 2.5 and total < 4
+
+    def test_time_is_taken_at_child_exit(self, samples):
+        executor = CodeExecutor(timeout=5)
+
+        async def main():
+            task = asyncio.ensure_future(executor.arun(samples["ok.py"]))
+            await asyncio.sleep(0.2)
+            time.sleep(1.0)  # the loop is busy long after the child has exited
+            return await task
+
+        result = asyncio.run(main())
+        assert result["status"] == "Success" and result["execution_time"] < 0.9
+
+
+class TestRunMany:
+
+    def test_results_in_completion_order(self, samples):
+        executor = CodeExecutor(timeout=2)
+        order = [samples["slow.py"], samples["ok.py"], samples["crash.py"]]
+        results = list(executor.run_many(order, workers=3))
+        assert [path for path, _ in results][-1] == samples["slow.py"]
+        statuses = {os.path.basename(path): result["status"] for path, result in results}
+        assert statuses == {"slow.py": "Success", "ok.py": "Success", "crash.py": "Runtime Error"}
+
+    def test_waiting_children_overlap(self, samples):
+        executor = CodeExecutor(timeout=2)
+        start = time.perf_counter()
+        results = list(executor.run_many([samples["slow.py"]] * 3, workers=3))
+        assert len(results) == 3
+        assert time.perf_counter() - start < 1.5
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork server needs os.fork")
+class TestWarmExecutor:
+
+    def test_matches_cold_run(self, samples):
+        cold, warm = CodeExecutor(timeout=1), CodeExecutor(timeout=1, warm=True)
+        try:
+            for name in ("ok.py", "crash.py", "hang.py"):
+                expected, actual = cold.run(samples[name]), warm.run(samples[name])
+                assert actual["status"] == expected["status"]
+                assert actual.get("stdout_preview") == expected.get("stdout_preview")
+                assert actual.get("stderr") == expected.get("stderr")
+            result = warm.run(samples["ok.py"])
+            assert result["execution_time"] < 0.05 and result["phases"]["startup_ms"] >= 0
+        finally:
+            warm.close()
+
+    def test_exit_code_and_argv(self, tmp_path):
+        path = tmp_path / "exit.py"
+        path.write_text("import sys\nprint(sys.argv[0] == __file__, __name__)\nsys.exit(3)\n")
+        executor = CodeExecutor(warm=True)
+        try:
+            results = dict(executor.run_many([str(path)] * 2, workers=2))
+        finally:
+            executor.close()
+        assert results[str(path)]["status"] == "Runtime Error"
+        assert results[str(path)]["stdout_preview"] == "True __main__"
+
+
+class TestMeasure:
+
+    def test_repeats_until_converged_or_capped(self, samples):
+        executor = CodeExecutor(timeout=2)
+        policy = TimingPolicy(warmup=1, min_runs=6, max_runs=8, target=0.5, budget=None)
+        result = executor.measure(samples["ok.py"], policy)
+        timing = result["timing"]
+        assert 6 <= timing["runs"] <= 8
+        assert result["execution_time"] == timing["median"]
+        assert timing["min"] <= timing["median"] <= timing["ci95"][1]
+        assert executor.measure(samples["crash.py"], policy)["status"] == "Runtime Error"
+
+    def test_calibrate_sets_noise(self):
+        executor = CodeExecutor()
+        assert executor.calibrate(runs=5)["runs"] == 5
+        assert executor.noise >= 0
+
+
+class TestPhases:
+
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_imports_are_timed_apart_from_the_run(self, tmp_path, warm):
+        path = tmp_path / "phases.py"
+        path.write_text("import time\nimport xml.dom.minidom\ntime.sleep(0.2)\n")
+        executor = CodeExecutor(warm=warm)
+        try:
+            compiled = executor.precompile([str(path)])
+            phases = executor.run(str(path))["phases"]
+        finally:
+            executor.close()
+        assert phases["compile_ms"] == round(compiled[str(path)], 3)
+        assert phases["run_ms"] >= 200 > phases["import_ms"] > 0
+        assert phases["startup_ms"] > 0
+
+    def test_uncompiled_sample_compiles_in_the_child(self, samples):
+        phases = CodeExecutor().run(samples["crash.py"])["phases"]
+        assert phases["compile_ms"] > 0 and phases["import_ms"] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="scaling runs need os.wait4")
+class TestScale:
+
+    def test_fits_entry_function(self, tmp_path):
+        path = tmp_path / "quadratic.py"
+        path.write_text(
+            "def pairs(items):\n"
+            "    return sum(1 for a in items for b in items if a < b)\n"
+            "print('demo')\n"
+        )
+        spec = {"entry": ["missing", "pairs"], "input": "sequence", "max_exponent": 11}
+        result = CodeExecutor().scale(str(path), spec)
+        assert result["status"] == "Success" and result["entry"] == "pairs"
+        assert [n for n, _ in result["points"]] == [2 ** k for k in range(6, 12)]
+        assert result["class"] == "O(n^2)" and result["constant"] > 0
+
+    def test_stops_before_slow_sizes(self, tmp_path):
+        path = tmp_path / "cubic.py"
+        path.write_text("def triples(items):\n"
+                        "    return sum(1 for a in items for b in items for c in items)\n")
+        spec = {"entry": ["triples"], "input": "sequence", "max_call": 0.05}
+        result = CodeExecutor().scale(str(path), spec)
+        assert result["stopped"].startswith("predicted call time")
+        assert result["points"][-1][0] < 2 ** 10
+
+    def test_unsupported_entry(self, samples):
+        spec = {"entry": ["dijkstra"], "input": "weighted_graph"}
+        result = CodeExecutor().scale(samples["ok.py"], spec)
+        assert result["status"] == "Unsupported" and result["points"] == []
+        assert result["stopped"] == "entry function not found"
+
+
+class TestTraceMemory:
+
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_reports_peak_and_allocation_sites(self, tmp_path, warm):
+        if warm and not hasattr(os, "fork"):
+            pytest.skip("fork server needs os.fork")
+        path = tmp_path / "alloc.py"
+        path.write_text("keep = [str(i) for i in range(100000)]\n"
+                        "temp = bytearray(20 * 1024 * 1024)\n"
+                        "del temp\n")
+        executor = CodeExecutor(trace_memory=True, warm=warm)
+        try:
+            memory = executor.run(str(path))["memory"]
+        finally:
+            executor.close()
+        assert memory["peak_kb"] > 20 * 1024 > memory["current_kb"]
+        assert memory["blocks"] >= 100000
+        assert memory["top_sites"][0]["site"] == f"{path}:1"
+        assert memory["top_sites"][0]["count"] >= 100000
+
+    def test_off_by_default(self, samples):
+        assert "memory" not in CodeExecutor().run(samples["ok.py"])
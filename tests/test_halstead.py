@@ -0,0 +1,48 @@
+import math
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+from core.halstead import aggregate_by_label, collect_primitives, halstead_suite
+
+
+SAMPLES = [
+    "def add(a, b):\n    return a + b\n",
+    "x = 1\nif x > 0 and x < 10:\n    x = -x\n",
+    "def f(n):\n    return n * 2 ** n if n % 2 else n // 3\n",
+]
+
+
+class TestHalsteadSuite:
+
+    def test_matches_per_file_analyzer(self):
+        records = [{"halstead": CodeAnalyzer(code).calculate_halstead_metrics()}
+                   for code in SAMPLES]
+        table = collect_primitives(records)
+        suite = halstead_suite(table[:, 0], table[:, 1], table[:, 2], table[:, 3])
+        for i, record in enumerate(records):
+            for name in ("volume", "difficulty", "effort", "time"):
+                assert suite[name][i] == pytest.approx(record["halstead"][name], abs=0.01)
+            assert suite["bugs"][i] == pytest.approx(record["halstead"]["bugs"], abs=1e-4)
+
+    def test_zero_operands_do_not_divide_by_zero(self):
+        suite = halstead_suite([0], [0], [0], [0])
+        assert suite["volume"][0] == 0.0
+        assert suite["difficulty"][0] == 0.0
+
+    def test_missing_primitives_become_nan(self):
+        table = collect_primitives([{"halstead": "Syntax Error"}, {}])
+        suite = halstead_suite(*table.T)
+        assert all(math.isnan(v) for v in suite["effort"])
+
+    def test_aggregate_by_label_ignores_nan(self):
+        suite = {"volume": np.array([10.0, 20.0, np.nan, 5.0])}
+        result = aggregate_by_label(["a", "a", "b", "c"], suite)
+        assert result["a"]["volume"] == 15.0
+        assert result["b"]["volume"] is None
+        assert result["c"]["volume"] == 5.0
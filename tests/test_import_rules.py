@@ -0,0 +1,125 @@
+import sys
+import os
+import platform
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer, IncrementalAnalyzer
+from core import import_costs
+from core.import_costs import ImportCostTable, measure_imports
+
+
+def issues(code, rule_id):
+    return [(issue.line, issue.message) for issue in CodeAnalyzer(code).get_issues("imports")
+            if issue.rule_id == rule_id]
+
+
+TABLE_DATA = {
+    "python": "3.x",
+    "startup": ["os", "sys"],
+    "self_ms": {"json": 1.0, "json.decoder": 2.0, "re": 4.0, "numpy": 50.0, "csv": 0.5},
+    "loads": {"json": ["json", "json.decoder", "re"], "re": ["re"], "numpy": ["numpy", "re"],
+              "csv": ["csv", "re"], "os": []},
+}
+TABLE = ImportCostTable(TABLE_DATA)
+
+
+class TestUnusedImport:
+
+    def test_unused_names_are_reported(self):
+        code = (
+            "import os, sys\nfrom json import loads, dumps as d\nimport xml.dom\n"
+            "print(sys.argv, d({}), xml)\n"
+        )
+        assert [line for line, _ in issues(code, "unused-import")] == [1, 2]
+        assert "'os'" in issues(code, "unused-import")[0][1]
+
+    def test_exports_guards_and_future_are_ignored(self):
+        code = (
+            "from __future__ import annotations\nfrom pkg import helper as helper\n"
+            "from pkg import api\ntry:\n    import ujson\nexcept ImportError:\n    pass\n"
+            "__all__ = ['api']\n"
+        )
+        assert issues(code, "unused-import") == []
+
+
+class TestRedundantImport:
+
+    def test_reimport_in_function_and_submodule(self):
+        code = (
+            "import os\nimport xml.dom\nimport xml\n\n"
+            "def f():\n    import os\n    from json import loads\n    from json import loads\n"
+            "    return os, loads, xml\n"
+        )
+        assert [line for line, _ in issues(code, "redundant-import")] == [3, 6, 8]
+
+    def test_alternatives_and_class_scope_are_not_redundant(self):
+        code = (
+            "try:\n    import json\nexcept ImportError:\n    import json\n\n"
+            "class A:\n    import re\n\n    def f(self):\n        import re\n        return re, json\n"
+        )
+        assert issues(code, "redundant-import") == []
+
+
+class TestImportCost:
+
+    def test_module_imports_record(self):
+        code = (
+            "import json\nimport numpy as np\nfrom . import sibling\n"
+            "if True:\n    import csv\n\ndef f():\n    import re\n\nprint(json.dumps({}))\n"
+        )
+        assert CodeAnalyzer(code).analyze()["module_imports"] == [
+            ["json", 1, True], ["numpy", 2, False], ["csv", 5, False],
+        ]
+        incremental = IncrementalAnalyzer().analyze(code)
+        assert incremental["module_imports"] == CodeAnalyzer(code).analyze()["module_imports"]
+
+    def test_used_means_what_the_unused_import_rule_means(self):
+        code = (
+            "import json\nimport csv\nimport re as re\nfrom os.path import *\n"
+            "__all__ = ['csv']\nprint('json')\n"
+        )
+        rows = CodeAnalyzer(code).analyze()["module_imports"]
+        assert rows == [["json", 1, False], ["csv", 2, True], ["re", 3, True], ["os.path", 4, True]]
+        unused = {message.split("'")[1] for _, message in issues(code, "unused-import")}
+        assert unused == {row[0] for row in rows if not row[2]}
+        assert IncrementalAnalyzer().analyze(code)["module_imports"] == rows
+
+    def test_shared_dependencies_count_once(self):
+        code = "import json\nimport csv\nimport numpy\nimport os.path\nimport mylib\nnumpy.zeros(json)\n"
+        cost = CodeAnalyzer(code).import_cost(TABLE)
+        assert cost.total_ms == 57.5
+        assert cost.unused_ms == 0.5
+        assert cost.unknown == ["mylib"]
+
+    def test_measure_imports_excludes_startup(self):
+        loaded = measure_imports("json", startup=measure_imports("sys"))
+        assert "json" in loaded and "json.decoder" in loaded
+        assert all(isinstance(us, int) for us in loaded.values())
+        assert measure_imports("no_such_module_xyz") is None
+
+    def test_measure_imports_without_site_hooks(self):
+        loaded = measure_imports("site", path=sys.path[1:])
+        assert "site" in loaded  # -S: site was not loaded at startup
+        assert "json" in measure_imports("json", path=sys.path[1:])
+
+    def test_table_of_another_python_is_not_used(self, monkeypatch):
+        other = ImportCostTable({**TABLE_DATA, "python": "2.7.18"})
+        monkeypatch.setattr(import_costs, "_default_table", other)
+        assert import_costs.default_table() is None
+        assert CodeAnalyzer("import json\n").import_cost() is None
+
+    def test_table_of_another_patch_release_is_used(self, monkeypatch):
+        major, minor, _ = platform.python_version_tuple()
+        other = ImportCostTable({**TABLE_DATA, "python": f"{major}.{minor}.99"})
+        monkeypatch.setattr(import_costs, "_default_table", other)
+        assert import_costs.default_table() is other
+        assert CodeAnalyzer("import json\n").import_cost().total_ms == 7.0
+        newer = ImportCostTable({**TABLE_DATA, "python": f"{major}.{int(minor) + 1}.0"})
+        assert not newer.matches_interpreter
+
+    def test_shipped_table_covers_heavy_third_party_packages(self):
+        table = ImportCostTable.load()
+        for module in ("numpy", "pandas", "matplotlib.pyplot", "scipy"):
+            total_ms, unknown = table.cost([module])
+            assert unknown == [] and total_ms > 0, module
@@ -0,0 +1,107 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+
+
+def rule_hits(code):
+    return [
+        (issue.rule_id, issue.line) for issue in CodeAnalyzer(code).get_issues()
+        if issue.category in ("io", "memory")
+    ]
+
+
+class TestFileRules:
+
+    def test_readlines_and_read_split(self):
+        code = (
+            "with open('a') as f:\n"
+            "    lines = f.readlines()\n"
+            "with open('b') as g:\n"
+            "    text = g.read()\n"
+            "for line in text.splitlines():\n"
+            "    pass\n"
+        )
+        assert rule_hits(code) == [("read-whole-file", 2), ("read-whole-file", 4)]
+
+    def test_read_split_matched_per_function(self):
+        code = (
+            "def load(f):\n"
+            "    data = f.read()\n"
+            "    return data\n\n"
+            "def lines(data):\n"
+            "    return data.splitlines()\n"
+        )
+        assert rule_hits(code) == []
+
+    def test_open_same_file_in_loop(self):
+        code = (
+            "for item in items:\n"
+            "    with open('log.txt', 'a') as f:\n"
+            "        f.write(item)\n"
+            "for path in paths:\n"
+            "    with open(path) as f:\n"
+            "        f.read()\n"
+        )
+        assert rule_hits(code) == [("open-in-loop", 2)]
+
+    def test_unclosed_files(self):
+        code = (
+            "import json\n"
+            "config = json.load(open('c.json'))\n"
+            "log = open('log.txt', 'w')\n"
+            "out = open('out.txt', 'w')\n"
+            "out.close()\n"
+            "def handle(p):\n"
+            "    return open(p)\n"
+        )
+        issues = CodeAnalyzer(code).get_issues("io")
+        assert [(i.line, i.severity) for i in issues] == [(2, "low"), (3, "medium")]
+        assert "'log'" in issues[1].message
+
+
+class TestNetworkRules:
+
+    def test_missing_timeouts(self):
+        code = (
+            "import socket, requests\n"
+            "from urllib.request import urlopen\n"
+            "socket.create_connection((host, 443))\n"
+            "socket.create_connection((host, 443), timeout=5)\n"
+            "urlopen(url)\n"
+            "urlopen(url, None, 5)\n"
+            "requests.get(url)\n"
+            "requests.get(url, timeout=3)\n"
+        )
+        assert rule_hits(code) == [
+            ("missing-timeout", 7), ("missing-timeout", 3), ("missing-timeout", 5),
+        ]
+
+    def test_default_timeout_covers_sockets(self):
+        code = (
+            "import socket\n"
+            "socket.setdefaulttimeout(5)\n"
+            "s = socket.socket()\n"
+            "socket.create_connection((host, 443))\n"
+        )
+        assert rule_hits(code) == []
+
+
+class TestMaterialization:
+
+    def test_lazy_iterables_copied(self):
+        code = (
+            "for i in list(range(n)):\n"
+            "    pass\n"
+            "count = len(list(filter(None, xs)))\n"
+            "first = list(d)[0]\n"
+            "total = sum([x * x for x in xs])\n"
+            "for k in list(d.keys()):\n"
+            "    del d[k]\n"
+        )
+        assert rule_hits(code) == [
+            ("materialized-iterable", 1), ("materialized-iterable", 3),
+            ("materialized-iterable", 4), ("materialized-iterable", 5),
+        ]
@@ -0,0 +1,165 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+
+
+def rule_hits(code, category="performance"):
+    return [(issue.rule_id, issue.line) for issue in CodeAnalyzer(code).get_issues(category)]
+
+
+class TestLoopRules:
+
+    def test_pop_front_in_loop(self):
+        code = "queue = [1, 2]\nwhile queue:\n    item = queue.pop(0)\n"
+        assert rule_hits(code) == [("pop-front-in-loop", 3)]
+
+    def test_pop_front_outside_loop_is_fine(self):
+        assert rule_hits("items = [1, 2]\nfirst = items.pop(0)\n") == []
+
+    def test_list_membership_resolved_after_traversal(self):
+        code = (
+            "def unique(values):\n"
+            "    seen = []\n"
+            "    for v in values:\n"
+            "        if v not in seen:\n"
+            "            seen.append(v)\n"
+            "    return seen\n"
+        )
+        assert rule_hits(code) == [("list-membership-in-loop", 4)]
+
+    def test_set_membership_is_fine(self):
+        code = "seen = set()\nfor v in range(9):\n    if v in seen:\n        pass\n"
+        assert rule_hits(code) == []
+
+    def test_string_concat_in_loop(self):
+        code = "out = ''\nfor part in ['a', 'b']:\n    out += part\n"
+        assert rule_hits(code) == [("string-concat-in-loop", 3)]
+
+    def test_numeric_accumulator_is_fine(self):
+        assert rule_hits("total = 0\nfor x in [1, 2]:\n    total += x\n") == []
+
+    def test_nested_loops_over_same_collection(self):
+        code = (
+            "def pairs(items):\n"
+            "    for i in range(len(items)):\n"
+            "        for j in range(len(items)):\n"
+            "            pass\n"
+            "    return [a for a in items for b in items]\n"
+        )
+        assert rule_hits(code) == [
+            ("nested-loop-same-iterable", 3), ("nested-loop-same-iterable", 5),
+        ]
+
+    def test_loop_iterable_is_evaluated_once(self):
+        code = "import re\nfor line in sorted(re.compile('x').findall('xx')):\n    print(line)\n"
+        assert rule_hits(code) == []
+
+    def test_sort_and_compile_in_loop(self):
+        code = "import re\nfor w in ['a']:\n    p = re.compile(w)\n    s = sorted(w)\n"
+        assert rule_hits(code) == [("sort-in-loop", 4), ("compile-in-loop", 3)]
+
+    def test_nested_function_body_is_not_part_of_the_loop(self):
+        code = "for w in ['a']:\n    def key(x):\n        return sorted(x)\n"
+        assert rule_hits(code) == []
+
+
+class TestDijkstraHeapRules:
+
+    def test_textbook_dijkstra_is_clean(self):
+        with open(os.path.join(os.path.dirname(__file__), "..", "datasets",
+                               "ai_samples", "chatgpt", "TASK-003_chatgpt.py")) as f:
+            assert rule_hits(f.read()) == []
+
+    def test_min_based_extraction(self):
+        code = (
+            "def dijkstra(graph, dist):\n"
+            "    unvisited = list(graph)\n"
+            "    while unvisited:\n"
+            "        node = min(unvisited, key=dist.get)\n"
+            "        unvisited.remove(node)\n"
+        )
+        assert rule_hits(code) == [("heapq-misuse", 4)]
+
+    def test_heapify_in_loop_and_missing_stale_check(self):
+        code = (
+            "import heapq\n"
+            "def run(pq, graph, dist):\n"
+            "    while pq:\n"
+            "        d, u = heapq.heappop(pq)\n"
+            "        for v, w in graph[u]:\n"
+            "            heapq.heappush(pq, (d + w, v))\n"
+            "            heapq.heapify(pq)\n"
+        )
+        issues = CodeAnalyzer(code).get_issues("performance")
+        assert [(i.rule_id, i.line, i.severity) for i in issues] == [
+            ("heapq-misuse", 3, "medium"), ("heapq-misuse", 7, "high"),
+        ]
+
+
+class TestFunctionRules:
+
+    NAIVE_FIB = (
+        "def fib(n):\n"
+        "    if n < 2:\n"
+        "        return n\n"
+        "    return fib(n - 1) + fib(n - 2)\n"
+    )
+
+    def test_unmemoized_tree_recursion(self):
+        issues = CodeAnalyzer(self.NAIVE_FIB).get_issues("performance")
+        assert [(i.rule_id, i.severity, i.impact) for i in issues] == [
+            ("unmemoized-recursion", "high", "O(2^n) calls instead of O(n)"),
+        ]
+
+    def test_memoized_recursion_is_fine(self):
+        memo_param = self.NAIVE_FIB.replace("fib(n)", "fib(n, memo=None)")
+        decorated = "from functools import lru_cache\n@lru_cache(maxsize=128)\n" + self.NAIVE_FIB
+        assert rule_hits(memo_param) == []
+        assert rule_hits(decorated) == []
+
+    def test_memo_hints_match_whole_words(self):
+        endpoint = self.NAIVE_FIB.replace("return n\n", "return endpoint(n)\n")
+        assert [hit[0] for hit in rule_hits(endpoint)] == ["unmemoized-recursion"]
+        for table in ("dp", "dpTable", "fib_dp", "memoized", "_cache"):
+            code = self.NAIVE_FIB.replace("fib(n)", f"fib(n, {table}=None)")
+            assert rule_hits(code) == [], table
+
+    def test_divide_and_conquer_is_not_tree_recursion(self):
+        code = (
+            "def merge_sort(a):\n"
+            "    mid = len(a) // 2\n"
+            "    return merge(merge_sort(a[:mid]), merge_sort(a[mid:]))\n"
+        )
+        assert rule_hits(code) == []
+
+    def test_calls_on_other_objects_are_not_recursion(self):
+        code = (
+            "def walk(n, a, b):\n"
+            "    return a.walk(n - 1) + b.walk(n - 2)\n"
+        )
+        assert rule_hits(code) == []
+        assert rule_hits(code.replace("a.walk", "walk").replace("b.walk", "walk")) == [
+            ("unmemoized-recursion", 1),
+        ]
+
+    def test_unbounded_lru_cache(self):
+        code = "import functools\n@functools.lru_cache(maxsize=None)\n" + self.NAIVE_FIB
+        assert rule_hits(code) == [("unbounded-lru-cache", 3)]
+
+
+class TestPerformancePenalty:
+
+    def test_penalty_weights_severities(self):
+        code = "queue = [1]\nout = ''\nwhile queue:\n    queue.pop(0)\n    out += 'x'\n"
+        analyzer = CodeAnalyzer(code)
+        assert analyzer.performance_penalty() == 5 + 3
+        assert len(analyzer.detect_bad_practices()) == 2
+
+    def test_style_findings_carry_severity(self):
+        issues = CodeAnalyzer("def f(x=[]):\n    pass\n").get_issues("style")
+        assert [(i.rule_id, i.line, i.severity) for i in issues] == [
+            ("mutable-default", 1, "medium"),
+        ]
@@ -0,0 +1,116 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import analyzer
+from core.analyzer import CodeAnalyzer, IncrementalAnalyzer
+from core.cache import AnalysisCache
+from core.project import ProjectAnalyzer, discover_modules, resolve_import, topological_waves
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A package with an import cycle between two of its modules."""
+    files = {
+        "app/__init__.py": "from .core import engine\n",
+        "app/core/__init__.py": "",
+        "app/core/engine.py": "import app.util as u\n\ndef run(xs):\n    return sorted(xs)\n",
+        "app/util.py": "from app.core import engine\nimport os\n",
+        "app/cli.py": "from . import (\n    util,\n)\nq = [1]\nwhile q:\n    q.pop(0)\n",
+    }
+    for name, code in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+    return tmp_path / "app"
+
+
+class TestImportGraph:
+
+    def test_imported_names(self):
+        code = (
+            '"""\nimport docs\n"""\nimport a.b as c, d\nfrom .x import (y,\n  z)\n'
+            "from . import w\ntext = 'import nothing'\n\ndef f():\n    from ..p import *\n"
+        )
+        expected = ["a.b", "d", ".x", ".x.y", ".x.z", ".", ".w", "..p"]
+        assert CodeAnalyzer(code).analyze()["imported_names"] == expected
+        assert IncrementalAnalyzer().analyze(code)["imported_names"] == expected
+
+    def test_resolve_relative_and_absolute(self):
+        modules = {"pkg", "pkg.sub", "pkg.sub.mod", "pkg.other"}
+        assert resolve_import("..other", "pkg.sub.mod", modules) == "pkg.other"
+        assert resolve_import(".mod", "pkg.sub", modules, is_package=True) == "pkg.sub.mod"
+        assert resolve_import("pkg.sub.mod.func", "pkg", modules) == "pkg.sub.mod"
+        assert resolve_import("os.path", "pkg", modules) is None
+
+    def test_discover_prefixes_root_package(self, project):
+        assert list(discover_modules(str(project))) == [
+            "app", "app.cli", "app.core", "app.core.engine", "app.util",
+        ]
+
+    def test_waves_put_cycles_together(self):
+        graph = {"a": ["b"], "b": ["c"], "c": ["b"], "d": [], "e": ["a", "d"]}
+        waves, cycles = topological_waves(graph)
+        assert waves == [["b", "c", "d"], ["a"], ["e"]]
+        assert cycles == [["b", "c"]]
+
+
+class TestProjectAnalyzer:
+
+    def test_modules_and_rollup(self, project):
+        result = ProjectAnalyzer(str(project), workers=1).analyze()
+        modules = result["modules"]
+        assert modules["app"]["imports"] == ["app.core", "app.core.engine"]
+        assert modules["app.cli"]["imports"] == ["app", "app.util"]
+        assert result["cycles"] == [["app.core.engine", "app.util"]]
+        assert modules["app.util"]["transitive_imports"] == 2
+        assert modules["app.cli"]["wave"] > modules["app.util"]["wave"]
+
+        summary = result["summary"]
+        assert summary["modules"] == 5
+        assert summary["performance_penalty"] == 5
+        assert summary["static_complexity_class"] == "O(n^2)"
+        assert result["packages"]["app.core"]["static_complexity_class"] == "O(n log n)"
+
+    def test_unchanged_modules_are_reused(self, project):
+        analyzer = ProjectAnalyzer(str(project), workers=1)
+        assert analyzer.analyze()["analyzed"] == 5
+        (project / "util.py").write_text("import os\n")
+        result = analyzer.analyze()
+        assert (result["reused"], result["analyzed"]) == (4, 1)
+        assert result["cycles"] == []
+
+    def test_cached_modules_are_not_reanalyzed(self, project, tmp_path):
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite"))
+        first = ProjectAnalyzer(str(project), workers=1, cache=cache).analyze()
+        second = ProjectAnalyzer(str(project), workers=1, cache=cache).analyze()
+        assert (second["reused"], second["analyzed"]) == (5, 0)
+        assert second["summary"] == first["summary"]
+        cache.close()
+
+    def test_imports_in_strings_are_not_edges_and_files_are_read_once(self, project, monkeypatch):
+        (project / "cli.py").write_text('"""Usage:\n\nimport app.util\n"""\nimport os\n')
+
+        def no_reads(*args, **kwargs):
+            raise AssertionError("module read twice")
+
+        monkeypatch.setattr(analyzer, "open", no_reads, raising=False)
+        result = ProjectAnalyzer(str(project), workers=2).analyze()
+        assert result["analyzed"] == 5
+        assert result["modules"]["app.cli"]["imports"] == []
+        assert all("error" not in record for record in result["modules"].values())
+
+    def test_identical_modules_are_analyzed_once(self, project):
+        (project / "vendored").mkdir()
+        for name in ("__init__.py", "engine.py"):
+            (project / "vendored" / name).write_text((project / "core" / name).read_text())
+        result = ProjectAnalyzer(str(project), workers=2).analyze()
+        # Seven modules, five distinct texts: the copies share the records
+        # of app.core's empty __init__.py and of app.core.engine.
+        assert (result["analyzed"], result["reused"]) == (5, 2)
+        modules = result["modules"]
+        assert modules["app.vendored.engine"]["functions"] == modules["app.core.engine"]["functions"]
+        assert modules["app.vendored.engine"]["imports"] == ["app.util"]
@@ -0,0 +1,120 @@
+import ast
+import pickle
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+from core.rules import (
+    DEFAULT_REGISTRY, DuplicateImportRule, MutableDefaultRule, Rule, RuleRegistry
+)
+
+
+CODE = """
+import os
+import os
+
+def process(items=[]):
+    while items:
+        items.pop()
+"""
+
+
+class WhileLoopRule(Rule):
+    rule_id = "while-loop"
+    node_types = (ast.While,)
+    seen = []
+
+    def visit(self, node):
+        WhileLoopRule.seen.append(type(node))
+        self.report("while loop found.")
+
+
+def make_registry(*rule_classes):
+    registry = RuleRegistry()
+    for rule_cls in rule_classes:
+        registry.register(rule_cls)
+    return registry
+
+
+class TestRuleRegistry:
+
+    def test_default_registry_contains_builtin_rules(self):
+        assert DEFAULT_REGISTRY.rule_ids[:2] == ["duplicate-import", "mutable-default"]
+        assert "pop-front-in-loop" in DEFAULT_REGISTRY.rule_ids
+
+    def test_custom_rule_only_receives_declared_node_types(self):
+        WhileLoopRule.seen = []
+        registry = make_registry(WhileLoopRule)
+        findings = CodeAnalyzer(CODE, rules=registry).detect_bad_practices()
+        assert findings == ["while loop found."]
+        assert WhileLoopRule.seen == [ast.While]
+
+    def test_abstract_node_types_are_expanded(self):
+        class StatementCounter(Rule):
+            rule_id = "statements"
+            node_types = (ast.stmt,)
+
+            def visit(self, node):
+                self.report(type(node).__name__)
+
+        findings = CodeAnalyzer(CODE, rules=make_registry(StatementCounter)).detect_bad_practices()
+        assert findings == ["Import", "Import", "FunctionDef", "While", "Expr"]
+
+    def test_disabled_rule_is_skipped(self):
+        registry = make_registry(DuplicateImportRule, MutableDefaultRule)
+        registry.disable("duplicate-import")
+        findings = CodeAnalyzer(CODE, rules=registry).detect_bad_practices()
+        assert not any("duplicate" in f.lower() for f in findings)
+        assert any("mutable default" in f.lower() for f in findings)
+        assert "duplicate-import" not in registry.version
+
+    def test_records_calls_hits_and_time(self):
+        registry = make_registry(DuplicateImportRule, MutableDefaultRule)
+        CodeAnalyzer(CODE, rules=registry).analyze()
+        stats = registry.timings()
+        assert stats["duplicate-import"]["calls"] == 2
+        assert stats["duplicate-import"]["hits"] == 1
+        assert stats["mutable-default"]["calls"] == 1
+        assert stats["mutable-default"]["seconds"] >= 0.0
+
+    def test_rejects_duplicate_or_incomplete_rules(self):
+        registry = make_registry(WhileLoopRule)
+        with pytest.raises(ValueError):
+            registry.register(WhileLoopRule)
+        with pytest.raises(ValueError):
+            registry.register(type("Nameless", (Rule,), {}))
+
+    def test_survives_pickling(self):
+        registry = make_registry(DuplicateImportRule)
+        clone = pickle.loads(pickle.dumps(registry))
+        assert clone.rule_ids == ["duplicate-import"]
+
+    def test_copy_is_independent(self):
+        registry = make_registry(DuplicateImportRule, MutableDefaultRule)
+        registry.disable("duplicate-import")
+        clone = registry.copy()
+        clone.enable("duplicate-import")
+        assert clone.rule_ids == registry.rule_ids
+        assert "duplicate-import" not in registry.version
+        assert "duplicate-import" in clone.version
+
+    def test_dispatch_table_is_built_once_until_rules_change(self):
+        registry = make_registry(DuplicateImportRule, MutableDefaultRule)
+        first, dispatch = registry.instantiate()
+        second, again = registry.instantiate()
+        assert again is dispatch
+        assert first[0] is not second[0]
+        assert [first[i].rule_id for i in dispatch[ast.Import]] == ["duplicate-import"]
+
+        registry.disable("duplicate-import")
+        rules, dispatch = registry.instantiate()
+        assert ast.Import not in dispatch
+        assert [rules[i].rule_id for i in dispatch[ast.FunctionDef]] == ["mutable-default"]
+        registry.enable("duplicate-import")
+        assert ast.Import in registry.instantiate()[1]
+        registry.register(WhileLoopRule)
+        assert ast.While in registry.instantiate()[1]
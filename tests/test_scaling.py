@@ -0,0 +1,52 @@
+import sys
+import os
+import math
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.scaling import INPUTS, fit_complexity
+
+SIZES = [2 ** k for k in range(6, 14)]
+
+
+class TestFitComplexity:
+
+    @pytest.mark.parametrize("label, cost", [
+        ("O(1)", lambda n: 1.0),
+        ("O(n)", lambda n: n),
+        ("O(n log n)", lambda n: n * math.log(n)),
+        ("O(n^2)", lambda n: n * n),
+    ])
+    def test_recovers_class_and_constant(self, label, cost):
+        points = [(n, 3e-8 * cost(n) * (1.05 if i % 2 else 0.95)) for i, n in enumerate(SIZES)]
+        fit = fit_complexity(points)
+        assert fit["class"] == label
+        assert fit["constant"] == pytest.approx(3e-8, rel=0.05)
+        assert fit["residuals"][label] == min(fit["residuals"].values())
+
+    def test_exponential_growth(self):
+        points = [(n, 1e-6 * 2 ** n) for n in range(10, 20)]
+        assert fit_complexity(points)["class"] == "O(2^n)"
+
+    def test_too_few_points(self):
+        assert fit_complexity([(64, 1e-5), (128, 2e-5), (256, 0.0)]) is None
+
+
+class TestInputs:
+
+    def test_linked_list_matches_sequence(self):
+        (nodes,), (values,) = (build(50, random.Random(50)) for _, build in INPUTS["linked_list"])
+        walked = []
+        while nodes is not None:
+            walked.append(nodes.val)
+            nodes = nodes.next
+        assert walked == values
+
+    def test_graph_variants_share_edges(self):
+        (mapping, start), (pairs, _) = (build(100, random.Random(100))
+                                        for _, build in INPUTS["weighted_graph"])
+        assert start == 0 and len(mapping) == 100
+        assert all(dict(pairs[u]) == mapping[u] for u in mapping)
@@ -0,0 +1,64 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.analyzer import CodeAnalyzer
+from core.secret_scanner import SecretHit, SecretScanner, shannon_entropy
+
+GITHUB_TOKEN = "ghp_" + "a1B2c3D4e5F6g7H8i9J0" * 2
+AWS_KEY = "AKIA" + "ABCDEFGHIJ234567"
+
+
+class TestSecretScanner:
+
+    def test_provider_rules_carry_id_and_location(self):
+        code = f'import os\n\nclient = Client(key="{GITHUB_TOKEN}")\n'
+        assert CodeAnalyzer(code).detect_secrets() == [
+            SecretHit("github-token", 3, 21),
+        ]
+
+    def test_secret_in_dict_key_and_fstring(self):
+        code = (
+            f'config = {{"password": "hunter2hunter2"}}\n'
+            f'url = f"https://api.example.com/?key={AWS_KEY}&v=1"\n'
+        )
+        rule_ids = {hit.rule_id for hit in CodeAnalyzer(code).detect_secrets()}
+        assert rule_ids == {"keyword-assignment", "aws-access-key"}
+
+    def test_multiline_literal_location(self):
+        code = f'KEY = """\nprefix {AWS_KEY}\n"""\n'
+        assert CodeAnalyzer(code).detect_secrets() == [SecretHit("aws-access-key", 2, 7)]
+
+    def test_scan_text_finds_adjacent_prefixes(self):
+        text = f"xoxb-sk-{'a' * 24} {AWS_KEY}"
+        assert SecretScanner().scan_text(text) == [
+            SecretHit("slack-token", 1, 0), SecretHit("openai-key", 1, 5),
+            SecretHit("aws-access-key", 1, 33),
+        ]
+
+    def test_sensitive_names(self):
+        scanner = SecretScanner()
+        assert scanner.is_sensitive_name("DB_PASSWORD")
+        assert scanner.is_sensitive_name("passwords_or_password")
+        assert not scanner.is_sensitive_name("tokens")
+        assert not scanner.is_sensitive_name("tokenÄ")
+
+    def test_high_entropy_literal(self):
+        scanner = SecretScanner()
+        assert scanner.is_high_entropy("q8Zr2LkP9xWm4TnB7vYc1HsD5fGj0eUa")
+        assert not scanner.is_high_entropy("abcdefghijklmnopqrstuvwxyz0123456789")
+        assert not scanner.is_high_entropy("ABNewPersonViewController")
+
+    def test_ordinary_strings_are_not_secrets(self):
+        code = (
+            'tokens = ["alpha", "beta"]\n'
+            'message = "Processing the asterisk-linking-protocols file"\n'
+            'password_prompt = input("Password: ")\n'
+        )
+        assert CodeAnalyzer(code).detect_secrets() == []
+
+    def test_entropy(self):
+        assert shannon_entropy("") == 0.0
+        assert shannon_entropy("aaaa") == 0.0
+        assert shannon_entropy("abcd") == 2.0
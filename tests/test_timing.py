@@ -0,0 +1,33 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.timing import DEFAULT_POLICY, median_ci, planned_runs, relative_half_width, summarize
+
+
+class TestMedianCI:
+
+    def test_needs_six_runs_at_95_percent(self):
+        assert median_ci([1, 2, 3, 4, 5]) is None
+        assert median_ci([6, 1, 5, 2, 4, 3]) == (1, 6)
+
+    def test_order_statistic_ranks(self):
+        # Bin(20, 1/2): P(B <= 5) = 0.0207 <= 0.025 < P(B <= 6), so k = 6.
+        assert median_ci(list(range(1, 21))) == (6, 15)
+
+    def test_outliers_do_not_move_the_median(self):
+        summary = summarize([0.010] * 9 + [1.5])
+        assert summary["median"] == 0.01
+        assert summary["ci95"] == [0.01, 0.01]
+        assert summary["iqr"] == 0.0
+        assert relative_half_width(summary) == 0.0
+
+
+class TestPlannedRuns:
+
+    def test_noisier_machines_need_more_runs(self):
+        quiet, noisy = planned_runs(0.01, DEFAULT_POLICY), planned_runs(0.2, DEFAULT_POLICY)
+        assert quiet == DEFAULT_POLICY.min_runs
+        assert quiet < noisy <= DEFAULT_POLICY.max_runs
+        assert planned_runs(10.0, DEFAULT_POLICY) == DEFAULT_POLICY.max_runs
@@ -1,12 +1,35 @@
 import os
+import sys
+import glob
+import asyncio
 import json
+import math
 from datetime import datetime
+from functools import partial
+
+SCHEMA_VERSION = "1.2"
+# Rule categories reported as 'resource_issues' in benchmark records
+RESOURCE_CATEGORIES = ("io", "memory")
+
+if __name__ == "__main__" and sys.argv[1:2] == ["analyze"]:
+    # Single-file analyses are answered by a running `vibebench serve`
+    # daemon before the analyzer and NumPy are imported; when none is
+    # running this returns and the CLI below handles the request itself.
+    from core.daemon import forward_cli
+    forward_cli(sys.argv[2:], SCHEMA_VERSION)
+
+import numpy as np
 from core.executor import CodeExecutor
-from core.analyzer import CodeAnalyzer
+from core.timing import DEFAULT_POLICY
+from core.analyzer import CodeAnalyzer, FunctionMetrics
+from core.cache import AnalysisCache, DEFAULT_CACHE_PATH
+from core.rules import DEFAULT_REGISTRY
+from core.clones import CloneIndex
+from core.project import ProjectAnalyzer
+from core.import_costs import DEFAULT_TABLE_PATH, build_table, default_modules, default_table
+from core.halstead import PRIMITIVES, aggregate_by_label, collect_primitives, halstead_suite
+from core.daemon import AnalysisServer, DaemonError, DEFAULT_SOCKET_PATH, analyze_results, request
 from core.reporter import VibeReporter  # FIX #22: import at top level
-from radon.complexity import cc_visit
-
-SCHEMA_VERSION = "1.1"
 
 
 class VibeBench:
@@ -18,7 +41,8 @@ class VibeBench:
     and generating consolidated performance reports.
     """
 
-    def __init__(self, root_dir, verbose=False):
+    def __init__(self, root_dir, verbose=False, cache=None, workers=None, warm=False,
+                 timing=None, scaling=None, trace_memory=False):
         """
         Initializes the benchmarking suite with a root directory for datasets.
 
@@ -26,15 +50,39 @@ class VibeBench:
             root_dir (str): Path to the directory containing model subfolders
                             (e.g., 'datasets/').
             verbose (bool): If True, print per-file metric details during the run.
+            cache (AnalysisCache): Optional persistent cache consulted before
+                                   any file is parsed.
+            workers (int): Samples executed concurrently; defaults to the
+                           number of available CPUs.
+            warm (bool): Fork samples from warm interpreters so that
+                         execution times exclude interpreter start-up.
+            timing (TimingPolicy): If given, every sample is timed
+                                   repeatedly (``CodeExecutor.measure``) and
+                                   its median execution time is reported.
+            scaling (dict): Task id -> the task's 'scaling' spec. Samples of
+                            these tasks also get a scaling run
+                            (``CodeExecutor.scale``) and report the
+                            empirical complexity class of their entry
+                            function.
+            trace_memory (bool): Run samples under ``tracemalloc`` and
+                                 report their peak traced memory and top
+                                 allocation sites.
         """
         self.root_dir = root_dir
         self.verbose = verbose
+        self.cache = cache
+        self.workers = workers
+        self.timing = timing
+        self.scaling = scaling or {}
         self.results = []
-        self.executor = CodeExecutor(timeout=5)
+        self.clone_index = CloneIndex()
+        self.executor = CodeExecutor(timeout=5, warm=warm, trace_memory=trace_memory)
 
     def get_complexity(self, code):
         """
-        Calculates cyclomatic complexity using the radon library.
+        Calculates cyclomatic complexity via the fused CodeAnalyzer pass.
+
+        Scores match radon's ``cc_visit`` block rules without a second parse.
 
         Args:
             code (str): The Python source code to analyze.
@@ -43,11 +91,7 @@ class VibeBench:
             float: The average complexity of all code blocks, rounded to two
                    decimal places. Returns None on error.
         """
-        try:
-            blocks = cc_visit(code)
-            return round(sum(b.complexity for b in blocks) / len(blocks), 2) if blocks else 0
-        except Exception:
-            return None
+        return CodeAnalyzer(code, cache=self.cache).get_complexity()
 
     def _print_verbose(self, record):
         """
@@ -66,9 +110,44 @@ class VibeBench:
         complexity_str = str(complexity) if complexity is not None else "N/A"
 
         print(f"  Complexity      : {complexity_str}")
+        print(f"  Static Bound    : {record['static_complexity_class'] or 'N/A'}")
         print(f"  Docstring Cover : {doc_cov_str}")
         print(f"  Bad Practices   : {record['bad_practices_count']}")
+        print(f"  Perf Penalty    : {record['performance_penalty']} "
+              f"({len(record['performance_issues'])} findings)")
+        print(f"  I/O-Mem Penalty : {record['resource_penalty']} "
+              f"({len(record['resource_issues'])} findings)")
+        if record["estimated_import_ms"] is not None:
+            print(f"  Import Cost     : {record['estimated_import_ms']:.1f} ms "
+                  f"({record['unused_import_ms']:.1f} ms unused)")
+        else:
+            print("  Import Cost     : N/A")
         print(f"  Execution Time  : {exec_time_str}")
+        if record["run_ms"] is not None:
+            print(f"  Phases (ms)     : startup {record['startup_ms']:.1f}, "
+                  f"compile {record['compile_ms']:.1f}, import {record['import_ms']:.1f}, "
+                  f"run {record['run_ms']:.1f}")
+        timing = record["timing"]
+        if timing:
+            ci = timing["ci95"]
+            ci_str = f"95% CI {ci[0]:.4f}-{ci[1]:.4f}s" if ci else "no CI"
+            print(f"  Timing Runs     : {timing['runs']} (median, IQR {timing['iqr']:.4f}s, "
+                  f"{ci_str}{'' if timing['converged'] else ', not converged'})")
+        rusage = record["rusage"]
+        if rusage:
+            print(f"  CPU Time        : {record['cpu_time_sec']:.3f}s "
+                  f"(peak RSS {rusage['max_rss_kb'] / 1024:.1f} MB)")
+        memory = record.get("memory")
+        if memory:
+            top = memory["top_sites"][0]["site"] if memory["top_sites"] else "none"
+            print(f"  Traced Memory   : peak {record['peak_traced_mb']:.2f} MB, "
+                  f"{memory['blocks']} live blocks (top site {os.path.basename(top)})")
+        scaling = record.get("scaling")
+        if scaling:
+            fit = (f"{scaling['class']} (c = {scaling['constant']:.3g}s)"
+                   if "class" in scaling else "no fit")
+            stopped = f", stopped: {scaling['stopped']}" if scaling["stopped"] else ""
+            print(f"  Empirical Class : {fit} over {len(scaling['points'])} sizes{stopped}")
         print(f"  Status          : {record['status']}")
         print()
 
@@ -81,58 +160,413 @@ class VibeBench:
         """
         print(f"🚀 Starting Multi-Model Analysis on: {self.root_dir}\n")
 
-        for root, dirs, files in os.walk(self.root_dir):
-            folder_name = os.path.basename(root)
+        folders = list(self._walk_samples())
 
-            # Skip the root folder itself
-            if root == self.root_dir:
-                continue
+        # Dynamic Execution in sandboxed environment, all samples at once
+        paths = [os.path.join(root, name) for root, _, files in folders for name in files]
+        print(f"Executing {len(paths)} samples...\n")
+        try:
+            if self.timing is not None:
+                noise = self.executor.calibrate()
+                print(f"Timing noise of an empty sample: {noise['noise']:.1%} "
+                      f"(median {noise['median'] * 1000:.1f} ms)\n")
+            executions = dict(self.executor.run_many(
+                paths, workers=self.workers, policy=self.timing
+            ))
+            # Scaling runs are serial: each one loads a CPU for seconds.
+            scalings = {}
+            for path in paths:
+                spec = self._scaling_spec(os.path.basename(path))
+                if spec is not None:
+                    print(f"Scaling {path}...")
+                    scalings[path] = self.executor.scale(path, spec)
+        finally:
+            self.executor.close()
+
+        for root, packages, files in folders:
+            folder_name = os.path.basename(root)
 
             # Formalizing the Human Baseline label
             is_baseline = folder_name == "human_samples"
             model_label = "HUMAN_BASELINE (Reference)" if is_baseline else folder_name.upper()
 
+            for package in packages:
+                print(f"[{model_label}] Analyzing package {package}/...")
+                record = self._project_record(os.path.join(root, package), folder_name, is_baseline)
+                if self.verbose:
+                    self._print_verbose(record)
+                self.results.append(record)
+
             for filename in files:
-                if filename.endswith(".py"):
-                    path = os.path.join(root, filename)
-                    print(f"[{model_label}] Analyzing {filename}...")
-
-                    with open(path, 'r', encoding='utf-8') as f:
-                        code = f.read()
-
-                    # Dynamic Execution in sandboxed environment
-                    exec_metrics = self.executor.run(path)
-
-                    # Static Analysis using the core Analyzer
-                    analyzer = CodeAnalyzer(code)
-
-                    # Use None instead of "Error" for missing numeric fields (#24)
-                    raw_exec_time = exec_metrics.get("execution_time")
-                    execution_time_sec = raw_exec_time if isinstance(raw_exec_time, (int, float)) else None
-
-                    doc_coverage = analyzer.get_docstring_coverage()
-
-                    record = {
-                        "schema_version": SCHEMA_VERSION,
-                        "model": folder_name,
-                        "category": "Benchmark Reference" if is_baseline else "AI Synthesis",
-                        "file": filename,
-                        "complexity": self.get_complexity(code),
-                        "docstring_coverage": doc_coverage,
-                        "bad_practices_count": len(analyzer.detect_bad_practices()),
-                        "execution_time_sec": execution_time_sec,
-                        "status": exec_metrics.get("status"),
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    # Print per-file details if --verbose is set (#23)
-                    if self.verbose:
-                        self._print_verbose(record)
+                path = os.path.join(root, filename)
+                print(f"[{model_label}] Analyzing {filename}...")
+                record = self._file_record(path, folder_name, is_baseline,
+                                           executions[path], scalings.get(path))
 
-                    self.results.append(record)
+                # Print per-file details if --verbose is set (#23)
+                if self.verbose:
+                    self._print_verbose(record)
+
+                self.results.append(record)
+
+        self._attach_halstead_suite()
+        self._attach_clone_clusters()
+
+        if self.verbose:
+            self._print_halstead_summary()
 
         self.save_report()
 
+    async def arun_benchmark(self, concurrency=None):
+        """
+        Runs the benchmark on the running event loop, yielding records as they complete.
+
+        Every sample is executed with ``CodeExecutor.arun``, at most
+        ``concurrency`` at a time under an ``asyncio.Semaphore``, and its
+        record is yielded as soon as its child finishes; package samples,
+        which are not executed, come first. Static analysis of a finished
+        sample runs in the loop's default executor, one sample at a time,
+        so the loop keeps reaping children and enforcing their timeouts
+        meanwhile. Repeated timing and scaling runs
+        are not done here (use ``run_benchmark``). Once the iteration
+        completes the Halstead suite and clone clusters are attached to the
+        records already yielded; nothing is written to disk (see
+        ``save_report``).
+
+        Args:
+            concurrency (int): Maximum samples executing at once. Defaults
+                               to the number of CPUs available to this
+                               process.
+
+        Yields:
+            dict: Benchmark records, also appended to ``self.results``.
+        """
+        folders = list(self._walk_samples())
+        samples = [(root, name) for root, _, files in folders for name in files]
+        self.executor.precompile(os.path.join(root, name) for root, name in samples)
+        if concurrency is None:
+            concurrency = (len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+                           else os.cpu_count() or 1)
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def execute(root, filename):
+            async with semaphore:
+                return root, filename, await self.executor.arun(os.path.join(root, filename))
+
+        pending = [asyncio.ensure_future(execute(root, name)) for root, name in samples]
+        try:
+            for root, packages, _ in folders:
+                folder_name = os.path.basename(root)
+                for package in packages:
+                    record = self._project_record(os.path.join(root, package), folder_name,
+                                                  folder_name == "human_samples")
+                    self.results.append(record)
+                    yield record
+
+            for future in asyncio.as_completed(pending):
+                root, filename, exec_metrics = await future
+                folder_name = os.path.basename(root)
+                record = await loop.run_in_executor(None, partial(
+                    self._file_record, os.path.join(root, filename), folder_name,
+                    folder_name == "human_samples", exec_metrics,
+                ))
+                if self.verbose:
+                    print(f"[{folder_name.upper()}] {filename}")
+                    self._print_verbose(record)
+                self.results.append(record)
+                yield record
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self.executor.close()
+
+        self._attach_halstead_suite()
+        self._attach_clone_clusters()
+
+    def _file_record(self, path, folder_name, is_baseline, exec_metrics, scaling=None):
+        """
+        Analyzes one sample file and builds its benchmark record.
+
+        The caller appends the record to ``self.results`` before building
+        the next one, since its clone fingerprint is keyed by that position.
+
+        Args:
+            path (str): The sample file.
+            folder_name (str): Its model folder.
+            is_baseline (bool): Whether it is a human reference sample.
+            exec_metrics (dict): Its execution results (``CodeExecutor.run``).
+            scaling (dict): Its ``CodeExecutor.scale`` results, if any.
+
+        Returns:
+            dict: The record.
+        """
+        filename = os.path.basename(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            code = f.read()
+
+        rusage = exec_metrics.get("rusage")
+        phases = exec_metrics.get("phases") or {}
+        memory = exec_metrics.get("memory")
+
+        # Static Analysis: one parse and one AST pass per file
+        analyzer = CodeAnalyzer(code, cache=self.cache)
+        analysis = analyzer.analyze()
+
+        # Clone fingerprint, keyed by the position the record will take;
+        # the shingles come with the (possibly cached) analysis, so a cache
+        # hit is not parsed
+        self.clone_index.add(len(self.results), analysis["clone_shingles"])
+
+        # Use None instead of "Error" for missing numeric fields (#24)
+        raw_exec_time = exec_metrics.get("execution_time")
+        execution_time_sec = raw_exec_time if isinstance(raw_exec_time, (int, float)) else None
+
+        halstead = analysis["halstead_metrics"]
+        import_cost = analyzer.import_cost()
+        hotspot = max(
+            (FunctionMetrics.from_row(row) for row in analysis["functions"]),
+            key=lambda f: f.complexity,
+            default=None
+        )
+
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "model": folder_name,
+            "category": "Benchmark Reference" if is_baseline else "AI Synthesis",
+            "file": filename,
+            "complexity": analysis["complexity"],
+            "halstead": (
+                {name: halstead[name] for name in PRIMITIVES}
+                if isinstance(halstead, dict) else None
+            ),
+            "docstring_coverage": analysis["docstring_coverage"],
+            "hotspot_function": hotspot.name if hotspot else None,
+            "static_complexity_class": analysis["static_complexity_class"],
+            "bad_practices_count": len(analysis["bad_practices"]),
+            "performance_issues": [
+                {"rule": issue.rule_id, "line": issue.line,
+                 "severity": issue.severity, "impact": issue.impact}
+                for issue in analyzer.get_issues("performance")
+            ],
+            "performance_penalty": analyzer.performance_penalty(),
+            "resource_issues": [
+                {"rule": issue.rule_id, "line": issue.line,
+                 "severity": issue.severity, "impact": issue.impact}
+                for issue in analyzer.get_issues()
+                if issue.category in RESOURCE_CATEGORIES
+            ],
+            "resource_penalty": analyzer.issue_penalty(*RESOURCE_CATEGORIES),
+            "estimated_import_ms": import_cost.total_ms if import_cost is not None else None,
+            "unused_import_ms": import_cost.unused_ms if import_cost is not None else None,
+            "execution_time_sec": execution_time_sec,
+            "startup_ms": phases.get("startup_ms"),
+            "compile_ms": phases.get("compile_ms"),
+            "import_ms": phases.get("import_ms"),
+            "run_ms": phases.get("run_ms"),
+            "cpu_time_sec": (
+                round(rusage["user_time"] + rusage["system_time"], 4)
+                if rusage else None
+            ),
+            "rusage": rusage,
+            "peak_traced_mb": round(memory["peak_kb"] / 1024, 3) if memory else None,
+            "memory": memory,
+            "timing": exec_metrics.get("timing"),
+            "empirical_complexity_class": scaling.get("class") if scaling else None,
+            "complexity_constant": scaling.get("constant") if scaling else None,
+            "scaling": scaling,
+            "status": exec_metrics.get("status"),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _scaling_spec(self, filename):
+        """Returns the scaling spec of the task a sample file belongs to, if any."""
+        name = filename.upper()
+        for task_id, spec in self.scaling.items():
+            if name.startswith(task_id.upper()):
+                return spec
+        return None
+
+    def _walk_samples(self):
+        """
+        Lists the sample folders below the dataset root in walk order.
+
+        Multi-file package samples are scored as one project and not
+        descended into file by file.
+
+        Yields:
+            tuple: (folder path, sorted package names, .py file names).
+        """
+        for root, dirs, files in os.walk(self.root_dir):
+            # Skip the root folder itself
+            if root == self.root_dir:
+                continue
+            packages = [d for d in dirs if os.path.isfile(os.path.join(root, d, "__init__.py"))]
+            for package in packages:
+                dirs.remove(package)
+            yield root, sorted(packages), [name for name in files if name.endswith(".py")]
+
+    def _project_record(self, path, folder_name, is_baseline):
+        """
+        Builds the benchmark record of a multi-file package sample.
+
+        Modules are analyzed with ``ProjectAnalyzer`` and their metrics
+        rolled up; packages are not executed, and their Halstead primitives
+        are not summed (unique operator counts do not add up across files),
+        so 'halstead' and the execution fields are None.
+
+        Args:
+            path (str): The package directory.
+            folder_name (str): The model folder containing the package.
+            is_baseline (bool): True for the human reference samples.
+
+        Returns:
+            dict: A benchmark record with 'project' set to True.
+        """
+        project = ProjectAnalyzer(path, cache=self.cache).analyze()
+        summary = project["summary"]
+        hotspot = max(
+            (
+                (f"{module}.{function.name}", function.complexity)
+                for module, record in project["modules"].items()
+                for function in map(FunctionMetrics.from_row, record.get("functions", ()))
+            ),
+            key=lambda item: item[1],
+            default=(None, None),
+        )
+        # One interpreter loads each module once, whichever file imports it.
+        table = default_table()
+        import_cost = None if table is None else table.estimate([
+            row for record in project["modules"].values() for row in record.get("module_imports", ())
+        ])
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "model": folder_name,
+            "category": "Benchmark Reference" if is_baseline else "AI Synthesis",
+            "file": os.path.basename(path) + "/",
+            "project": True,
+            "modules": summary["modules"],
+            "import_cycles": len(project["cycles"]),
+            "complexity": summary["complexity"],
+            "halstead": None,
+            "docstring_coverage": summary["docstring_coverage"],
+            "hotspot_function": hotspot[0],
+            "static_complexity_class": summary["static_complexity_class"],
+            "bad_practices_count": summary["bad_practices"],
+            "performance_issues": [
+                {"rule": issue[0], "module": module, "line": issue[3],
+                 "severity": issue[2], "impact": issue[5]}
+                for module, record in project["modules"].items()
+                for issue in record.get("issues", ()) if issue[1] == "performance"
+            ],
+            "performance_penalty": summary["performance_penalty"],
+            "resource_issues": [
+                {"rule": issue[0], "module": module, "line": issue[3],
+                 "severity": issue[2], "impact": issue[5]}
+                for module, record in project["modules"].items()
+                for issue in record.get("issues", ()) if issue[1] in RESOURCE_CATEGORIES
+            ],
+            "resource_penalty": summary["resource_penalty"],
+            "estimated_import_ms": import_cost.total_ms if import_cost is not None else None,
+            "unused_import_ms": import_cost.unused_ms if import_cost is not None else None,
+            "execution_time_sec": None,
+            "startup_ms": None,
+            "compile_ms": None,
+            "import_ms": None,
+            "run_ms": None,
+            "cpu_time_sec": None,
+            "rusage": None,
+            "peak_traced_mb": None,
+            "memory": None,
+            "timing": None,
+            "empirical_complexity_class": None,
+            "complexity_constant": None,
+            "scaling": None,
+            "status": "Not Executed",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _attach_clone_clusters(self):
+        """
+        Tags every record with the id of its near-duplicate cluster.
+
+        Samples in the same cluster (across models or against the human
+        baseline) share a 'clone_cluster' id; files that do not parse get None.
+        """
+        clusters = self.clone_index.clusters()
+        for position, record in enumerate(self.results):
+            record["clone_cluster"] = clusters.get(position)
+
+    def _halstead_arrays(self):
+        """Evaluates the derived Halstead suite for all results as arrays."""
+        table = collect_primitives(self.results)
+        return halstead_suite(table[:, 0], table[:, 1], table[:, 2], table[:, 3])
+
+    def _attach_halstead_suite(self):
+        """
+        Adds derived Halstead metrics to every record from one vectorised pass.
+
+        Records only carry the raw primitives until this point; volume,
+        difficulty, effort, time and bugs are computed for the whole run at
+        once. Records without primitives (syntax errors) get None.
+        """
+        if not self.results:
+            return
+
+        suite = self._halstead_arrays()
+        fields = {
+            "volume": "halstead_volume",
+            "difficulty": "halstead_difficulty",
+            "effort": "halstead_effort",
+            "time": "halstead_time_sec",
+            "bugs": "halstead_bugs",
+        }
+        for name, field in fields.items():
+            for record, value in zip(self.results, suite[name].tolist()):
+                record[field] = None if math.isnan(value) else round(value, 4)
+
+    def halstead_by_model(self):
+        """
+        Averages the full Halstead suite per model over the current results.
+
+        Returns:
+            dict: model -> {metric -> mean, or None if no file parsed}.
+        """
+        if not self.results:
+            return {}
+        return aggregate_by_label([r["model"] for r in self.results], self._halstead_arrays())
+
+    def performance_by_model(self):
+        """
+        Averages the static performance penalty per model.
+
+        Returns:
+            dict: model -> {'performance_penalty': mean penalty per file}.
+        """
+        if not self.results:
+            return {}
+        penalties = np.array([r["performance_penalty"] for r in self.results], dtype=float)
+        return aggregate_by_label(
+            [r["model"] for r in self.results], {"performance_penalty": penalties}
+        )
+
+    def _print_halstead_summary(self):
+        """Prints mean Halstead volume, effort and bugs for each model."""
+        print("Halstead summary (mean per file):")
+        for model, metrics in self.halstead_by_model().items():
+            cells = [
+                f"{name}={metrics[name]:.2f}" if metrics[name] is not None else f"{name}=N/A"
+                for name in ("volume", "effort", "bugs")
+            ]
+            print(f"  {model:<28} " + "  ".join(cells))
+        print()
+
+        print("Performance penalty (mean per file, lower is faster):")
+        for model, metrics in self.performance_by_model().items():
+            print(f"  {model:<28} {metrics['performance_penalty']:.2f}")
+        print()
+
     def save_report(self):
         """
         Serializes the benchmark results into a timestamped JSON report and
@@ -158,6 +592,54 @@ class VibeBench:
             print(f"   You can generate it manually: python core/reporter.py")
 
 
+def _collect_python_files(target):
+    """
+    Expands an ``analyze --input`` argument into a sorted list of .py files.
+
+    Args:
+        target (str): A directory (searched recursively) or a glob pattern.
+
+    Returns:
+        list: Paths of the matching Python files.
+    """
+    if os.path.isdir(target):
+        return sorted(
+            os.path.join(root, name)
+            for root, _, files in os.walk(target)
+            for name in files
+            if name.endswith(".py")
+        )
+    return sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+
+
+def _function_dicts(rows):
+    """Expands compact per-function rows into labelled dicts for JSON output."""
+    return [dict(zip(FunctionMetrics.__slots__, row)) for row in rows]
+
+
+def _expand_record(record):
+    """Prepares an analysis record for JSON output, in place: labelled functions, no shingles."""
+    if "functions" in record:
+        record["functions"] = _function_dicts(record["functions"])
+    record.pop("clone_shingles", None)
+
+
+def _add_cache_arguments(subparser):
+    """Registers the shared --cache / --no-cache options on a subcommand."""
+    subparser.add_argument(
+        "--cache",
+        metavar="FILE",
+        default=DEFAULT_CACHE_PATH,
+        help=f"SQLite file for cached analysis results (default: {DEFAULT_CACHE_PATH})."
+    )
+    subparser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Disable the analysis cache and re-parse every file."
+    )
+
+
 def main():
     import argparse
 
@@ -171,20 +653,159 @@ def main():
     # --- analyze command ---
     analyze_parser = subparsers.add_parser(
         "analyze",
-        help="Run static analysis on a single Python file."
+        help="Run static analysis on a Python file, directory or glob."
     )
     analyze_parser.add_argument(
         "--input",
         required=True,
+        metavar="PATH",
+        help="Python file to analyze, or a directory / glob pattern "
+             "(e.g. 'datasets/**/*.py') for bulk JSONL output."
+    )
+    analyze_parser.add_argument(
+        "--output",
         metavar="FILE",
-        help="Path to the Python file to analyze."
+        default=None,
+        help="Path to save JSON results (optional, prints to stdout if omitted)."
+    )
+    analyze_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes for directory/glob input (default: CPU count)."
     )
     analyze_parser.add_argument(
+        "--disable-rule",
+        action="append",
+        default=[],
+        metavar="RULE_ID",
+        choices=DEFAULT_REGISTRY.rule_ids,
+        help="Skip an AST rule (repeatable). Choices: "
+             + ", ".join(DEFAULT_REGISTRY.rule_ids) + "."
+    )
+    analyze_parser.add_argument(
+        "--rule-stats",
+        action="store_true",
+        default=False,
+        help="Print per-rule call counts, hits and cumulative time to stderr."
+    )
+    analyze_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Socket of a running `serve` daemon (default: {DEFAULT_SOCKET_PATH})."
+    )
+    analyze_parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        default=False,
+        help="Always analyze in this process, even if a daemon is running."
+    )
+    _add_cache_arguments(analyze_parser)
+
+    # --- serve command ---
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a persistent analysis daemon that single-file `analyze` "
+             "calls are forwarded to."
+    )
+    serve_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket to listen on (default: {DEFAULT_SOCKET_PATH})."
+    )
+    serve_parser.add_argument(
+        "--stop",
+        action="store_true",
+        default=False,
+        help="Ask the daemon listening on --socket to shut down, then exit."
+    )
+    serve_parser.add_argument(
+        "--status",
+        action="store_true",
+        default=False,
+        help="Print the daemon's pid and request count, then exit."
+    )
+
+    # --- clones command ---
+    clones_parser = subparsers.add_parser(
+        "clones",
+        help="Find near-duplicate samples across models with a MinHash/LSH index."
+    )
+    clones_parser.add_argument(
+        "--input",
+        required=True,
+        metavar="PATH",
+        help="Directory or glob pattern of Python files to index."
+    )
+    clones_parser.add_argument(
+        "--query",
+        metavar="FILE",
+        default=None,
+        help="List near-duplicates of this file instead of all clone clusters."
+    )
+    clones_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.8,
+        help="Minimum estimated similarity (0-1) to report (default: 0.8)."
+    )
+
+    # --- project command ---
+    project_parser = subparsers.add_parser(
+        "project",
+        help="Analyze a multi-file package: import graph, per-module and "
+             "per-package metrics."
+    )
+    project_parser.add_argument(
+        "--input",
+        required=True,
+        metavar="DIR",
+        help="Root directory of the project."
+    )
+    project_parser.add_argument(
         "--output",
         metavar="FILE",
         default=None,
         help="Path to save JSON results (optional, prints to stdout if omitted)."
     )
+    project_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes for modules not found in the cache (default: CPU count)."
+    )
+    _add_cache_arguments(project_parser)
+
+    # --- import-costs command ---
+    import_costs_parser = subparsers.add_parser(
+        "import-costs",
+        help="Measure per-module import times for this interpreter and "
+             "regenerate the table behind 'estimated_import_ms'."
+    )
+    import_costs_parser.add_argument(
+        "--output",
+        metavar="FILE",
+        default=DEFAULT_TABLE_PATH,
+        help="Path of the JSON table to write (default: the shipped table)."
+    )
+    import_costs_parser.add_argument(
+        "--module",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Also measure this installed third-party module (repeatable)."
+    )
+    import_costs_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Fresh-interpreter runs per module; the fastest is kept (default: 3)."
+    )
 
     # --- benchmark command ---
     benchmark_parser = subparsers.add_parser(
@@ -217,21 +838,93 @@ def main():
         help="Print per-file metric details (complexity, docstring coverage, "
              "bad practices, execution time, status) during the benchmark run."
     )
+    benchmark_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Samples executed concurrently, one per CPU (default: CPU count)."
+    )
+    benchmark_parser.add_argument(
+        "--warm",
+        action="store_true",
+        default=False,
+        help="Fork samples from pre-started interpreters (Unix) so execution "
+             "times exclude Python start-up (still reported as startup_ms)."
+    )
+    benchmark_parser.add_argument(
+        "--repeat",
+        action="store_true",
+        default=False,
+        help="Time every sample repeatedly after a warmup run and report the "
+             "median, IQR and 95%% confidence interval instead of one run."
+    )
+    benchmark_parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=DEFAULT_POLICY.target,
+        metavar="FRACTION",
+        help="With --repeat, stop once the CI half-width is below this fraction "
+             "of the median (default: %(default)s)."
+    )
+    benchmark_parser.add_argument(
+        "--max-runs",
+        type=int,
+        default=DEFAULT_POLICY.max_runs,
+        metavar="N",
+        help="With --repeat, the most timed runs per sample (default: %(default)s)."
+    )
+    benchmark_parser.add_argument(
+        "--scaling",
+        action="store_true",
+        default=False,
+        help="Also time each task's entry function at input sizes 2^6..2^16 "
+             "for tasks with a 'scaling' spec and fit its complexity class."
+    )
+    benchmark_parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        default=False,
+        help="Run samples under tracemalloc and report peak traced memory and "
+             "top allocation sites (slows samples down; times are not comparable)."
+    )
+    _add_cache_arguments(benchmark_parser)
 
     args = parser.parse_args()
+    cache = None if getattr(args, "no_cache", True) else AnalysisCache(args.cache)
 
     if args.command == "analyze":
+        for rule_id in args.disable_rule:
+            DEFAULT_REGISTRY.disable(rule_id)
+
+    if args.command == "analyze" and not os.path.isfile(args.input):
+        paths = _collect_python_files(args.input)
+        if not paths:
+            parser.error(f"no Python files match --input {args.input!r}")
+
+        out = open(args.output, "w", encoding="utf-8") if args.output else None
+        try:
+            for record in CodeAnalyzer.analyze_many(paths, workers=args.workers, cache=cache):
+                _expand_record(record)
+                line = json.dumps(analyze_results(record["file"], record, SCHEMA_VERSION))
+                if out:
+                    out.write(line + "\n")
+                else:
+                    print(line, flush=True)
+        finally:
+            if out:
+                out.close()
+
+        if args.output:
+            print(f"Results for {len(paths)} files saved to {args.output}")
+
+    elif args.command == "analyze":
         with open(args.input, "r") as f:
             code = f.read()
 
-        analyzer = CodeAnalyzer(code)
-        results = {
-            "schema_version": SCHEMA_VERSION,
-            "file": args.input,
-            "halstead_metrics": analyzer.calculate_halstead_metrics(),
-            "docstring_coverage": analyzer.get_docstring_coverage(),
-            "bad_practices": analyzer.detect_bad_practices()
-        }
+        analysis = dict(CodeAnalyzer(code, cache=cache).analyze())
+        analysis["functions"] = _function_dicts(analysis["functions"])
+        results = analyze_results(args.input, analysis, SCHEMA_VERSION)
 
         if args.output:
             with open(args.output, "w") as f:
@@ -240,10 +933,94 @@ def main():
         else:
             print(json.dumps(results, indent=2))
 
+    elif args.command == "serve":
+        if args.stop or args.status:
+            response = request({"op": "shutdown" if args.stop else "ping"}, args.socket)
+            if response is None:
+                parser.error(f"no daemon is listening on {args.socket}")
+            print(json.dumps(response, indent=2))
+            return
+
+        server = AnalysisServer(args.socket)
+        try:
+            server.bind()
+        except DaemonError as e:
+            parser.error(str(e))
+        print(f"VibeBench daemon listening on {args.socket} (pid {os.getpid()})",
+              file=sys.stderr)
+        server.serve_forever()
+
+    elif args.command == "clones":
+        paths = _collect_python_files(args.input)
+        if not paths:
+            parser.error(f"no Python files match --input {args.input!r}")
+
+        index = CloneIndex(threshold=args.threshold)
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                index.add(path, f.read())
+
+        if args.query:
+            with open(args.query, "r", encoding="utf-8") as f:
+                matches = index.query(f.read())
+            results = {
+                "query": args.query,
+                "near_duplicates": [
+                    {"file": path, "similarity": similarity}
+                    for path, similarity in matches if path != args.query
+                ]
+            }
+        else:
+            groups = {}
+            for path, cluster in index.clusters().items():
+                groups.setdefault(cluster, []).append(path)
+            results = {"clusters": [files for files in groups.values() if len(files) > 1]}
+        print(json.dumps(results, indent=2))
+
+    elif args.command == "project":
+        if not os.path.isdir(args.input):
+            parser.error(f"--input {args.input!r} is not a directory")
+
+        project = ProjectAnalyzer(args.input, workers=args.workers, cache=cache).analyze()
+        for record in project["modules"].values():
+            _expand_record(record)
+        results = {"schema_version": SCHEMA_VERSION, **project}
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results for {len(project['modules'])} modules saved to {args.output} "
+                  f"({project['reused']} reused, {project['analyzed']} analyzed)")
+        else:
+            print(json.dumps(results, indent=2))
+
+    elif args.command == "import-costs":
+        table = build_table(default_modules() + args.module, repeat=args.repeat)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(table, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"Import times of {len(table['loads'])} modules (Python {table['python']}) "
+              f"saved to {args.output}")
+
     elif args.command == "benchmark":
         datasets_dir = os.path.dirname(args.tasks)
-        bench = VibeBench(root_dir=datasets_dir, verbose=args.verbose)
-        bench.run_benchmark()  
+        timing = None
+        if args.repeat:
+            timing = DEFAULT_POLICY._replace(target=args.target_ci, max_runs=args.max_runs)
+        scaling = None
+        if args.scaling:
+            with open(args.tasks, "r", encoding="utf-8") as f:
+                scaling = {task["id"]: task["scaling"] for task in json.load(f) if "scaling" in task}
+        bench = VibeBench(root_dir=datasets_dir, verbose=args.verbose, cache=cache,
+                          workers=args.workers, warm=args.warm, timing=timing,
+                          scaling=scaling, trace_memory=args.trace_memory)
+        bench.run_benchmark()
+
+    if args.command == "analyze" and args.rule_stats:
+        print(json.dumps({"rule_stats": DEFAULT_REGISTRY.timings()}, indent=2),
+              file=sys.stderr)
+    if cache is not None:
+        cache.close()
 
 
 if __name__ == "__main__":